@@ -0,0 +1,160 @@
+"""
+Stack CSV load time: the original loader vs. the legacy repair path vs. the
+format-2 fast path.
+
+Writes a synthetic stack with save._write_csv (so it carries "# format=2"),
+then parses the same file with
+  - baseline: a copy of load_vocab before the loader work (file read into a
+    line list, whole-line-quote repair, DictReader, every text cell
+    normalized, plain dict rows)
+  - legacy: today's repair path for old files (save._iter_legacy_entries)
+  - fast path: what load_vocab runs for a format-2 file (save._parse_csv_file)
+All three must give the same rows.
+
+    python benchmarks/bench_csv_load.py
+    python benchmarks/bench_csv_load.py --sizes 10000 50000 --umlauts 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import unicodedata
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import save  # noqa: E402
+
+GERMAN = ["Straße", "Mädchen", "Brücke", "Frühstück", "Käse", "Löwe", "Übung", "Tür"]
+
+
+def make_vocab(n: int, rng: random.Random, umlauts: float) -> list:
+    start = datetime(2025, 1, 1, 8, 0, 0)
+    vocab = []
+    for i in range(n):
+        seen = start + timedelta(seconds=rng.randint(0, 60 * 86400), microseconds=rng.randint(0, 999_999))
+        due = (seen + timedelta(days=rng.choice([1, 2, 4, 7, 14, 30]))).replace(hour=0, minute=0, second=0, microsecond=0)
+        own = f"{rng.choice(GERMAN)} {i}" if rng.random() < umlauts else f"Wort {i}"
+        vocab.append(
+            {
+                "own_language": own,
+                "foreign_language": f"word, {i}" if i % 10 == 0 else f"word {i}",
+                "latin_language": "",
+                "info": "",
+                "knowledge_level": round(rng.random(), 3),
+                "srs_streak": rng.randint(0, 6),
+                "srs_last_seen": seen.isoformat(),
+                "srs_due": due.isoformat(),
+                "daily_goal_anchor": "",
+                "daily_goal_anchor_date": "",
+                "knowledge_date": seen.date().isoformat(),
+            }
+        )
+    return vocab
+
+
+# -------------------------
+# Baseline (save.load_vocab before the loader work)
+# -------------------------
+
+def baseline_normalize_user_text(value) -> str:
+    if value is None:
+        return ""
+    s = str(value)
+    if not s:
+        return ""
+    s = save._fix_leading_combining_marks(s)
+    return unicodedata.normalize("NFC", s)
+
+
+def baseline_read_lines(filename: str):
+    meta = {}
+    csv_lines = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.rstrip("\n")
+            if line.startswith("# "):
+                if "=" in line:
+                    key, val = line[2:].split("=", 1)
+                    meta[key.strip()] = val.strip()
+                continue
+            csv_lines.append(raw)
+    return csv_lines, meta
+
+
+def baseline_load(filename: str) -> list:
+    vocab = []
+    csv_lines, _meta = baseline_read_lines(filename)
+
+    cleaned_lines = []
+    for raw in csv_lines:
+        fixed = save._strip_outer_quotes_if_whole_line(raw)
+        cleaned_lines.append(fixed + ("\n" if not fixed.endswith("\n") else ""))
+
+    for row in csv.DictReader(cleaned_lines):
+        if not row:
+            continue
+        if "latin_language" not in row:
+            row["latin_language"] = ""
+        if "info" not in row:
+            row["info"] = ""
+        for k in ("own_language", "foreign_language", "latin_language", "info"):
+            if k in row:
+                row[k] = baseline_normalize_user_text(row.get(k))
+        row["knowledge_level"] = save._normalize_knowledge_level(row.get("knowledge_level"))
+        row["srs_streak"] = save._normalize_int(row.get("srs_streak", 0), 0)
+        row["srs_last_seen"] = (row.get("srs_last_seen") or "").strip()
+        row["srs_due"] = (row.get("srs_due") or "").strip()
+        vocab.append(row)
+    return vocab
+
+
+def best_of(repeat: int, *fns) -> list:
+    """Best CPU time of each fn; runs are interleaved so load spikes hit both."""
+    best = [float("inf")] * len(fns)
+    results = [None] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            results[i] = None  # don't time the previous run's rows in the heap
+            t0 = time.process_time()
+            results[i] = fn()
+            best[i] = min(best[i], time.process_time() - t0)
+    return list(zip(results, best))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    ap.add_argument("--umlauts", type=float, default=0.3, help="share of own_language words with umlauts")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'entries':>8} {'baseline':>10} {'legacy':>10} {'fast path':>10} {'vs base':>8} {'vs legacy':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            path = os.path.join(tmp, f"stack_{n}.csv")
+            save._write_csv(make_vocab(n, random.Random(args.seed), args.umlauts), path, "Deutsch", "Englisch", "Latein", False)
+
+            (base, t_base), (legacy, t_legacy), (fast, t_fast) = best_of(
+                args.repeat,
+                lambda: baseline_load(path),
+                lambda: list(save._iter_legacy_entries(path, {})),
+                lambda: save._parse_csv_file(path)[0],
+            )
+            assert len(fast) == len(legacy) == len(base) == n
+            assert all(dict(a) == dict(b) == c for a, b, c in zip(fast, legacy, base))
+
+            print(
+                f"{n:>8} {t_base * 1000:>7.0f} ms {t_legacy * 1000:>7.0f} ms {t_fast * 1000:>7.0f} ms"
+                f" {t_base / t_fast:>7.1f}x {t_legacy / t_fast:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
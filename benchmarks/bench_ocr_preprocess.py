@@ -0,0 +1,148 @@
+"""
+OCR preprocessing (vokaba/ocr_preprocess.py): cost of prepare_image() and
+what it saves (needs Pillow; the OCR part needs paddleocr).
+
+Draws a synthetic two-column vocabulary page at phone-camera sizes, saved as a JPEG
+that carries an EXIF "rotate 90°" flag like portrait photos do. For each size:
+time of prepare_image(), pixel reduction, and a check that Transform maps a
+box of the working copy back onto the same text in the original. With
+--ocr, PaddleOCR runs on the original and on the prepared copy and the
+detected line counts are compared.
+
+    python benchmarks/bench_ocr_preprocess.py
+    python benchmarks/bench_ocr_preprocess.py --megapixels 12 48 --long-edge 1600 --grayscale --crop
+    python benchmarks/bench_ocr_preprocess.py --ocr --lang german
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vokaba import ocr_preprocess  # noqa: E402
+
+try:
+    from PIL import Image, ImageDraw, ImageFilter, ImageFont
+except Exception:
+    Image = ImageDraw = ImageFilter = ImageFont = None
+
+_ENGINES: dict = {}
+
+WORDS = [("das Haus", "the house"), ("die Straße", "the street"), ("der Baum", "the tree"), ("lernen", "to learn")]
+
+
+def make_page(path: str, megapixels: float) -> tuple:
+    """Portrait page stored landscape + EXIF orientation 6; returns (upright size, marker box upright)."""
+    h = int(math.sqrt(megapixels * 1e6 * 4 / 3))  # upright: w:h = 3:4
+    w = int(h * 3 / 4)
+    page = Image.new("RGB", (w, h), (238, 236, 228))
+    draw = ImageDraw.Draw(page)
+    line_h = h // 36
+    try:
+        font = ImageFont.load_default(size=int(line_h * 0.6))
+    except TypeError:  # Pillow < 10.1: tiny bitmap font only, draw text-sized bars instead
+        font = None
+    for i in range(24):
+        y = int(h * 0.1) + i * line_h
+        for x, word in zip((0.1, 0.55), WORDS[i % len(WORDS)]):
+            if font is not None:
+                draw.text((int(w * x), y), word, fill=(20, 20, 20), font=font)
+            else:
+                draw.rectangle((int(w * x), y, int(w * x) + len(word) * line_h // 3, y + line_h // 2), fill=(20, 20, 20))
+    # below the text: the block the mapping check looks for
+    marker = (int(w * 0.1), int(h * 0.85), int(w * 0.3), int(h * 0.9))
+    draw.rectangle(marker, fill=(130, 130, 130))
+
+    # what the camera writes: sensor-landscape pixels + "rotate 90° CW to view"
+    stored = page.transpose(Image.ROTATE_90)
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    stored.save(path, "JPEG", quality=92, exif=exif.tobytes())
+    return (w, h), marker
+
+
+def marker_bbox(path: str) -> tuple:
+    """The mid-gray block (RGB or grayscale copy); the opening drops blurred glyph edges."""
+    with Image.open(path) as im:
+        gray = im.convert("L")
+    mask = gray.point(lambda v: 255 if 100 <= v <= 160 else 0).filter(ImageFilter.MinFilter(9)).filter(ImageFilter.MaxFilter(9))
+    return mask.getbbox()
+
+
+def paddle_lines(path: str, lang: str) -> tuple:
+    from paddleocr import PaddleOCR
+
+    ocr = _ENGINES.get(lang)
+    if ocr is None:
+        ocr = _ENGINES[lang] = PaddleOCR(lang=lang)
+    t0 = time.perf_counter()
+    res = ocr.predict(path)
+    dt = time.perf_counter() - t0
+    lines = 0
+    for page in res or []:
+        data = getattr(page, "json", page)
+        data = data.get("res", data) if isinstance(data, dict) else {}
+        lines += len(data.get("rec_texts") or [])
+    return dt, lines
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--megapixels", type=float, nargs="+", default=[12, 24, 48])
+    ap.add_argument("--long-edge", type=int, default=ocr_preprocess.DEFAULT_LONG_EDGE)
+    ap.add_argument("--grayscale", action="store_true")
+    ap.add_argument("--crop", action="store_true")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--ocr", action="store_true", help="also run PaddleOCR on original and prepared copy")
+    ap.add_argument("--lang", default="german")
+    args = ap.parse_args()
+
+    if not ocr_preprocess.available():
+        sys.exit("Pillow is not installed")
+
+    print(f"{'MP':>5} {'original':>11} {'prepared':>11} {'pixels':>7} {'prepare':>9} {'map err':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mp in args.megapixels:
+            src = os.path.join(tmp, f"page_{mp:g}mp.jpg")
+            dest = os.path.join(tmp, f"page_{mp:g}mp_prep.jpg")
+            (w, h), marker = make_page(src, mp)
+
+            best = float("inf")
+            t = None
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                t = ocr_preprocess.prepare_image(src, dest, long_edge=args.long_edge, grayscale=args.grayscale, crop=args.crop)
+                best = min(best, time.perf_counter() - t0)
+            assert t is not None and t.size == (w, h)
+
+            with Image.open(dest) as im:
+                pw, ph = im.size
+            # the marker found in the working copy, mapped back, lands on the marker in the original
+            found = marker_bbox(dest)
+            assert found, "marker lost"
+            (x0, y0), (x1, y1) = t.point(found[0], found[1]), t.point(found[2], found[3])
+            err = max(abs(x0 - marker[0]), abs(y0 - marker[1]), abs(x1 - marker[2]), abs(y1 - marker[3]))
+            # a few copy pixels of JPEG blur, scaled back up
+            assert err <= 4 / min(t.scale_x, t.scale_y), f"mapping off by {err:.1f} px"
+
+            print(
+                f"{mp:>5g} {w:>5}x{h:<5} {pw:>5}x{ph:<5} {w * h / float(pw * ph):>6.1f}x"
+                f" {best * 1000:>6.0f} ms {err:>5.1f} px"
+            )
+
+            if args.ocr:
+                t_orig, n_orig = paddle_lines(src, args.lang)
+                t_prep, n_prep = paddle_lines(dest, args.lang)
+                print(
+                    f"      ocr: original {t_orig:.2f} s ({n_orig} lines), prepared {t_prep + best:.2f} s incl. prepare"
+                    f" ({n_prep} lines), {t_orig / (t_prep + best):.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+OCR row/column reconstruction: the old per-item heuristics vs. vokaba/ocr_rows.py.
+
+Builds synthetic OCR output of word-level boxes (two or three columns,
+numbering, page numbers, "Unit" headers, copyright footers, rows that only
+split at " - "), then turns it into table rows with the legacy code (a copy
+of what OcrImportMixin did before: line mean recomputed per box, Lloyd
+k-means over the x centres, every cell cleaned twice) and with
+ocr_rows.rows_from_items(). The rows must be identical.
+
+    python benchmarks/bench_ocr_rows.py
+    python benchmarks/bench_ocr_rows.py --boxes 2000 8000 --cols 3 --words 6
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vokaba import ocr_rows  # noqa: E402
+
+WORDS = ["das", "Haus", "die", "Straße", "der", "Baum", "lernen", "the", "house", "street", "tree", "to", "learn", "arbor"]
+PAGE_W = 1240.0
+LINE_H = 30.0
+
+
+def make_items(n: int, rng: random.Random, n_cols: int, words: int) -> list:
+    """About n parser items ({"text", "x", "y", "h"}), top to bottom like a long scanned list."""
+    items = []
+    col_w = PAGE_W / n_cols
+    y = 60.0
+    row = 0
+    while len(items) < n:
+        row += 1
+        y += LINE_H * rng.uniform(1.3, 1.7)
+        kind = rng.random()
+        if kind < 0.03:
+            items.append({"text": str(rng.randint(1, 300)), "x": PAGE_W / 2 + rng.uniform(-20, 20), "y": y, "h": LINE_H})
+            continue
+        if kind < 0.05:
+            items.append({"text": rng.choice(["Unit", "Lektion", "© Verlag 2024", "www.verlag.de"]), "x": 80.0, "y": y, "h": LINE_H})
+            continue
+        if kind < 0.08:
+            # one box for the whole row: only the separator tells the columns apart
+            text = " - ".join(rng.choice(WORDS) for _ in range(n_cols))
+            items.append({"text": text, "x": 300.0, "y": y, "h": LINE_H})
+            continue
+        for c in range(n_cols):
+            x = c * col_w + 60.0
+            for w in range(rng.randint(1, words)):
+                word = rng.choice(WORDS)
+                if c == 0 and w == 0 and rng.random() < 0.3:
+                    word = f"{row}. {word}"
+                width = 14.0 * len(word)
+                if w and x + width > (c + 1) * col_w - 60.0:
+                    break  # cells stay inside their column, like on a printed page
+                items.append({
+                    "text": word + ("\u00ad" if rng.random() < 0.02 else ""),
+                    "x": x + width / 2,
+                    "y": y + rng.uniform(-4, 4),
+                    "h": LINE_H + rng.uniform(-3, 3),
+                })
+                x += width + 12.0
+    return items
+
+
+# -------------------------
+# Legacy (OcrImportMixin before ocr_rows)
+# -------------------------
+
+def legacy_clean_cell_text(s) -> str:
+    s = "" if s is None else str(s)
+    s = s.replace("\u00ad", "")
+    s = re.sub(r"\s+", " ", s).strip()
+    s = re.sub(r"^(?:\(?\d{1,3}\)?[.)]\s*|[A-Za-z][.)]\s*|[-•·]\s*)", "", s).strip()
+    if re.fullmatch(r"\d{1,4}", s or ""):
+        return ""
+    return s
+
+
+def legacy_row_is_noise(row) -> bool:
+    cols = [(c or "").strip() for c in row]
+    if not any(cols):
+        return True
+    nonempty = [c for c in cols if c]
+    if len(nonempty) == 1:
+        c = nonempty[0]
+        if re.fullmatch(r"\d{1,4}", c):
+            return True
+        if len(c) == 1 and not c.isdigit():
+            return True
+        if c.lower() in ("unit", "lektion", "kapitel"):
+            return True
+    joined = " ".join(nonempty).lower()
+    if "©" in joined or "copyright" in joined or "www." in joined:
+        return True
+    return False
+
+
+def legacy_split_by_separators(s, *, n_cols):
+    s = (s or "").strip()
+    if not s:
+        return None
+    seps = [" | ", " - ", " – ", " — ", "\t"]
+    for sep in seps:
+        if sep.strip() and sep in s:
+            parts = [p.strip() for p in s.split(sep) if p.strip()]
+            if len(parts) >= n_cols:
+                out = parts[:n_cols]
+                out += [""] * (n_cols - len(out))
+                return out
+    if re.search(r"\s{3,}", s):
+        parts = [p.strip() for p in re.split(r"\s{3,}", s) if p.strip()]
+        if len(parts) >= n_cols:
+            out = parts[:n_cols]
+            out += [""] * (n_cols - len(out))
+            return out
+    return None
+
+
+def legacy_kmeans_1d(values, *, k, iters=18):
+    vals = [float(v) for v in values if v is not None]
+    if not vals:
+        return [0.0] * k, [0.0] * max(0, k - 1)
+
+    vals.sort()
+    if len(vals) < k:
+        centers = (vals + [vals[-1]] * (k - len(vals)))[:k]
+        centers.sort()
+        return centers, [(centers[i] + centers[i + 1]) / 2.0 for i in range(k - 1)]
+
+    centers = []
+    for i in range(k):
+        pos = int(((i + 0.5) / k) * (len(vals) - 1))
+        centers.append(vals[pos])
+    centers.sort()
+
+    for _ in range(iters):
+        groups = [[] for _ in range(k)]
+        for v in vals:
+            best_i = 0
+            best_d = abs(v - centers[0])
+            for i in range(1, k):
+                d = abs(v - centers[i])
+                if d < best_d:
+                    best_d = d
+                    best_i = i
+            groups[best_i].append(v)
+
+        new_centers = []
+        for i in range(k):
+            g = groups[i]
+            new_centers.append(sum(g) / len(g) if g else centers[i])
+
+        if max(abs(new_centers[i] - centers[i]) for i in range(k)) < 1e-3:
+            centers = new_centers
+            break
+        centers = new_centers
+
+    centers.sort()
+    return centers, [(centers[i] + centers[i + 1]) / 2.0 for i in range(k - 1)]
+
+
+def legacy_rows(items, *, n_cols):
+    if not items:
+        return []
+    items = list(items)
+    items.sort(key=lambda it: (it["y"], it["x"]))
+
+    hs = sorted([float(it.get("h", 10.0) or 10.0) for it in items])
+    med_h = hs[len(hs) // 2] if hs else 10.0
+    line_tol = max(8.0, med_h * 0.65)
+
+    lines = []
+    for it in items:
+        y = float(it["y"])
+        if not lines:
+            lines.append({"y": y, "items": [it]})
+            continue
+        if abs(y - float(lines[-1]["y"])) <= line_tol:
+            lines[-1]["items"].append(it)
+            ys = [x["y"] for x in lines[-1]["items"]]
+            lines[-1]["y"] = sum(ys) / max(1, len(ys))
+        else:
+            lines.append({"y": y, "items": [it]})
+
+    _, bounds = legacy_kmeans_1d([float(it["x"]) for it in items], k=n_cols)
+
+    def col_idx(x):
+        for i, b in enumerate(bounds):
+            if x <= b:
+                return i
+        return n_cols - 1
+
+    rows = []
+    for ln in lines:
+        cols = [[] for _ in range(n_cols)]
+        for it in sorted(ln["items"], key=lambda it: it["x"]):
+            cols[col_idx(float(it["x"]))].append(it["text"])
+        row = [" ".join([legacy_clean_cell_text(x) for x in c if legacy_clean_cell_text(x)]).strip() for c in cols]
+        if legacy_row_is_noise(row):
+            continue
+        rows.append(row)
+
+    fixed = []
+    for row in rows:
+        if sum(1 for x in row if x) <= 1:
+            merged = " ".join([x for x in row if x]).strip()
+            parts = legacy_split_by_separators(merged, n_cols=n_cols)
+            fixed.append(parts if parts else row)
+        else:
+            fixed.append(row)
+    return fixed
+
+
+def best_of(repeat: int, *fns) -> list:
+    """Best CPU time of each fn; runs are interleaved so load spikes hit both."""
+    best = [float("inf")] * len(fns)
+    results = [None] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            t0 = time.process_time()
+            results[i] = fn()
+            best[i] = min(best[i], time.process_time() - t0)
+    return list(zip(results, best))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--boxes", type=int, nargs="+", default=[500, 2000, 8000])
+    ap.add_argument("--cols", type=int, default=2)
+    ap.add_argument("--words", type=int, default=4, help="max. word boxes per cell")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'boxes':>6} {'rows':>6} {'legacy':>10} {'ocr_rows':>10} {'speedup':>8}")
+    for n in args.boxes:
+        items = make_items(n, random.Random(args.seed), args.cols, args.words)
+
+        (legacy, t_legacy), (rows, t_rows) = best_of(
+            args.repeat,
+            lambda: legacy_rows(items, n_cols=args.cols),
+            lambda: ocr_rows.rows_from_items(items, n_cols=args.cols),
+        )
+        assert rows == legacy, next((a, b) for a, b in zip(rows, legacy) if a != b) if len(rows) == len(legacy) else "row count differs"
+
+        print(f"{len(items):>6} {len(rows):>6} {t_legacy * 1000:>7.1f} ms {t_rows * 1000:>7.1f} ms {t_legacy / t_rows:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Per-pick latency: old linear scan vs. vokaba.core.scheduler.DueScheduler.
+
+Each step picks a card and then "answers" it (new knowledge level + due date),
+like a learning session does.
+
+    python benchmarks/bench_scheduler.py
+    python benchmarks/bench_scheduler.py --sizes 1000 10000 --picks 500
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vokaba.core.scheduler import DueScheduler, entry_weight  # noqa: E402
+
+
+def make_entries(n: int, rng: random.Random) -> list:
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    entries = []
+    for i in range(n):
+        e = {
+            "own_language": f"w{i}",
+            "foreign_language": f"f{i}",
+            "knowledge_level": rng.random(),
+            "srs_streak": 0,
+            "srs_last_seen": "",
+            "srs_due": "",
+        }
+        r = rng.random()
+        if r < 0.3:
+            e["srs_due"] = (today - timedelta(days=rng.randint(0, 20))).isoformat()
+        elif r < 0.8:
+            e["srs_due"] = (today + timedelta(days=rng.randint(1, 30))).isoformat()
+        entries.append(e)
+    return entries
+
+
+def legacy_pick(entries: list, cur: int, rng: random.Random) -> int:
+    """The linear scan LearnMixin._pick_next_vocab_index used before the scheduler."""
+    n = len(entries)
+    if n <= 1:
+        return 0
+
+    now = datetime.now()
+    due_indices = []
+    for idx, e in enumerate(entries):
+        due_raw = e.get("srs_due")
+        if not due_raw:
+            continue
+        try:
+            due = datetime.fromisoformat(str(due_raw))
+        except Exception:
+            continue
+        if due <= now:
+            due_indices.append(idx)
+
+    candidates = due_indices if due_indices else list(range(n))
+    if len(candidates) > 1 and cur in candidates:
+        candidates = [i for i in candidates if i != cur]
+
+    weights = [entry_weight(entries[i]) for i in candidates]
+    total = sum(weights)
+    r = rng.random() * total
+    acc = 0.0
+    for idx, w in zip(candidates, weights):
+        acc += w
+        if r <= acc:
+            return idx
+    return candidates[-1]
+
+
+def answer(entry: dict, rng: random.Random) -> None:
+    entry["knowledge_level"] = rng.random()
+    due = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=rng.randint(1, 30))
+    entry["srs_due"] = due.isoformat()
+
+
+def bench_legacy(n: int, picks: int, seed: int) -> float:
+    rng = random.Random(seed)
+    entries = make_entries(n, rng)
+    cur = 0
+    t0 = time.perf_counter()
+    for _ in range(picks):
+        cur = legacy_pick(entries, cur, rng)
+        answer(entries[cur], rng)
+    return (time.perf_counter() - t0) / picks
+
+
+def bench_scheduler(n: int, picks: int, seed: int) -> tuple:
+    rng = random.Random(seed)
+    entries = make_entries(n, rng)
+
+    t0 = time.perf_counter()
+    sched = DueScheduler(entries, rng=rng)
+    build = time.perf_counter() - t0
+
+    cur = 0
+    t0 = time.perf_counter()
+    for _ in range(picks):
+        cur = sched.pick(avoid=cur)
+        answer(entries[cur], rng)
+        sched.update(entries[cur])
+    return build, (time.perf_counter() - t0) / picks
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--picks", type=int, default=2_000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'entries':>8} {'legacy/pick':>14} {'heap/pick':>12} {'heap build':>12} {'speedup':>9}")
+    for n in args.sizes:
+        # the linear scan gets slow quickly; fewer picks keep the run short
+        legacy_picks = max(10, min(args.picks, 2_000_000 // n))
+        legacy = bench_legacy(n, legacy_picks, args.seed)
+        build, heap = bench_scheduler(n, args.picks, args.seed)
+        print(
+            f"{n:>8} {legacy * 1e6:>11.1f} us {heap * 1e6:>9.1f} us {build * 1e3:>9.1f} ms {legacy / heap:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
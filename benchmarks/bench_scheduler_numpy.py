@@ -0,0 +1,78 @@
+"""
+Pure Python DueScheduler vs. NumpyDueScheduler (needs numpy installed).
+
+For each pool size: time to build the scheduler (what learn() pays when a
+"learn all" pool is (re)built) and time per pick + answer, plus the cost of
+a whole session (build + --session picks). Also checks that
+make_scheduler() only hands out the NumPy backend when asked for it.
+
+    python benchmarks/bench_scheduler_numpy.py
+    python benchmarks/bench_scheduler_numpy.py --sizes 10000 100000 1000000 --picks 500
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_scheduler import answer, make_entries  # noqa: E402
+from vokaba.core.scheduler import DueScheduler, make_scheduler, numpy_available  # noqa: E402
+
+
+def bench(cls, n: int, picks: int, seed: int) -> tuple:
+    rng = random.Random(seed)
+    entries = make_entries(n, rng)
+
+    t0 = time.perf_counter()
+    sched = cls(entries, rng=rng)
+    build = time.perf_counter() - t0
+
+    cur = 0
+    t0 = time.perf_counter()
+    for _ in range(picks):
+        cur = sched.pick(avoid=cur)
+        answer(entries[cur], rng)
+        sched.update(entries[cur])
+    return build, (time.perf_counter() - t0) / picks
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--picks", type=int, default=300)
+    ap.add_argument("--session", type=int, default=20, help="picks per session for the session column")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    if not numpy_available():
+        print("numpy is not installed; nothing to compare")
+        return
+    from vokaba.core.scheduler_numpy import NumpyDueScheduler
+
+    # picks run once per answer: "auto" stays on DueScheduler however big the pool
+    pool = make_entries(max(args.sizes), random.Random(args.seed))
+    assert type(make_scheduler(pool)) is DueScheduler
+    assert type(make_scheduler(pool, backend="numpy")) is NumpyDueScheduler
+
+    print(
+        f"{'entries':>8} {'py build':>10} {'np build':>10} {'py/pick':>10} {'np/pick':>10}"
+        f" {'py session':>11} {'np session':>11}"
+    )
+    for n in args.sizes:
+        py_build, py_pick = bench(DueScheduler, n, args.picks, args.seed)
+        np_build, np_pick = bench(NumpyDueScheduler, n, args.picks, args.seed)
+        py_session = py_build + args.session * py_pick
+        np_session = np_build + args.session * np_pick
+        print(
+            f"{n:>8} {py_build * 1e3:>7.0f} ms {np_build * 1e3:>7.0f} ms"
+            f" {py_pick * 1e6:>7.0f} us {np_pick * 1e6:>7.0f} us"
+            f" {py_session * 1e3:>8.0f} ms {np_session * 1e3:>8.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
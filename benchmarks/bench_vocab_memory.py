@@ -0,0 +1,96 @@
+"""
+Memory of a loaded stack: plain dict rows (old load_vocab) vs. VocabEntry.
+
+Writes a synthetic stack CSV (with progress, as after some weeks of learning),
+then measures the memory held by the loaded rows with tracemalloc.
+
+    python benchmarks/bench_vocab_memory.py
+    python benchmarks/bench_vocab_memory.py --sizes 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vokaba.core.vocab_entry import FIELDS, VocabEntry  # noqa: E402
+
+
+def write_stack(path: str, n: int, rng: random.Random) -> None:
+    start = datetime(2025, 1, 1, 8, 0, 0)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(FIELDS))
+        writer.writeheader()
+        for i in range(n):
+            seen = start + timedelta(seconds=rng.randint(0, 60 * 86400), microseconds=rng.randint(0, 999_999))
+            due = (seen + timedelta(days=rng.choice([1, 2, 4, 7, 14, 30]))).replace(hour=0, minute=0, second=0, microsecond=0)
+            writer.writerow(
+                {
+                    "own_language": f"Wort{i}",
+                    "foreign_language": f"word{i}",
+                    "latin_language": "",
+                    "info": "",
+                    "knowledge_level": round(rng.random(), 3),
+                    "srs_streak": rng.randint(0, 6),
+                    "srs_last_seen": seen.isoformat(),
+                    "srs_due": due.isoformat(),
+                    "daily_goal_anchor": "",
+                    "daily_goal_anchor_date": "",
+                    "knowledge_date": seen.date().isoformat(),
+                }
+            )
+
+
+def read_rows(path: str) -> list:
+    """Rows the way _parse_csv_file built them before VocabEntry."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row["knowledge_level"] = float(row["knowledge_level"])
+        row["srs_streak"] = int(row["srs_streak"])
+    return rows
+
+
+def measure(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'entries':>8} {'dict rows':>12} {'VocabEntry':>12} {'per card':>16} {'ratio':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            path = os.path.join(tmp, f"stack_{n}.csv")
+            write_stack(path, n, random.Random(args.seed))
+
+            rows, dict_bytes = measure(lambda: read_rows(path))
+            entries, slot_bytes = measure(lambda: [VocabEntry(r) for r in read_rows(path)])
+            assert all(dict(e) == r for e, r in zip(entries, rows))
+            del rows, entries
+
+            print(
+                f"{n:>8} {dict_bytes / 2**20:>9.1f} MiB {slot_bytes / 2**20:>9.1f} MiB"
+                f" {dict_bytes // n:>6} -> {slot_bytes // n:>4} B {dict_bytes / slot_bytes:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Learning simulation: drives the headless engine (vokaba.core.engine) with a
+synthetic learner for N days and reports throughput, persistence cost and
+learning efficiency. Same seed -> same run.
+
+Per simulated day:
+  - daily knowledge decay: lazy, i.e. applied in memory like load_vocab does
+    (scoring.materialize_decay); written only with the next change of an entry
+  - `--reviews` cards: next_card -> learner answers -> scoring/SRS update ->
+    autosave (save.persist_single_entry / flush_due_writes); the autosave
+    interval runs on the simulated clock, --seconds-per-card per answer
+  - flush of all buffered writes (exit_learning)
+
+Learner model: every word has a memory stability S (days). The chance to
+recall it t days after the last review is exp(-t / S); unseen words are
+recalled with --prior. A recalled word gets S *= --growth, a forgotten one
+S = max(0.5, S * 0.5). A word counts as retained if its recall chance at the
+end of the run is >= --retain.
+
+Reported:
+  picks/s             next_card() throughput (scheduler + mode choice)
+  bytes/review        bytes written by the process per review (/proc/self/io),
+                      without the daily decay step (reported on its own)
+  peak RSS            peak resident memory of the process
+  reviews/retained    reviews needed per retained word
+
+    python benchmarks/simulate.py --entries 10000 --days 30
+    python benchmarks/simulate.py --entries 200000 --stacks 4 --days 7 --backend sqlite --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def process_bytes_written():
+    """Bytes this process passed to write() so far (Linux), else None."""
+    try:
+        with open("/proc/self/io", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split(":", 1)[1])
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mib():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+class SimClock:
+    def __init__(self, start: datetime):
+        self.now = start
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+class Learner:
+    def __init__(self, rng: random.Random, prior: float, growth: float):
+        self.rng = rng
+        self.prior = prior
+        self.growth = growth
+        self.stability = {}  # id(entry) -> days
+        self.last_seen = {}  # id(entry) -> datetime
+
+    def recall_chance(self, entry, now: datetime) -> float:
+        key = id(entry)
+        if key not in self.stability:
+            return self.prior
+        elapsed = (now - self.last_seen[key]).total_seconds() / 86400.0
+        return math.exp(-max(0.0, elapsed) / self.stability[key])
+
+    def answer(self, entry, now: datetime) -> bool:
+        recalled = self.rng.random() < self.recall_chance(entry, now)
+        key = id(entry)
+        s = self.stability.get(key, 1.0)
+        self.stability[key] = s * self.growth if recalled else max(0.5, s * 0.5)
+        self.last_seen[key] = now
+        return recalled
+
+
+def play_card(session, card, recalled: bool, rng: random.Random) -> None:
+    """Score one answered card the way LearnMixin does for its mode."""
+    from vokaba.core.engine import scoring
+
+    entry = card["entry"]
+    mode = card["mode"]
+
+    if mode == "multiple_choice":
+        delta, q_val = scoring.multiple_choice(recalled)
+    elif mode == "typing":
+        if recalled:
+            delta, q_val = scoring.typing_auto(0)
+        else:
+            delta, q_val = scoring.typing_wrong_chars(rng.randint(1, 4)), 0.0
+    elif mode in ("letter_salad", "syllable_salad", "connect_pairs"):
+        name = {
+            "letter_salad": ("letter_salad_short_word_bonus", "letter_salad_wrong_letter"),
+            "syllable_salad": ("syllable_correct_word", "syllable_wrong_word"),
+            "connect_pairs": ("connect_pairs_correct_word", "connect_pairs_wrong_word"),
+        }[mode][0 if recalled else 1]
+        delta, q_val = scoring.delta(name), (1.0 if recalled else 0.0)
+    else:
+        rating = rng.choice(["very_easy", "easy"]) if recalled else rng.choice(["hard", "very_hard"])
+        delta, q_val, _correct = scoring.self_rating(rating)
+
+    session.submit_result(correct=recalled, delta=delta, quality=q_val, entry=entry)
+
+
+def make_stacks(n_entries: int, n_stacks: int, vocab_root: str):
+    stacks = {}
+    per_stack = max(1, n_entries // n_stacks)
+    for s in range(n_stacks):
+        filename = os.path.join(vocab_root, f"sim_{s}.csv")
+        stacks[filename] = [
+            {
+                "own_language": f"wort{s}_{i}",
+                "foreign_language": f"word{s}_{i}",
+                "latin_language": "",
+                "info": "",
+                "knowledge_level": 0.0,
+                "srs_streak": 0,
+                "srs_last_seen": "",
+                "srs_due": "",
+            }
+            for i in range(per_stack)
+        ]
+    return stacks
+
+
+def run(args) -> dict:
+    # keep the run away from the real data folder
+    home = tempfile.mkdtemp(prefix="vokaba_sim_")
+    os.environ["HOME"] = home
+    os.environ["USERPROFILE"] = home
+
+    import save
+    from vokaba.core.engine import Session, scoring
+    from vokaba.core.engine import modes as engine_modes
+    from vokaba.core.paths import vocab_root_string
+
+    try:
+        save.load_settings()
+        save.configure_storage(args.backend)
+        save.configure_autosave(args.policy, args.interval_ms)
+
+        rng = random.Random(args.seed)
+        stacks = make_stacks(args.entries, args.stacks, vocab_root_string())
+        meta = ("Deutsch", "Englisch", "Latein", False)
+        stack_meta_map = {f: meta for f in stacks}
+        entry_to_stack_file = {}
+        pool = []
+        for filename, vocab_list in stacks.items():
+            save.save_to_vocab(vocab_list, filename, *meta)
+            for e in vocab_list:
+                entry_to_stack_file[id(e)] = filename
+                pool.append(e)
+        rng.shuffle(pool)
+
+        def persist(entry):
+            if not args.no_persist:
+                save.persist_single_entry(entry, stacks, stack_meta_map, entry_to_stack_file)
+
+        clock = SimClock(datetime(2025, 1, 1, 8, 0, 0))
+        save.configure_autosave_clock(lambda: clock.now.timestamp())
+        learner = Learner(rng, args.prior, args.growth)
+        session = Session(
+            pool,
+            available_modes=engine_modes.available_modes({}, len(pool), len(pool)),
+            session_size=args.reviews,
+            rng=rng,
+            on_entry_changed=persist,
+            clock=clock,
+        )
+
+        reviews = 0
+        pick_seconds = 0.0
+        day_seconds = 0.0
+        decay_seconds = 0.0
+        decay_bytes = 0
+        written_start = process_bytes_written()
+
+        for day in range(args.days):
+            clock.now = datetime(2025, 1, 1, 8, 0, 0) + timedelta(days=day)
+
+            t0 = time.perf_counter()
+            w0 = process_bytes_written()
+            if day > 0 and args.decay:
+                today = clock.now.date()
+                for e in pool:
+                    scoring.materialize_decay(e, today)
+                session.set_entries(pool)  # new weights, like a fresh load
+            decay_seconds += time.perf_counter() - t0
+            w1 = process_bytes_written()
+            if w0 is not None and w1 is not None:
+                decay_bytes += w1 - w0
+
+            session.reset_counters()
+            t_day = time.perf_counter()
+            while not session.finished:
+                t0 = time.perf_counter()
+                card = session.next_card()
+                pick_seconds += time.perf_counter() - t0
+
+                recalled = learner.answer(card["entry"], clock.now)
+                play_card(session, card, recalled, rng)
+                reviews += 1
+
+                clock.advance(args.seconds_per_card)
+                if not args.no_persist:
+                    save.flush_due_writes()
+
+            if not args.no_persist:
+                save.flush_pending_writes()
+            day_seconds += time.perf_counter() - t_day
+
+        written_end = process_bytes_written()
+        sync_written = save.sync_csv_exports()
+
+        retained = sum(1 for e in pool if learner.recall_chance(e, clock.now) >= args.retain)
+        seen = len(learner.stability)
+        bytes_written = None
+        if written_start is not None and written_end is not None:
+            # decay rewrites are reported separately
+            bytes_written = written_end - written_start - decay_bytes
+
+        return {
+            "entries": len(pool),
+            "stacks": len(stacks),
+            "days": args.days,
+            "backend": save.storage_backend(),
+            "policy": args.policy,
+            "reviews": reviews,
+            "picks_per_second": reviews / pick_seconds if pick_seconds > 0 else None,
+            "reviews_per_second": reviews / day_seconds if day_seconds > 0 else None,
+            "decay_seconds": decay_seconds,
+            "decay_bytes": decay_bytes if bytes_written is not None else None,
+            "bytes_written": bytes_written,
+            "bytes_per_review": (bytes_written / reviews) if (bytes_written is not None and reviews) else None,
+            "stacks_exported_at_end": sync_written,
+            "peak_rss_mib": peak_rss_mib(),
+            "words_seen": seen,
+            "words_retained": retained,
+            "reviews_per_retained_word": (reviews / retained) if retained else None,
+        }
+    finally:
+        save.configure_autosave_clock(None)
+        try:
+            save.configure_storage("csv")
+        except Exception:
+            pass
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--entries", type=int, default=10_000, help="total entries (1k..200k)")
+    ap.add_argument("--stacks", type=int, default=1, help="number of stacks the entries are split into")
+    ap.add_argument("--days", type=int, default=14)
+    ap.add_argument("--reviews", type=int, default=200, help="reviews per day")
+    ap.add_argument("--seconds-per-card", type=float, default=8.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    ap.add_argument("--policy", choices=["immediate", "interval", "on_exit"], default="interval")
+    ap.add_argument("--interval-ms", type=int, default=2000)
+    ap.add_argument("--no-persist", action="store_true", help="engine only, no disk writes")
+    ap.add_argument("--no-decay", dest="decay", action="store_false", help="skip the daily decay")
+    ap.add_argument("--prior", type=float, default=0.2, help="recall chance of an unseen word")
+    ap.add_argument("--growth", type=float, default=2.2, help="stability factor after a recalled review")
+    ap.add_argument("--retain", type=float, default=0.9, help="recall chance that counts as retained")
+    ap.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = ap.parse_args()
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    def fmt(v, spec):
+        return "n/a" if v is None else format(v, spec)
+
+    print(f"entries           {result['entries']} in {result['stacks']} stack(s), {result['days']} days")
+    print(f"storage           {result['backend']} / autosave {result['policy']}")
+    print(f"reviews           {result['reviews']}")
+    print(f"picks/s           {fmt(result['picks_per_second'], ',.0f')}")
+    print(f"reviews/s         {fmt(result['reviews_per_second'], ',.0f')}  (incl. scoring + autosave)")
+    print(f"daily decay       {result['decay_seconds']:.2f} s, {fmt(result['decay_bytes'], ',')} bytes total")
+    print(f"bytes/review      {fmt(result['bytes_per_review'], ',.0f')}  (total {fmt(result['bytes_written'], ',')})")
+    print(f"peak RSS          {fmt(result['peak_rss_mib'], '.1f')} MiB")
+    print(f"words seen        {result['words_seen']}")
+    print(f"words retained    {result['words_retained']}")
+    print(f"reviews/retained  {fmt(result['reviews_per_retained_word'], '.2f')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,29 @@
 import csv
+import gc
+import itertools
 import os
-import yaml
+import threading
+import time
 import unicodedata
-from typing import Dict, List, Tuple, Optional
-from vokaba.core.paths import config_path, migrate_legacy_data, ensure_data_layout
+from collections.abc import Mapping
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+from vokaba.core.paths import (
+    config_path,
+    data_dir,
+    migrate_legacy_data,
+    ensure_data_layout,
+    vocab_root_string,
+    fsync_dir,
+    fsync_file,
+    stack_key,
+)
+from vokaba.core import progress_journal, stack_index
+from vokaba.core.config_store import ConfigStore
+from vokaba.core.stats_store import StatsStore
+from vokaba.core.vocab_entry import VocabEntry
+from vokaba.core.logging_utils import log
+from vokaba.core.engine import scoring
 
 
 # ------------------------------------------------------------
@@ -67,29 +87,22 @@ def _strip_outer_quotes_if_whole_line(line: str) -> str:
     return s
 
 
-def _read_file_lines_without_meta(filename: str) -> Tuple[List[str], Dict[str, str]]:
+def _iter_lines_without_meta(lines: Iterable[str], meta: Dict[str, str]) -> Iterator[str]:
     """
-    Reads file and returns:
-      (csv_lines, meta_dict)
+    Yields the CSV lines and collects the meta lines into meta.
 
     meta lines look like:
       # own_language=Deutsch
     """
-    meta: Dict[str, str] = {}
-    csv_lines: List[str] = []
-
-    with open(filename, "r", encoding="utf-8") as f:
-        for raw in f:
-            line = raw.rstrip("\n")
-            if line.startswith("# "):
-                # meta
-                if "=" in line:
-                    key, val = line[2:].split("=", 1)
-                    meta[key.strip()] = val.strip()
-                continue
-            csv_lines.append(raw)  # keep newline for csv module
-
-    return csv_lines, meta
+    for raw in lines:
+        line = raw.rstrip("\n")
+        if line.startswith("# "):
+            # meta
+            if "=" in line:
+                key, val = line[2:].split("=", 1)
+                meta[key.strip()] = val.strip()
+            continue
+        yield raw  # keep newline for csv module
 
 
 # ------------------------------------------------------------
@@ -141,9 +154,12 @@ def normalize_user_text(value) -> str:
     if value is None:
         return ""
     s = str(value)
-    if not s:
-        return ""
-    s = _fix_leading_combining_marks(s)
+    if not s or s.isascii():
+        # ASCII has no combining marks and is already NFC
+        return s
+    if unicodedata.combining(s[0]):
+        # only marks in front of the first base letter get reordered
+        s = _fix_leading_combining_marks(s)
     return unicodedata.normalize("NFC", s)
 
 
@@ -176,28 +192,40 @@ VOCAB_FIELDNAMES = [
     "srs_due",
     "daily_goal_anchor",
     "daily_goal_anchor_date",
+    "knowledge_date",
 ]
 
+# "# format=N" in the meta header. Files written by _write_csv (format 2) are
+# plain CSV with exactly the VOCAB_FIELDNAMES header and normalized text, so
+# _parse_csv_file reads them without the repair pass. Older files and files
+# from elsewhere have no (or a lower) format and take the legacy path.
+CSV_FORMAT_VERSION = 2
+_CSV_HEADER = ",".join(VOCAB_FIELDNAMES)
 
-def save_to_vocab(
-    vocab: List[Dict],
+
+def _write_csv(
+    vocab: Iterable[Dict],
     filename: str,
-    own_lang: str = "Deutsch",
-    foreign_lang: str = "Englisch",
-    latin_lang: str = "Latein",
-    latin_active: bool = False,
-) -> None:
+    own_lang: str,
+    foreign_lang: str,
+    latin_lang: str,
+    latin_active: bool,
+    keep_rows: bool = True,
+) -> List[Dict]:
     """
-    Writes vocab list to CSV with meta header lines.
-    Output is normal CSV (NOT whole-line quoted).
+    Writes the CSV file only (temp file + rename) and returns the normalized rows.
+    keep_rows=False returns [] instead (streaming writes, see transform_vocab).
     """
     os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
 
-    with open(filename, "w", newline="", encoding="utf-8") as f:
+    rows: List[Dict] = []
+    tmp = f"{filename}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
         f.write(f"# own_language={own_lang}\n")
         f.write(f"# foreign_language={foreign_lang}\n")
         f.write(f"# latin_language={latin_lang}\n")
         f.write(f"# latin_active={str(bool(latin_active))}\n")
+        f.write(f"# format={CSV_FORMAT_VERSION}\n")
 
         writer = csv.DictWriter(
             f,
@@ -208,7 +236,7 @@ def save_to_vocab(
         writer.writeheader()
 
         for row in vocab:
-            if not isinstance(row, dict):
+            if not isinstance(row, Mapping):
                 continue
 
             row = dict(row)  # avoid mutating caller data
@@ -226,86 +254,532 @@ def save_to_vocab(
             due = row.get("srs_due") or ""
             row["srs_last_seen"] = str(last_seen) if last_seen else ""
             row["srs_due"] = str(due) if due else ""
+            row["knowledge_date"] = str(row.get("knowledge_date") or "")
 
             writer.writerow(row)
+            if keep_rows:
+                rows.append(row)
 
+        # on disk before it replaces the old file (the journal goes away right after)
+        fsync_file(f)
 
-def load_vocab(filename: str):
+    os.replace(tmp, filename)
+    fsync_dir(filename)
+
+    # The CSV now holds every progress value -> the journal is folded in.
+    progress_journal.remove_journal(filename)
+    return rows
+
+
+def save_to_vocab(
+    vocab: List[Dict],
+    filename: str,
+    own_lang: str = "Deutsch",
+    foreign_lang: str = "Englisch",
+    latin_lang: str = "Latein",
+    latin_active: bool = False,
+) -> None:
+    """
+    Writes vocab list to CSV with meta header lines.
+    Output is normal CSV (NOT whole-line quoted).
+
+    The file is written to a temp file first and then renamed over the old one,
+    so a crash mid-write never leaves a half-written stack behind.
+    With the sqlite backend the stack is stored in the database as well.
     """
-    Loads vocab from CSV.
+    _replace_stack(vocab, filename, own_lang, foreign_lang, latin_lang, latin_active)
+    _notify_stack_written(filename, vocab)
+
+
+def _replace_stack(
+    vocab: List[Dict],
+    filename: str,
+    own_lang: str,
+    foreign_lang: str,
+    latin_lang: str,
+    latin_active: bool,
+) -> None:
+    # A full write supersedes whatever the write-behind buffer still holds for this file.
+    discard_pending_writes(filename)
+
+    rows = _write_csv(vocab, filename, own_lang, foreign_lang, latin_lang, latin_active)
+
+    store = _sqlite_store()
+    if store is not None:
+        store.replace_stack(
+            stack_key(filename),
+            rows,
+            (own_lang, foreign_lang, latin_lang, bool(latin_active)),
+            progress_journal.csv_signature(filename),
+        )
+
+    _refresh_summary(filename, rows)
+
+
+def _meta_languages(meta: Dict[str, str]) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
+    return (
+        meta.get("own_language"),
+        meta.get("foreign_language"),
+        meta.get("latin_language"),
+        meta.get("latin_active", "false").strip().lower() == "true",
+    )
+
+
+def _parse_csv_file(filename: str):
+    """
+    Parses a stack CSV (plus its progress journal).
 
     Returns:
         (vocab_list, own_lang, foreign_lang, latin_lang, latin_active)
+    """
+    meta: Dict[str, str] = {}
+    # Every entry is a new tracked object, so a big stack would set off
+    # several full collections over the whole heap while the list fills up;
+    # nothing in here builds reference cycles.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        vocab: List[Dict] = list(_iter_csv_entries(filename, meta))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # Progress updates that were appended since the last full write
+    progress_journal.replay(vocab, progress_journal.read_records(filename))
+
+    return (vocab,) + _meta_languages(meta)
+
 
+def _iter_csv_entries(filename: str, meta: Dict[str, str]) -> Iterator[VocabEntry]:
+    """
+    Streams the rows of a stack CSV (without the journal); meta is filled
+    with the meta header. Files written by this version (see
+    CSV_FORMAT_VERSION) take the fast path, everything else the legacy one.
+    """
+    with open(filename, "r", newline="", encoding="utf-8") as f:
+        if _read_canonical_header(f, meta):
+            yield from _iter_canonical_entries(f)
+            return
+    meta.clear()
+    yield from _iter_legacy_entries(filename, meta)
+
+
+def _entry_from_dict_row(row: Dict) -> VocabEntry:
+    """Legacy row normalization (any header order, missing columns, odd values)."""
+    # Ensure all known fields exist
+    if "latin_language" not in row:
+        row["latin_language"] = ""
+    if "info" not in row:
+        row["info"] = ""
+
+    # Normalize text fields (fix dead keys / combining marks)
+    row = _normalize_row_text_fields(row)
+
+    # Normalize types
+    row["knowledge_level"] = _normalize_knowledge_level(row.get("knowledge_level"))
+    row["srs_streak"] = _normalize_int(row.get("srs_streak", 0), 0)
+
+    # keep srs strings as-is (isoformat or empty)
+    row["srs_last_seen"] = (row.get("srs_last_seen") or "").strip()
+    row["srs_due"] = (row.get("srs_due") or "").strip()
+    row["knowledge_date"] = (row.get("knowledge_date") or "").strip()
+
+    return VocabEntry(row)
+
+
+def _iter_legacy_entries(filename: str, meta: Dict[str, str]) -> Iterator[VocabEntry]:
+    """
     Compatible with:
     - normal CSV header line
     - whole-line-quoted CSV header line ("a,b,c")
     - whole-line-quoted data lines ("x,y,z")
+    - meta lines anywhere in the file
     """
-    vocab: List[Dict] = []
-    csv_lines, meta = _read_file_lines_without_meta(filename)
+    with open(filename, "r", encoding="utf-8") as f:
+        # preprocess lines for the whole-line-quoted format
+        cleaned_lines = (
+            fixed + ("\n" if not fixed.endswith("\n") else "")
+            for fixed in map(_strip_outer_quotes_if_whole_line, _iter_lines_without_meta(f, meta))
+        )
+
+        # Use DictReader
+        reader = csv.DictReader(cleaned_lines)
+        # If the header was "one field containing commas", DictReader will think there is 1 field.
+        # But our preprocessing above should have converted it back to normal "a,b,c" -> OK.
 
-    own_lang = meta.get("own_language")
-    foreign_lang = meta.get("foreign_language")
-    latin_lang = meta.get("latin_language")
-    latin_active = (meta.get("latin_active", "false").strip().lower() == "true")
+        for row in reader:
+            if not row:
+                continue
+            yield _entry_from_dict_row(row)
 
-    # preprocess lines for the whole-line-quoted format
-    cleaned_lines: List[str] = []
-    for raw in csv_lines:
-        fixed = _strip_outer_quotes_if_whole_line(raw)
-        cleaned_lines.append(fixed + ("\n" if not fixed.endswith("\n") else ""))
 
-    # Use DictReader
-    reader = csv.DictReader(cleaned_lines)
-    # If the header was "one field containing commas", DictReader will think there is 1 field.
-    # But our preprocessing above should have converted it back to normal "a,b,c" -> OK.
+def _read_canonical_header(f, meta: Dict[str, str]) -> bool:
+    """
+    Reads the meta header and the column header of f (opened with newline="").
+    True if the file is in the canonical format; f is then positioned at the
+    first data row.
+    """
+    header = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if not line.startswith("# "):
+            header = line
+            break
+        if "=" in line:
+            key, val = line[2:].split("=", 1)
+            meta[key.strip()] = val.strip()
+    return _normalize_int(meta.get("format"), 0) >= CSV_FORMAT_VERSION and header == _CSV_HEADER
 
-    for row in reader:
-        if not row:
+
+_MAX_CACHED_CELLS = 4096
+
+
+def _iter_canonical_entries(f) -> Iterator[VocabEntry]:
+    """
+    Fast path for files written by _write_csv (format >= CSV_FORMAT_VERSION):
+    streams the rows by position. Lines without a quote (the writer only
+    quotes cells with , " or line breaks) are split directly, the rest go
+    through csv.reader. Text was normalized by the writer; it is only
+    normalized again if it is not plain ASCII (hand-edited files).
+    """
+    return VocabEntry.from_rows(_canonical_rows(f))
+
+
+def _canonical_rows(f) -> Iterator[Tuple]:
+    """Typed FIELDS tuples of the data rows of f, for VocabEntry.from_rows."""
+    width = len(VOCAB_FIELDNAMES)
+    levels: Dict[str, float] = {}
+    streaks: Dict[str, int] = {}
+    for line in f:
+        if '"' in line:
+            # csv.reader pulls the continuation lines of a quoted multi-line cell from f
+            row = next(csv.reader(itertools.chain((line,), f)), [])
+        else:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            row = line.split(",")
+        if len(row) != width:
+            if row:
+                # short/long row (hand-edited): same rules as the legacy path
+                entry = _entry_from_dict_row(dict(zip(VOCAB_FIELDNAMES, row)))
+                yield tuple(entry[k] for k in VOCAB_FIELDNAMES)
             continue
 
-        # Ensure all known fields exist
-        if "latin_language" not in row:
-            row["latin_language"] = ""
-        if "info" not in row:
-            row["info"] = ""
+        own, foreign, latin, info, level, streak, last_seen, due, anchor, anchor_date, kdate = row
+        if not own.isascii():
+            own = normalize_user_text(own)
+        if not foreign.isascii():
+            foreign = normalize_user_text(foreign)
+        if latin and not latin.isascii():
+            latin = normalize_user_text(latin)
+        if info and not info.isascii():
+            info = normalize_user_text(info)
+
+        # a stack has few distinct level / streak cells: parse each once
+        value = levels.get(level)
+        if value is None:
+            try:
+                value = float(level)
+            except ValueError:
+                value = _normalize_knowledge_level(level)
+            if not 0.0 <= value <= 1.0:
+                value = _normalize_knowledge_level(value)
+            if len(levels) < _MAX_CACHED_CELLS:
+                levels[level] = value
+        level = value
+        value = streaks.get(streak)
+        if value is None:
+            try:
+                value = int(streak)
+            except ValueError:
+                value = _normalize_int(streak, 0)
+            if len(streaks) < _MAX_CACHED_CELLS:
+                streaks[streak] = value
+        streak = value
+
+        yield (
+            own, foreign, latin, info, level, streak,
+            last_seen.strip(), due.strip(), anchor, anchor_date, kdate.strip(),
+        )
+
+
+def load_vocab(filename: str):
+    """
+    Loads vocab of one stack.
 
-        # Normalize text fields (fix dead keys / combining marks)
-        row = _normalize_row_text_fields(row)
+    Returns:
+        (vocab_list, own_lang, foreign_lang, latin_lang, latin_active)
 
-        # Normalize types
-        row["knowledge_level"] = _normalize_knowledge_level(row.get("knowledge_level"))
-        row["srs_streak"] = _normalize_int(row.get("srs_streak", 0), 0)
+    knowledge_level of the returned entries already has the daily decay
+    applied (see "Lazy knowledge decay" below); the files are not touched.
+    """
+    # Read-your-writes: never hand out a file that still has buffered learning updates.
+    flush_pending_writes(filename)
 
-        # keep srs strings as-is (isoformat or empty)
-        row["srs_last_seen"] = (row.get("srs_last_seen") or "").strip()
-        row["srs_due"] = (row.get("srs_due") or "").strip()
+    data = _load_stored_vocab(filename)
+    _apply_lazy_decay(data[0])
+    return data
 
-        vocab.append(row)
 
+def _load_stored_vocab(filename: str):
+    """
+    load_vocab without decay.
+
+    With the sqlite backend the stack comes from the database as long as the
+    CSV is unchanged since it was imported/exported; otherwise the CSV is
+    parsed and (re-)imported.
+    """
+    store = _sqlite_store()
+    if store is None:
+        return _parse_csv_file(filename)
+
+    key = stack_key(filename)
+    sig = progress_journal.csv_signature(filename)
+    info = store.stack_info(key)
+    if info is not None and sig is not None and info["csv_signature"] == sig:
+        return (
+            store.load_stack(key),
+            info["own_language"],
+            info["foreign_language"],
+            info["latin_language"],
+            info["latin_active"],
+        )
+
+    vocab, own_lang, foreign_lang, latin_lang, latin_active = _parse_csv_file(filename)
+    store.replace_stack(key, vocab, (own_lang, foreign_lang, latin_lang, latin_active), sig)
     return vocab, own_lang, foreign_lang, latin_lang, latin_active
 
 
-def read_languages(filename: str) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
-    """Reads only meta language settings."""
-    own_lang = None
-    foreign_lang = None
-    latin_lang = None
-    latin_active = False
+# ------------------------------------------------------------
+# Streaming access (stats, exports)
+# ------------------------------------------------------------
+#
+# load_vocab builds the whole list. Callers that only look at every row once
+# (summaries, exports) can stream instead; memory then doesn't grow with the
+# stack. The rows are fresh entries, not the ones held by
+# vokaba.core.repository, so they may be changed freely.
+
+def _iter_stored_entries(filename: str) -> Iterator[Dict]:
+    """Rows as load_vocab would return them, without decay."""
+    store = _sqlite_store()
+    if store is not None:
+        key = stack_key(filename)
+        sig = progress_journal.csv_signature(filename)
+        info = store.stack_info(key)
+        if info is not None and sig is not None and info["csv_signature"] == sig:
+            yield from store.iter_stack(key)
+            return
+
+    records = progress_journal.read_records(filename)
+    yield from progress_journal.replay_iter(_iter_csv_entries(filename, {}), records)
+
+
+def iter_vocab(filename: str, fields: Optional[Iterable[str]] = None) -> Iterator:
+    """
+    Yields the entries of one stack like load_vocab returns them (journal
+    replayed, daily decay applied), one at a time.
+
+    fields=None yields VocabEntry rows; fields=("own_language", ...) yields
+    tuples of just those columns.
+    """
+    # Read-your-writes, same as load_vocab.
+    flush_pending_writes(filename)
 
+    today = date.today()
+    base = _decay_base_date
+    columns = tuple(fields) if fields is not None else None
+    for e in _iter_stored_entries(filename):
+        scoring.materialize_decay(e, today, base)
+        yield e if columns is None else tuple(e.get(c) for c in columns)
+
+
+def transform_vocab(src: str, dst: str, fn) -> int:
+    """
+    Streams the entries of src through fn and writes the result to dst
+    (with the languages of src), row by row in constant memory.
+
+    fn(entry) returns the row to write (entry itself may be changed and
+    returned) or None to drop it. dst may be src (temp file + rename).
+    Returns the number of rows written.
+
+    Unlike save_to_vocab this doesn't update caches: if dst is a stack, the
+    summary index, catalog and repository notice the new file by its
+    signature; a database copy of dst is dropped and re-imported on load.
+    """
+    own, foreign, latin, latin_active = read_languages(src)
+    if stack_key(dst) != stack_key(src):
+        discard_pending_writes(dst)
+
+    written = 0
+
+    def rows():
+        nonlocal written
+        for entry in iter_vocab(src):
+            row = fn(entry)
+            if row is not None:
+                written += 1
+                yield row
+
+    _write_csv(
+        rows(),
+        dst,
+        own or "Deutsch",
+        foreign or "Englisch",
+        latin or "Latein",
+        bool(latin_active),
+        keep_rows=False,
+    )
+
+    store = _sqlite_store()
+    if store is not None and store.stack_info(stack_key(dst)) is not None:
+        store.delete_stack(stack_key(dst))
+    return written
+
+
+# ------------------------------------------------------------
+# Lazy knowledge decay
+# ------------------------------------------------------------
+#
+# Knowledge decays by DAILY_DECAY per calendar day. Instead of rewriting every
+# stack once a day, each entry keeps the date its knowledge_level refers to
+# (knowledge_date). load_vocab subtracts the decay since then in memory and
+# stamps today's date; the files only get the decayed value with the next
+# write of the entry. Entries without a date (written before lazy decay)
+# decay from the date of the last eager decay (knowledge_decay_date in the
+# learning stats, see learning_stats()).
+
+_decay_base_date: Optional[str] = None
+
+
+def configure_knowledge_decay(base_date: Optional[str]) -> None:
+    """Date undated entries decay from (ISO date)."""
+    global _decay_base_date
+    _decay_base_date = str(base_date)[:10] if base_date else None
+
+
+def knowledge_decay_base_date() -> Optional[str]:
+    return _decay_base_date
+
+
+def configure_knowledge_decay_from_settings(cfg: dict) -> None:
+    # fresh installs: nothing written before today, so today is the baseline
+    configure_knowledge_decay(learning_stats(cfg).ensure_knowledge_decay_date())
+
+
+def _apply_lazy_decay(vocab_list: List[Dict]) -> None:
+    today = date.today()
+    for e in vocab_list:
+        scoring.materialize_decay(e, today, _decay_base_date)
+
+
+# ------------------------------------------------------------
+# Stack catalog (meta header cache)
+# ------------------------------------------------------------
+#
+# Screens ask for the languages of every stack (sorting, language filter,
+# add/edit vocab, OCR import). The catalog reads only the meta header of a
+# stack (stops at the first non-meta line) and keeps the result until the
+# file's size/mtime change.
+
+META_KEYS = ("own_language", "foreign_language", "latin_language", "latin_active")
+
+_catalog_lock = threading.RLock()
+_catalog: Dict[str, Dict] = {}
+
+
+def _read_meta_header(filename: str) -> Dict[str, str]:
+    meta: Dict[str, str] = {}
     with open(filename, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.startswith("# own_language="):
-                own_lang = normalize_user_text(line.strip().split("=", 1)[1])
-            elif line.startswith("# foreign_language="):
-                foreign_lang = normalize_user_text(line.strip().split("=", 1)[1])
-            elif line.startswith("# latin_language="):
-                latin_lang = normalize_user_text(line.strip().split("=", 1)[1])
-            elif line.startswith("# latin_active="):
-                latin_active = line.strip().split("=", 1)[1].lower() == "true"
+        for raw in f:
+            line = _strip_outer_quotes_if_whole_line(raw).strip()
+            if not line:
+                continue
+            if not line.startswith("# "):
+                break
+            if "=" in line:
+                key, val = line[2:].split("=", 1)
+                meta[key.strip()] = val.strip()
+    return meta
+
+
+def _catalog_record(filename: str, sig: List[int], meta: Dict[str, str]) -> Dict:
+    def text(key: str) -> Optional[str]:
+        val = meta.get(key)
+        return normalize_user_text(val) if val is not None else None
+
+    return {
+        "path": filename,
+        "stem": os.path.splitext(os.path.basename(filename))[0],
+        "own_language": text("own_language"),
+        "foreign_language": text("foreign_language"),
+        "latin_language": text("latin_language"),
+        "latin_active": str(meta.get("latin_active", "")).lower() == "true",
+        "size": sig[0],
+        "mtime_ns": sig[1],
+    }
+
+
+def stack_meta(filename: str) -> Dict:
+    """
+    Catalog record of one stack:
+      path, stem, own_language, foreign_language, latin_language, latin_active, size, mtime_ns
+    """
+    sig = progress_journal.csv_signature(filename)
+    if sig is None:
+        raise FileNotFoundError(filename)
+
+    key = stack_key(filename)
+    with _catalog_lock:
+        rec = _catalog.get(key)
+    if rec is not None and rec["size"] == sig[0] and rec["mtime_ns"] == sig[1]:
+        return rec
+
+    rec = _catalog_record(str(filename), sig, _read_meta_header(filename))
+    with _catalog_lock:
+        _catalog[key] = rec
+    return rec
+
+
+def list_stacks(root: Optional[str] = None) -> List[Dict]:
+    """Catalog records of all stack CSVs in root (default: the vocab folder)."""
+    root = root or vocab_root_string()
+    out: List[Dict] = []
+    seen = set()
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return out
+
+    for name in names:
+        full = os.path.join(root, name)
+        if not name.lower().endswith(".csv") or not os.path.isfile(full):
+            continue
+        try:
+            rec = stack_meta(full)
+        except (OSError, UnicodeDecodeError) as e:
+            log(f"stack catalog: cannot read {full}: {e}")
+            continue
+        out.append(rec)
+        seen.add(stack_key(full))
+
+    # drop records of stacks that are gone
+    root_key = stack_key(root)
+    with _catalog_lock:
+        for key in [k for k in _catalog if os.path.dirname(k) == root_key and k not in seen]:
+            _catalog.pop(key, None)
+    return out
 
-    return own_lang, foreign_lang, latin_lang, latin_active
+
+def _forget_stack_meta(filename: str) -> None:
+    with _catalog_lock:
+        _catalog.pop(stack_key(filename), None)
+
+
+def read_languages(filename: str) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
+    """Reads only meta language settings (cached, see stack_meta)."""
+    rec = stack_meta(filename)
+    return rec["own_language"], rec["foreign_language"], rec["latin_language"], rec["latin_active"]
 
 
 def change_languages(
@@ -331,6 +805,35 @@ def change_languages(
 # Settings YAML
 # ------------------------------------------------------------
 
+# config.yml is kept in memory and written debounced (vokaba/core/config_store.py)
+SETTINGS_WRITE_INTERVAL_MS = 1000
+
+# parallel OCR runners for multi-image imports (desktop; each one holds its own models)
+# and inference threads per runner; 0 = from the core count (vokaba/ocr_client.py tune())
+DEFAULT_OCR_BATCH_WORKERS = 0
+DEFAULT_OCR_THREADS = 0
+# OCR results by image hash (vokaba/ocr_cache.py); 0 disables the cache
+DEFAULT_OCR_CACHE_MAX_MB = 64
+# photos are scaled down to this long edge before OCR (vokaba/ocr_preprocess.py); 0 = full size
+DEFAULT_OCR_LONG_EDGE = 2000
+# PDF pages are rasterized at this resolution for OCR (vokaba/ocr_pdf.py)
+DEFAULT_OCR_PDF_DPI = 200
+
+_config_stores: Dict[str, ConfigStore] = {}
+_config_stores_lock = threading.Lock()
+
+
+def _config_store() -> ConfigStore:
+    path = str(config_path())
+    with _config_stores_lock:
+        store = _config_stores.get(path)
+        if store is None:
+            ensure_data_layout()
+            store = ConfigStore(path, SETTINGS_WRITE_INTERVAL_MS)
+            _config_stores[path] = store
+        return store
+
+
 def load_settings() -> dict:
     """
     Loads config.yml with sane defaults.
@@ -345,7 +848,14 @@ def load_settings() -> dict:
       settings.global_learn_languages
       settings.typing.(require_self_rating, clear_on_wrong)
       settings.legal.(accepted, accepted_at, stack_import_notice_accepted, stack_import_notice_accepted_at)
-      stats.(daily_progress_date, daily_cards_done, total_learn_time_seconds)
+      settings.autosave.(policy, interval_ms)
+      settings.storage.backend
+      settings.learn.scheduler_backend
+      settings.ocr.(batch_workers, threads, tiled, cache_max_mb, long_edge, grayscale, crop_to_text, pdf_dpi)
+      stats.migrated_daily_goal_50
+
+    The learning counters (daily goal progress, learn time, decay baseline)
+    are kept in learning_stats(); older config files are migrated once.
     """
     default_config = {
         "settings": {
@@ -382,32 +892,42 @@ def load_settings() -> dict:
                 "stack_import_notice_accepted": False,
                 "stack_import_notice_accepted_at": None,
             },
+            "autosave": {
+                "policy": DEFAULT_AUTOSAVE_POLICY,
+                "interval_ms": DEFAULT_AUTOSAVE_INTERVAL_MS,
+            },
+            "storage": {
+                "backend": DEFAULT_STORAGE_BACKEND,
+            },
+            "learn": {
+                # see vokaba/core/scheduler.py: "auto", "python" or "numpy"
+                "scheduler_backend": "auto",
+            },
+            "ocr": {
+                "batch_workers": DEFAULT_OCR_BATCH_WORKERS,
+                "threads": DEFAULT_OCR_THREADS,
+                "tiled": False,
+                "cache_max_mb": DEFAULT_OCR_CACHE_MAX_MB,
+                "long_edge": DEFAULT_OCR_LONG_EDGE,
+                "grayscale": False,
+                "crop_to_text": False,
+                "pdf_dpi": DEFAULT_OCR_PDF_DPI,
+            },
         },
-        "stats": {
-            "daily_progress_date": None,
-            "daily_cards_done": 0,
-            "total_learn_time_seconds": 0,
-        },
+        "stats": {},
     }
 
     migrate_legacy_data()
     ensure_data_layout()
-    cfg_path = str(config_path())
+    store = _config_store()
 
-    if not os.path.exists(cfg_path):
+    if not store.exists():
+        learning_stats()
         save_settings(default_config)
+        store.flush()
         return default_config
 
-    try:
-        with open(cfg_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-    except Exception:
-        data = {}
-
-    if not isinstance(data, dict):
-        data = {}
-
-    cfg = data
+    cfg = store.read()
 
     settings = cfg.setdefault("settings", {})
     settings.setdefault("daily_target_cards", default_config["settings"]["daily_target_cards"])
@@ -435,18 +955,95 @@ def load_settings() -> dict:
     typing_cfg.setdefault("require_self_rating", default_config["settings"]["typing"]["require_self_rating"])
     typing_cfg.setdefault("clear_on_wrong", default_config["settings"]["typing"]["clear_on_wrong"])
 
+    autosave = settings.setdefault("autosave", {})
+    autosave.setdefault("policy", default_config["settings"]["autosave"]["policy"])
+    autosave.setdefault("interval_ms", default_config["settings"]["autosave"]["interval_ms"])
+
+    storage = settings.setdefault("storage", {})
+    storage.setdefault("backend", default_config["settings"]["storage"]["backend"])
+
+    learn_cfg = settings.setdefault("learn", {})
+    learn_cfg.setdefault("scheduler_backend", default_config["settings"]["learn"]["scheduler_backend"])
+
+    ocr_cfg = settings.setdefault("ocr", {})
+    for k, v in default_config["settings"]["ocr"].items():
+        ocr_cfg.setdefault(k, v)
+
     stats = cfg.setdefault("stats", {})
-    for k, v in default_config["stats"].items():
-        stats.setdefault(k, v)
+    if not isinstance(stats, dict):
+        stats = cfg["stats"] = {}
+    learning_stats(cfg)
+    for k in STATS_FIELDS:
+        stats.pop(k, None)
 
     ensure_legal_defaults(cfg)
+    # only written if the defaults added something
     save_settings(cfg)
+    store.flush()
     return cfg
 
+
 def save_settings(config: dict) -> None:
-    ensure_data_layout()
-    with open(str(config_path()), "w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+    """
+    Mark config as changed. config.yml is written debounced (see
+    flush_due_settings) and on flush_settings(); unchanged content is never
+    rewritten.
+    """
+    _config_store().mark_dirty(config)
+
+
+def flush_settings() -> bool:
+    """Write unsaved settings now (on_pause / on_stop). Returns True if written."""
+    try:
+        return _config_store().flush()
+    except Exception as e:
+        log(f"flush_settings failed: {e}")
+        return False
+
+
+def flush_due_settings() -> bool:
+    """Timer hook: write settings whose oldest change is older than SETTINGS_WRITE_INTERVAL_MS."""
+    try:
+        return _config_store().flush_due()
+    except Exception as e:
+        log(f"flush_due_settings failed: {e}")
+        return False
+
+
+# ------------------------------------------------------------
+# Learning stats (daily goal, learn time)
+# ------------------------------------------------------------
+#
+# Counters that change while learning live in a fixed-size record
+# (vokaba/core/stats_store.py), not in config.yml: counting a card or
+# refreshing a progress bar must not rewrite the YAML.
+
+STATS_FILE_NAME = "stats.bin"
+
+# config.yml "stats" keys that moved to the stats store
+STATS_FIELDS = ("daily_progress_date", "daily_cards_done", "total_learn_time_seconds", "knowledge_decay_date")
+
+_stats_stores: Dict[str, StatsStore] = {}
+_stats_stores_lock = threading.Lock()
+
+
+def learning_stats(cfg: Optional[dict] = None) -> StatsStore:
+    """
+    The stats store of the current data folder. Created on first use, seeded
+    from the "stats" section of cfg (older config.yml) if given.
+    """
+    path = os.path.join(str(data_dir()), STATS_FILE_NAME)
+    with _stats_stores_lock:
+        store = _stats_stores.get(path)
+        if store is None:
+            ensure_data_layout()
+            store = StatsStore(path)
+            _stats_stores[path] = store
+        if not store.loaded:
+            old_stats = (cfg or {}).get("stats")
+            store.seed(old_stats if isinstance(old_stats, dict) else {})
+        return store
+
 
 def ensure_legal_defaults(cfg: dict) -> None:
     settings = cfg.setdefault("settings", {})
@@ -459,51 +1056,150 @@ def ensure_legal_defaults(cfg: dict) -> None:
     legal.setdefault("stack_import_notice_accepted_at", None)
 
 # ------------------------------------------------------------
-# Persistence helpers (same API as before)
+# Write-behind autosave (learning updates)
 # ------------------------------------------------------------
+#
+# Learning changes one entry per answer. persist_single_entry() only marks
+# the entry dirty; dirty entries are written by flush_due_writes() (called
+# from a short UI timer), by flush_pending_writes() (exit_learning /
+# on_pause / on_stop) or right away when the policy is "immediate".
+#
+# A flush of changed entries appends one small record per entry to the
+# stack's progress journal (see vokaba/core/progress_journal.py) instead of
+# rewriting the CSV. Once the journal outgrows the CSV it is compacted, i.e.
+# folded back into a full CSV write, so writes stay O(1) amortized.
+#
+# Policies:
+#   immediate -> write on every update
+#   interval  -> write at most every interval_ms; at most interval_ms of
+#                learning progress can be lost on a crash
+#   on_exit   -> write only when learning ends / the app pauses or stops
+
+AUTOSAVE_POLICIES = ("immediate", "interval", "on_exit")
+DEFAULT_AUTOSAVE_POLICY = "interval"
+DEFAULT_AUTOSAVE_INTERVAL_MS = 2000
+
+# Compact once the journal is bigger than the CSV (and at least this big)
+JOURNAL_COMPACT_MIN_BYTES = 64 * 1024
+
+_autosave_lock = threading.RLock()
+_autosave_policy = DEFAULT_AUTOSAVE_POLICY
+_autosave_interval_ms = DEFAULT_AUTOSAVE_INTERVAL_MS
+# seconds, monotonic; simulations drive it from their own clock
+_autosave_clock = time.monotonic
+
+# key -> {"filename", "vocab", "meta", "since", "full", "entries"}
+#   full    -> whole stack must be rewritten
+#   entries -> id(entry) -> entry, progress-only changes (journal)
+_pending_writes: Dict[str, Dict] = {}
+
+# id(vocab_list) -> (len, {id(entry): row index})
+_row_index_cache: Dict[int, Tuple[int, Dict[int, int]]] = {}
+
+
+def configure_autosave(policy: Optional[str] = None, interval_ms: Optional[int] = None) -> None:
+    """Set the autosave policy (see AUTOSAVE_POLICIES) and the flush interval."""
+    global _autosave_policy, _autosave_interval_ms
+
+    with _autosave_lock:
+        if policy is not None:
+            p = str(policy).strip().lower()
+            _autosave_policy = p if p in AUTOSAVE_POLICIES else DEFAULT_AUTOSAVE_POLICY
+        if interval_ms is not None:
+            _autosave_interval_ms = max(100, _normalize_int(interval_ms, DEFAULT_AUTOSAVE_INTERVAL_MS))
+
+    if _autosave_policy == "immediate":
+        flush_pending_writes()
+
+
+def configure_autosave_clock(clock=None) -> None:
+    """Clock (-> seconds) the autosave interval is measured with; None = time.monotonic."""
+    global _autosave_clock
+    with _autosave_lock:
+        _autosave_clock = clock or time.monotonic
+
+
+def configure_autosave_from_settings(cfg: dict) -> None:
+    autosave = ((cfg or {}).get("settings", {}) or {}).get("autosave", {}) or {}
+    configure_autosave(
+        policy=autosave.get("policy", DEFAULT_AUTOSAVE_POLICY),
+        interval_ms=autosave.get("interval_ms", DEFAULT_AUTOSAVE_INTERVAL_MS),
+    )
 
-def persist_all_stacks(stack_vocab_lists: dict, stack_meta_map: dict) -> None:
-    if not stack_vocab_lists:
-        return
 
-    for filename, vocab_list in stack_vocab_lists.items():
-        if vocab_list is None:
-            continue
+def autosave_interval_seconds() -> float:
+    return _autosave_interval_ms / 1000.0
+
+
+def has_pending_writes(filename: Optional[str] = None) -> bool:
+    with _autosave_lock:
+        if filename is None:
+            return bool(_pending_writes)
+        return stack_key(filename) in _pending_writes
+
 
-        meta = stack_meta_map.get(filename)
-        if meta is None:
-            own_lang, foreign_lang, latin_lang, latin_active = read_languages(filename)
+def _mark_pending(filename: str, vocab_list: List[Dict], meta: Optional[Tuple], entry: Optional[Dict]) -> None:
+    if not filename or vocab_list is None:
+        return
+
+    key = stack_key(filename)
+    with _autosave_lock:
+        pending = _pending_writes.get(key)
+        if pending is None:
+            pending = {
+                "filename": filename,
+                "vocab": vocab_list,
+                "meta": meta,
+                "since": _autosave_clock(),
+                "full": False,
+                "entries": {},
+            }
+            _pending_writes[key] = pending
         else:
-            own_lang, foreign_lang, latin_lang, latin_active = meta
-
-        save_to_vocab(
-            vocab_list,
-            filename,
-            own_lang=own_lang or "Deutsch",
-            foreign_lang=foreign_lang or "Englisch",
-            latin_lang=latin_lang or "Latein",
-            latin_active=bool(latin_active),
-        )
+            if pending["vocab"] is not vocab_list:
+                pending["full"] = True
+            pending["vocab"] = vocab_list
+            if meta is not None:
+                pending["meta"] = meta
+
+        if entry is None:
+            pending["full"] = True
+        else:
+            pending["entries"][id(entry)] = entry
+        policy = _autosave_policy
 
+    if policy == "immediate":
+        flush_pending_writes(filename)
 
-def persist_single_entry(vocab: dict, stack_vocab_lists: dict, stack_meta_map: dict, entry_to_stack_file: dict) -> None:
+
+def mark_stack_dirty(filename: str, vocab_list: List[Dict], meta: Optional[Tuple] = None) -> None:
     """
-    Persist exactly one vocab entry by saving only its owning stack file.
+    Remember that vocab_list (the full in-memory list of filename) must be rewritten.
 
-    This is used for immediate autosave during learning updates.
+    Repeated marks of the same stack coalesce into one pending write; the time of
+    the FIRST unsaved change is kept, so a steady stream of answers can't push the
+    write out forever.
     """
-    if vocab is None:
-        return
+    _mark_pending(filename, vocab_list, meta, None)
 
-    filename = entry_to_stack_file.get(id(vocab))
-    if not filename:
-        return
 
-    vocab_list = stack_vocab_lists.get(filename)
-    if vocab_list is None:
+def mark_entry_dirty(filename: str, vocab_list: List[Dict], entry: Dict, meta: Optional[Tuple] = None) -> None:
+    """Remember that only the progress fields of entry (a member of vocab_list) changed."""
+    if entry is None:
         return
+    _mark_pending(filename, vocab_list, meta, entry)
+
+
+def discard_pending_writes(filename: Optional[str] = None) -> None:
+    """Drop buffered writes (e.g. the stack was deleted or fully rewritten)."""
+    with _autosave_lock:
+        if filename is None:
+            _pending_writes.clear()
+        else:
+            _pending_writes.pop(stack_key(filename), None)
 
-    meta = stack_meta_map.get(filename)
+
+def _write_stack(filename: str, vocab_list: List[Dict], meta: Optional[Tuple]) -> None:
     if meta is None:
         own_lang, foreign_lang, latin_lang, latin_active = read_languages(filename)
     else:
@@ -517,3 +1213,423 @@ def persist_single_entry(vocab: dict, stack_vocab_lists: dict, stack_meta_map: d
         latin_lang=latin_lang or "Latein",
         latin_active=bool(latin_active),
     )
+
+
+def _row_indices(vocab_list: List[Dict]) -> Dict[int, int]:
+    cached = _row_index_cache.get(id(vocab_list))
+    if cached is not None and cached[0] == len(vocab_list):
+        return cached[1]
+    index = {id(e): i for i, e in enumerate(vocab_list)}
+    _row_index_cache.clear()  # one list per flush is the common case; don't pin old ids
+    _row_index_cache[id(vocab_list)] = (len(vocab_list), index)
+    return index
+
+
+def _journal_needs_compaction(filename: str) -> bool:
+    size = progress_journal.journal_size(filename)
+    if size < JOURNAL_COMPACT_MIN_BYTES:
+        return False
+    try:
+        return size > os.path.getsize(filename)
+    except OSError:
+        return True
+
+
+def _write_pending(pending: Dict) -> None:
+    filename = pending["filename"]
+    vocab_list = pending["vocab"]
+
+    if pending["full"] or not os.path.exists(filename):
+        _write_stack(filename, vocab_list, pending["meta"])
+        return
+
+    store = _sqlite_store()
+    if store is not None and store.stack_info(stack_key(filename)) is None:
+        # stack isn't in the database yet -> one full write imports it
+        _write_stack(filename, vocab_list, pending["meta"])
+        return
+
+    index = _row_indices(vocab_list)
+    records = []
+    for entry in pending["entries"].values():
+        i = index.get(id(entry))
+        if i is None or i >= len(vocab_list) or vocab_list[i] is not entry:
+            # list changed shape since the last full write -> journal keys are unsafe
+            _write_stack(filename, vocab_list, pending["meta"])
+            return
+        records.append((i, entry))
+
+    if store is not None:
+        store.update_progress(stack_key(filename), records)
+        _summary_stale(filename)
+        _notify_stack_written(filename, vocab_list)
+        return
+
+    progress_journal.append_records(filename, [progress_journal.make_record(i, e) for i, e in records])
+
+    if _journal_needs_compaction(filename):
+        _write_stack(filename, vocab_list, pending["meta"])
+    else:
+        _summary_stale(filename)
+        _notify_stack_written(filename, vocab_list)
+
+
+def flush_pending_writes(filename: Optional[str] = None) -> int:
+    """
+    Write buffered stacks now (all of them, or only filename).
+    Returns the number of stacks written.
+    """
+    with _autosave_lock:
+        if filename is None:
+            keys = list(_pending_writes.keys())
+        else:
+            key = stack_key(filename)
+            keys = [key] if key in _pending_writes else []
+        batch = [_pending_writes.pop(k) for k in keys]
+
+    written = 0
+    for pending in batch:
+        try:
+            _write_pending(pending)
+            written += 1
+        except Exception:
+            # keep it buffered, the next flush retries (as a full write)
+            pending["full"] = True
+            with _autosave_lock:
+                _pending_writes.setdefault(stack_key(pending["filename"]), pending)
+    return written
+
+
+def flush_due_writes() -> int:
+    """
+    Timer hook: write stacks whose oldest unsaved change is older than the
+    autosave interval. Does nothing for the on_exit policy.
+    """
+    with _autosave_lock:
+        if not _pending_writes or _autosave_policy == "on_exit":
+            return 0
+        limit = _autosave_clock() - autosave_interval_seconds()
+        due = [p["filename"] for p in _pending_writes.values() if p["since"] <= limit]
+
+    written = 0
+    for filename in due:
+        written += flush_pending_writes(filename)
+    return written
+
+
+def compact_journal(filename: str) -> bool:
+    """Fold the progress journal of filename back into the CSV. Returns True if it did."""
+    if progress_journal.journal_size(filename) <= 0:
+        return False
+    vocab, own, foreign, latin, latin_active = load_vocab(filename)
+    _replace_stack(vocab, filename, own or "Deutsch", foreign or "Englisch", latin or "Latein", bool(latin_active))
+    # same content as before, only the file layout changed
+    _notify_stack_written(filename, None)
+    return True
+
+
+def settle_stack_file(filename: str) -> None:
+    """
+    Make the CSV file alone complete: write buffered updates and compact the journal
+    (or export the database copy with the sqlite backend).
+    Use this before copying, renaming or replacing a stack file.
+    """
+    flush_pending_writes(filename)
+    export_stack_csv(filename)
+    compact_journal(filename)
+
+
+def forget_stack_file(filename: str) -> None:
+    """Drop buffered writes, the journal and the database copy of a stack that is being deleted."""
+    discard_pending_writes(filename)
+    progress_journal.remove_journal(filename)
+    _forget_stack_meta(filename)
+    _stack_index().remove(stack_key(filename))
+    store = _sqlite_store()
+    if store is not None:
+        store.delete_stack(stack_key(filename))
+
+
+# ------------------------------------------------------------
+# Storage backend (csv / sqlite)
+# ------------------------------------------------------------
+#
+# "csv"    -> stack CSVs (+ progress journal) are the only storage
+# "sqlite" -> vocab/*.csv stay the list of stacks and the shareable format,
+#             data_dir()/vokaba.sqlite3 holds the parsed stacks and all
+#             learning progress (see vokaba/core/sqlite_store.py).
+#             Progress is exported back into the CSVs by sync_csv_exports()
+#             (app stop, switching back to csv) and settle_stack_file().
+
+STORAGE_BACKENDS = ("csv", "sqlite")
+DEFAULT_STORAGE_BACKEND = "csv"
+SQLITE_DB_NAME = "vokaba.sqlite3"
+
+_storage_lock = threading.RLock()
+_storage_backend = DEFAULT_STORAGE_BACKEND
+_sqlite_store_obj = None
+
+
+def storage_backend() -> str:
+    return _storage_backend
+
+
+def _sqlite_store():
+    """The open SqliteStore, or None with the csv backend."""
+    global _sqlite_store_obj, _storage_backend
+
+    if _storage_backend != "sqlite":
+        return None
+    with _storage_lock:
+        if _sqlite_store_obj is None:
+            try:
+                from vokaba.core.sqlite_store import SqliteStore
+
+                ensure_data_layout()
+                _sqlite_store_obj = SqliteStore(os.path.join(str(data_dir()), SQLITE_DB_NAME))
+            except Exception as e:
+                log(f"sqlite backend unavailable, falling back to csv: {e}")
+                _storage_backend = "csv"
+                return None
+        return _sqlite_store_obj
+
+
+def configure_storage(backend: Optional[str] = None) -> None:
+    """Select the storage backend (see STORAGE_BACKENDS)."""
+    global _storage_backend, _sqlite_store_obj
+
+    b = str(backend or DEFAULT_STORAGE_BACKEND).strip().lower()
+    if b not in STORAGE_BACKENDS:
+        b = DEFAULT_STORAGE_BACKEND
+
+    with _storage_lock:
+        if b == _storage_backend:
+            return
+
+        # Buffered updates belong to the old backend.
+        flush_pending_writes()
+
+        if _storage_backend == "sqlite" and _sqlite_store_obj is not None:
+            # Leaving sqlite: the CSVs must carry all progress again.
+            sync_csv_exports()
+            _sqlite_store_obj.close()
+            _sqlite_store_obj = None
+
+        _storage_backend = b
+
+
+def configure_storage_from_settings(cfg: dict) -> None:
+    storage = ((cfg or {}).get("settings", {}) or {}).get("storage", {}) or {}
+    configure_storage(storage.get("backend", DEFAULT_STORAGE_BACKEND))
+
+
+def export_stack_csv(filename: str, dest: Optional[str] = None) -> bool:
+    """
+    Write the database copy of filename as CSV (to dest, default: filename itself).
+    Only does something with the sqlite backend; with dest=None only stale stacks
+    are written. Returns True if a file was written.
+    """
+    store = _sqlite_store()
+    if store is None:
+        return False
+
+    key = stack_key(filename)
+    info = store.stack_info(key)
+    if info is None:
+        return False
+    if dest is None and not info["csv_stale"]:
+        return False
+
+    target = dest or filename
+    vocab = store.load_stack(key)
+    rows = _write_csv(
+        vocab,
+        target,
+        info["own_language"] or "Deutsch",
+        info["foreign_language"] or "Englisch",
+        info["latin_language"] or "Latein",
+        info["latin_active"],
+    )
+    if stack_key(target) == key:
+        store.set_csv_signature(key, progress_journal.csv_signature(target))
+        _refresh_summary(target, rows)
+        _notify_stack_written(target, None)
+    return True
+
+
+def sync_csv_exports() -> int:
+    """Export every stack whose CSV is behind the database. Returns the number of files written."""
+    store = _sqlite_store()
+    if store is None:
+        return 0
+
+    flush_pending_writes()
+    written = 0
+    for key in store.stale_stacks():
+        if not os.path.exists(key):
+            store.delete_stack(key)
+            continue
+        try:
+            if export_stack_csv(key):
+                written += 1
+        except Exception as e:
+            log(f"csv export failed for {key}: {e}")
+    return written
+
+
+# ------------------------------------------------------------
+# Stack summaries (menu / dashboard stats)
+# ------------------------------------------------------------
+#
+# Every full write of a stack refreshes its record in data_dir()/stack_index.json
+# (see vokaba/core/stack_index.py), so the stats screens are O(stacks) instead
+# of O(total vocab). A record is valid for one [csv size, csv mtime, journal size].
+# Progress flushes only mark the record stale; the next read rebuilds it.
+
+STACK_INDEX_NAME = "stack_index.json"
+
+_stack_index_obj = None
+
+
+def _stack_index() -> stack_index.StackIndex:
+    global _stack_index_obj
+    if _stack_index_obj is None:
+        ensure_data_layout()
+        _stack_index_obj = stack_index.StackIndex(os.path.join(str(data_dir()), STACK_INDEX_NAME))
+    return _stack_index_obj
+
+
+def _summary_signature(filename: str) -> Optional[List[int]]:
+    sig = progress_journal.csv_signature(filename)
+    if sig is None:
+        return None
+    return sig + [progress_journal.journal_size(filename)]
+
+
+def stack_signature(filename: str) -> Optional[List[int]]:
+    """[csv size, csv mtime_ns, journal size] of a stack, None if it doesn't exist."""
+    return _summary_signature(filename)
+
+
+def _refresh_summary(filename: str, vocab_list: Iterable[Dict]) -> Optional[Dict]:
+    return _store_summary(filename, stack_index.summarize(vocab_list))
+
+
+def _summary_stale(filename: str) -> None:
+    try:
+        _stack_index().mark_stale(stack_key(filename))
+    except Exception as e:
+        log(f"stack summary update failed for {filename}: {e}")
+
+
+def _store_summary(filename: str, summary: Dict) -> Optional[Dict]:
+    try:
+        return _stack_index().put(stack_key(filename), _summary_signature(filename), summary)
+    except Exception as e:
+        log(f"stack summary update failed for {filename}: {e}")
+        return None
+
+
+def stack_summary(filename: str) -> Dict:
+    """
+    Summary record of one stack (count, levels, due_days; pair hashes via stack_pairs).
+    Rebuilt from the stack if the files or its progress changed since it was stored.
+    """
+    if has_pending_writes(filename):
+        flush_pending_writes(filename)
+
+    rec = _stack_index().get(stack_key(filename), _summary_signature(filename))
+    if rec is not None:
+        return rec
+
+    # streamed: a summary miss doesn't hold the whole stack in memory
+    summary = stack_index.summarize(iter_vocab(filename))
+    return _store_summary(filename, summary) or summary
+
+
+def stack_pairs(filename: str, raw: bool = False) -> List[str]:
+    """
+    Pair hashes of one stack (see stack_index.summarize): stripped and
+    non-empty, or with raw=True the pairs as stored.
+    """
+    name = "raw_pairs" if raw else "pairs"
+    rec = stack_summary(filename)
+    data = _stack_index().pairs(stack_key(filename), rec.get("pairs_digest"))
+    if data is None:
+        # sidecar missing / from another build of the record
+        summary = stack_index.summarize(iter_vocab(filename))
+        _store_summary(filename, summary)
+        data = summary
+    return list(data.get(name) or ())
+
+
+# ------------------------------------------------------------
+# Write notifications
+# ------------------------------------------------------------
+#
+# In-memory caches of stack contents (vokaba/core/repository.py) need to know
+# when a stack file was written: listener(filename, vocab_list) is called
+# after every write with the list that is now on disk, or with None if the
+# content didn't change (journal compaction, CSV export of the database copy).
+
+_write_listeners: List = []
+
+
+def add_stack_write_listener(listener) -> None:
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def remove_stack_write_listener(listener) -> None:
+    try:
+        _write_listeners.remove(listener)
+    except ValueError:
+        pass
+
+
+def _notify_stack_written(filename: str, vocab_list: Optional[List[Dict]]) -> None:
+    for listener in list(_write_listeners):
+        try:
+            listener(filename, vocab_list)
+        except Exception as e:
+            log(f"stack write listener failed for {filename}: {e}")
+
+
+# ------------------------------------------------------------
+# Persistence helpers (same API as before)
+# ------------------------------------------------------------
+
+def persist_all_stacks(stack_vocab_lists: dict, stack_meta_map: dict) -> None:
+    """
+    Write every stack of the learning session that has unsaved changes.
+
+    Stacks that were never marked dirty are unchanged on disk and are skipped.
+    """
+    if not stack_vocab_lists:
+        flush_pending_writes()
+        return
+
+    for filename in stack_vocab_lists.keys():
+        if has_pending_writes(filename):
+            flush_pending_writes(filename)
+
+
+def persist_single_entry(vocab: dict, stack_vocab_lists: dict, stack_meta_map: dict, entry_to_stack_file: dict) -> None:
+    """
+    Persist one changed vocab entry.
+
+    Only marks the entry dirty; the actual write (a journal append) happens
+    according to the autosave policy (see configure_autosave).
+    """
+    if vocab is None:
+        return
+
+    filename = entry_to_stack_file.get(id(vocab))
+    if not filename:
+        return
+
+    vocab_list = stack_vocab_lists.get(filename)
+    if vocab_list is None:
+        return
+
+    mark_entry_dirty(filename, vocab_list, vocab, stack_meta_map.get(filename))
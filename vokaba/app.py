@@ -14,6 +14,7 @@ import labels
 
 from vokaba.theme.theme_manager import apply_theme_from_config
 from vokaba.core.logging_utils import log
+from vokaba.core.repository import StackRepository
 from vokaba.mixins.ocr_import import OcrImportMixin
 
 
@@ -57,8 +58,14 @@ class VokabaApp(
             Config.set("input", "mouse", "mouse,disable_multitouch")
 
         self.config_data = save.load_settings()
+        save.configure_autosave_from_settings(self.config_data)
+        save.configure_storage_from_settings(self.config_data)
+        save.configure_knowledge_decay_from_settings(self.config_data)
         from kivy.clock import Clock
         Clock.schedule_once(lambda dt: self._maybe_show_legal_popup(), 0.4)
+
+        # Write-behind autosave: buffered learning updates and settings are flushed from here
+        Clock.schedule_interval(lambda dt: self._flush_autosave(), 0.5)
         self.colors = apply_theme_from_config(self.config_data)
 
         try:
@@ -79,11 +86,12 @@ class VokabaApp(
         self._install_dead_key_composer()
         self.window = FloatLayout()
 
+        # Loaded stacks, shared by all screens (vokaba/core/repository.py)
+        self.stack_repo = StackRepository()
+
         # App-level state used by learning autosave
         self.all_vocab_list = []
-        self.stack_vocab_lists = {}
-        self.stack_meta_map = {}
-        self.entry_to_stack_file = {}
+        self._learn_stacks = []
 
         # Window/App title (desktop title bar)
         try:
@@ -102,6 +110,16 @@ class VokabaApp(
         self.config_data.clear()
         self.config_data.update(new_cfg)
         self.colors = apply_theme_from_config(self.config_data)
+        save.configure_autosave_from_settings(self.config_data)
+        save.configure_storage_from_settings(self.config_data)
+        save.configure_knowledge_decay_from_settings(self.config_data)
+
+    def _flush_autosave(self):
+        try:
+            save.flush_due_writes()
+        except Exception as e:
+            log(f"autosave flush failed: {e}")
+        save.flush_due_settings()
 
     def _maybe_show_legal_popup(self):
         legal = self.config_data.get("settings", {}).get("legal", {})
@@ -196,4 +214,33 @@ class VokabaApp(
         except Exception:
             pass
 
+        try:
+            save.flush_pending_writes()
+        except Exception as e:
+            log(f"autosave flush on stop failed: {e}")
+
+        try:
+            # sqlite backend: keep the CSVs shareable/up to date
+            save.sync_csv_exports()
+        except Exception as e:
+            log(f"csv export on stop failed: {e}")
+
+        save.flush_settings()
+
+        try:
+            # desktop OCR: stop the warm runner process
+            if hasattr(self, "_ocr_shutdown_server"):
+                self._ocr_shutdown_server()
+        except Exception as e:
+            log(f"ocr server shutdown failed: {e}")
+
+    def on_pause(self):
+        # Android may kill a paused app without calling on_stop -> write buffered updates now
+        try:
+            save.flush_pending_writes()
+        except Exception as e:
+            log(f"autosave flush on pause failed: {e}")
+        save.flush_settings()
+        return True
+
 
@@ -0,0 +1,166 @@
+# vokaba/core/config_store.py
+"""
+In-memory config.yml with debounced, atomic writes.
+
+The settings screen saves on every slider tick / checkbox and learning saves
+the daily progress per card. Instead of dumping the YAML each time, the store
+keeps the config in memory and only marks it dirty; the file is written
+
+  - by flush_due() (UI timer) once the oldest unsaved change is older than
+    the write interval,
+  - by flush() (on_pause / on_stop, or before the file is read again),
+
+always via temp file + os.replace, and not at all if the serialized YAML is
+the same as what is already on disk.
+
+Uses the libyaml based CSafeLoader/CSafeDumper when PyYAML was built with it.
+"""
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import yaml
+
+from vokaba.core.logging_utils import log
+from vokaba.core.paths import fsync_file
+
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+DEFAULT_WRITE_INTERVAL_MS = 1000
+
+
+def dump_yaml(config: Dict) -> str:
+    return yaml.dump(config, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False)
+
+
+def load_yaml(text: str):
+    return yaml.load(text, Loader=YAML_LOADER)
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [int(st.st_size), int(st.st_mtime_ns)]
+
+
+class ConfigStore:
+    """config.yml of one data folder (see save.load_settings / save.save_settings)."""
+
+    def __init__(self, path: str, interval_ms: int = DEFAULT_WRITE_INTERVAL_MS):
+        self.path = str(path)
+        self.interval_ms = max(0, int(interval_ms))
+        self._lock = threading.RLock()
+
+        self._pending: Optional[Dict] = None  # config object with unsaved changes
+        self._since = 0.0  # monotonic time of the oldest unsaved change
+
+        # what is on disk: text we wrote/read, its parsed form, the file signature
+        self._disk_text: Optional[str] = None
+        self._disk_data: Optional[Dict] = None
+        self._disk_sig: Optional[List[int]] = None
+
+    # -------------------------
+    # Reading
+    # -------------------------
+
+    def exists(self) -> bool:
+        with self._lock:
+            return self._pending is not None or os.path.exists(self.path)
+
+    def read(self) -> Dict:
+        """
+        Parsed config (a copy the caller may change). Unsaved changes are
+        written first; the file is only parsed again if it changed on disk.
+        """
+        with self._lock:
+            self.flush()
+            sig = _file_signature(self.path)
+            if sig is not None and sig == self._disk_sig and self._disk_data is not None:
+                return copy.deepcopy(self._disk_data)
+
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                data = load_yaml(text) or {}
+            except Exception as e:
+                log(f"config read failed: {e}")
+                self._disk_text = None
+                self._disk_data = None
+                self._disk_sig = None
+                return {}
+
+            if not isinstance(data, dict):
+                data = {}
+            self._disk_text = text
+            self._disk_data = data
+            self._disk_sig = sig
+            return copy.deepcopy(data)
+
+    # -------------------------
+    # Writing
+    # -------------------------
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending is not None
+
+    def mark_dirty(self, config: Dict) -> None:
+        """Remember config for the next write (kept by reference)."""
+        with self._lock:
+            if self._pending is None:
+                self._since = time.monotonic()
+            self._pending = config
+        if self.interval_ms == 0:
+            self.flush()
+
+    def flush_due(self) -> bool:
+        """Timer hook: write if the oldest unsaved change is older than the interval."""
+        with self._lock:
+            if self._pending is None:
+                return False
+            if time.monotonic() - self._since < self.interval_ms / 1000.0:
+                return False
+            return self.flush()
+
+    def flush(self) -> bool:
+        """Write unsaved changes now. Returns True if the file was written."""
+        with self._lock:
+            config = self._pending
+            if config is None:
+                return False
+            self._pending = None
+
+            try:
+                text = dump_yaml(config)
+            except Exception as e:
+                log(f"config serialize failed: {e}")
+                return False
+
+            if text == self._disk_text and _file_signature(self.path) == self._disk_sig:
+                return False
+
+            tmp = self.path + ".tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    fsync_file(f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                log(f"config write failed: {e}")
+                # keep it dirty, the next flush retries
+                if self._pending is None:
+                    self._pending = config
+                return False
+
+            self._disk_text = text
+            self._disk_data = copy.deepcopy(config)
+            self._disk_sig = _file_signature(self.path)
+            return True
@@ -0,0 +1,9 @@
+# vokaba/core/engine/__init__.py
+"""
+Headless learning engine (no Kivy): scheduling, scoring, SRS, mode choice,
+answer checking and the Session API LearnMixin delegates to.
+"""
+from vokaba.core.engine import answers, modes, scoring, srs
+from vokaba.core.engine.session import Session
+
+__all__ = ["Session", "answers", "modes", "scoring", "srs"]
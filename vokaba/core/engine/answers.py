@@ -0,0 +1,222 @@
+# vokaba/core/engine/answers.py
+"""
+Answer checking for the typing mode.
+
+Expected answers may list alternatives ("save, keep" / "a; b" / "a/b") and
+optional parts in parentheses ("(to) save" matches "save" and "to save").
+Comparison ignores case, accents, punctuation and whitespace.
+"""
+from __future__ import annotations
+
+import difflib
+import re
+import unicodedata
+from typing import Dict, List
+
+ANSWER_SEPARATORS = {";", ",", "/"}
+
+
+def strip_accents(ch: str) -> str:
+    decomposed = unicodedata.normalize("NFD", ch)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def remove_parenthetical(text: str) -> str:
+    if not text:
+        return ""
+    out = []
+    in_parens = False
+    for ch in text:
+        if ch == "(":
+            in_parens = True
+            continue
+        if ch == ")":
+            in_parens = False
+            continue
+        if not in_parens:
+            out.append(ch)
+    return "".join(out)
+
+
+def normalize_for_compare(text: str) -> str:
+    if not text:
+        return ""
+    no_par = remove_parenthetical(text)
+    letters = []
+    for ch in no_par:
+        if ch.isalpha():
+            letters.append(strip_accents(ch).lower())
+    return "".join(letters)
+
+
+def extract_main_lexeme(text: str) -> str:
+    if not text:
+        return ""
+    no_par = remove_parenthetical(text).strip()
+    parts = no_par.split()
+    return parts[-1] if parts else no_par
+
+
+def split_outside_parentheses(text: str, seps=ANSWER_SEPARATORS) -> List[str]:
+    """
+    Split text by separators, but IGNORE separators inside parentheses.
+    Example: "(to, in order to) save, keep" =>
+      ["(to, in order to) save", "keep"]
+    """
+    if text is None:
+        return [""]
+    s = str(text)
+    out = []
+    buf = []
+    depth = 0
+    for ch in s:
+        if ch == "(":
+            depth += 1
+        elif ch == ")" and depth > 0:
+            depth -= 1
+
+        if depth == 0 and ch in seps:
+            part = "".join(buf).strip()
+            if part:
+                out.append(part)
+            buf = []
+            continue
+
+        buf.append(ch)
+
+    last = "".join(buf).strip()
+    if last:
+        out.append(last)
+
+    return out or [s.strip()]
+
+
+def expand_parenthetical_variants(text: str) -> List[str]:
+    """
+    Expands optional parentheses:
+      '(to) save' -> ['save', 'to save']
+      '(to, in order to) save' -> ['save', 'to save', 'in order to save']
+    Multiple parentheses are combined (cartesian product), but typically small.
+    """
+    if text is None:
+        return [""]
+    s = str(text)
+
+    variants: List[str] = []
+
+    def rec(prefix: str, rest: str):
+        m = re.search(r"\(([^)]*)\)", rest)
+        if not m:
+            variants.append(prefix + rest)
+            return
+
+        before = rest[: m.start()]
+        inside = (m.group(1) or "").strip()
+        after = rest[m.end() :]
+
+        # comma-separated options inside parentheses
+        opts = []
+        if inside:
+            for part in inside.split(","):
+                part = part.strip()
+                if part:
+                    opts.append(part)
+
+        # '' means "omit the parentheses entirely"
+        for opt in ([""] + opts):
+            rec(prefix + before + (opt if opt else ""), after)
+
+    rec("", s)
+
+    # cleanup spacing + dedupe (preserve order)
+    seen = set()
+    out = []
+    for v in variants:
+        v2 = re.sub(r"\s+", " ", v).strip()
+        if not v2:
+            continue
+        key = v2.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(v2)
+
+    return out or [re.sub(r"\s+", " ", s).strip()]
+
+
+def typing_candidates(vocab: Dict) -> List[str]:
+    """
+    Split the expected answer string into top-level candidates.
+    IMPORTANT: commas inside (...) are treated as "options", not separators.
+    """
+    foreign = vocab.get("foreign_language", "") or ""
+    cands = split_outside_parentheses(foreign, seps=ANSWER_SEPARATORS)
+    cands = [c.strip() for c in cands if str(c).strip()]
+    return cands or [foreign.strip()]
+
+
+def is_correct_typed_answer(typed: str, vocab: Dict) -> bool:
+    typed_norm = normalize_for_compare(typed)
+    if not typed_norm:
+        return False
+
+    for cand in typing_candidates(vocab):
+        # Variants: "(to) save" => ["save", "to save"]
+        for variant in expand_parenthetical_variants(cand):
+            full = normalize_for_compare(variant)
+            main = normalize_for_compare(extract_main_lexeme(variant))
+            if typed_norm == full or typed_norm == main:
+                return True
+
+    return False
+
+
+def best_variant_for_expected(typed: str, expected: str) -> str:
+    """Pick the expected-variant (expanded from parentheses) that best matches the user's input."""
+    typed_norm = normalize_for_compare(typed)
+    vars_ = expand_parenthetical_variants(expected)
+    if not typed_norm:
+        # default: expected without parentheses
+        return vars_[0] if vars_ else (expected or "")
+
+    best_v = expected or ""
+    best_score = -1.0
+    for v in vars_:
+        sc = difflib.SequenceMatcher(None, typed_norm, normalize_for_compare(v)).ratio()
+        if sc > best_score:
+            best_score = sc
+            best_v = v
+    return best_v
+
+
+def best_candidate_for_feedback(typed: str, vocab: Dict) -> str:
+    """
+    Candidate most similar to the user's input, so the feedback makes sense.
+    (Respects parenthesis variants: '(to) save' also matches 'to save'.)
+    """
+    typed_norm = normalize_for_compare(typed)
+    cands = typing_candidates(vocab)
+    if not typed_norm:
+        return cands[0]
+
+    best_cand = cands[0]
+    best_score = -1.0
+    for c in cands:
+        # score against best matching variant
+        score = 0.0
+        for v in expand_parenthetical_variants(c):
+            score = max(score, difflib.SequenceMatcher(None, typed_norm, normalize_for_compare(v)).ratio())
+        if score > best_score:
+            best_score = score
+            best_cand = c
+    return best_cand
+
+
+def typing_mismatch_count(typed: str, expected: str) -> int:
+    a = normalize_for_compare(typed)
+    b = normalize_for_compare(best_variant_for_expected(typed, expected))
+
+    n = min(len(a), len(b))
+    mism = sum(1 for i in range(n) if a[i] != b[i])
+    mism += abs(len(a) - len(b))
+    return int(mism)
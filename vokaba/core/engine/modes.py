@@ -0,0 +1,73 @@
+# vokaba/core/engine/modes.py
+"""Which learning modes exist and which one a card gets."""
+from __future__ import annotations
+
+import random
+from typing import Dict, Iterable, List, Optional
+
+from vokaba.core.dict_path import bool_cast
+
+ALL_MODES = [
+    "front_back",
+    "back_front",
+    "multiple_choice",
+    "connect_pairs",
+    "letter_salad",
+    "syllable_salad",
+    "typing",
+]
+
+# knowledge_level upper bound -> modes for that band
+LEVEL_BANDS = [
+    (0.35, {"front_back", "back_front", "multiple_choice", "connect_pairs"}),
+    (0.60, {"multiple_choice", "connect_pairs", "letter_salad", "syllable_salad"}),
+    (1.00, {"multiple_choice", "connect_pairs", "letter_salad", "syllable_salad", "typing"}),
+]
+
+# minimum vocab counts a mode needs (total entries / unique pairs)
+MIN_TOTAL_VOCAB = {"multiple_choice": 5, "syllable_salad": 3}
+MIN_UNIQUE_PAIRS = {"connect_pairs": 5}
+
+
+def available_modes(modes_cfg: Optional[Dict], total_vocab: int, unique_pairs: int) -> List[str]:
+    """Enabled modes (settings.modes) that have enough vocab to be played."""
+    modes_cfg = modes_cfg or {}
+    order = ["front_back", "back_front", "letter_salad", "typing", "multiple_choice", "connect_pairs", "syllable_salad"]
+
+    available = []
+    for mode in order:
+        if not bool_cast(modes_cfg.get(mode, True)):
+            continue
+        if total_vocab < MIN_TOTAL_VOCAB.get(mode, 0):
+            continue
+        if unique_pairs < MIN_UNIQUE_PAIRS.get(mode, 0):
+            continue
+        available.append(mode)
+
+    return available or ["front_back"]
+
+
+def mode_pool_for_level(level: float, available: Iterable[str]) -> List[str]:
+    available = list(available or ["front_back"])
+    try:
+        lvl = max(0.0, min(1.0, float(level or 0.0)))
+    except Exception:
+        lvl = 0.0
+
+    base = LEVEL_BANDS[-1][1]
+    for upper, modes in LEVEL_BANDS:
+        if lvl <= upper:
+            base = modes
+            break
+
+    candidates = [m for m in available if m in base]
+    return candidates or available
+
+
+def choose_mode(entry: Optional[Dict], available: Iterable[str], rng=None) -> str:
+    rng = rng or random
+    available = list(available or ["front_back"])
+    if not entry:
+        return rng.choice(available)
+    pool = mode_pool_for_level(float(entry.get("knowledge_level", 0.0) or 0.0), available)
+    return rng.choice(pool) if pool else "front_back"
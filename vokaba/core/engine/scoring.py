@@ -0,0 +1,162 @@
+# vokaba/core/engine/scoring.py
+"""
+Knowledge deltas per mode/outcome.
+
+The values come from labels.knowledge_delta_* (so they stay tunable in one
+place); DEFAULT_DELTAS are the fallbacks the UI always used.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+try:
+    import labels
+except ImportError:  # engine used outside the app (tools, benchmarks)
+    labels = None
+
+DEFAULT_DELTAS = {
+    "self_very_easy": 0.09,
+    "self_easy": 0.05,
+    "self_hard": -0.01,
+    "self_very_hard": -0.08,
+    "multiple_choice_correct": 0.07,
+    "multiple_choice_wrong": -0.06,
+    "letter_salad_per_correct_letter": 0.01,
+    "letter_salad_short_word_bonus": 0.02,
+    "letter_salad_wrong_letter": -0.025,
+    "connect_pairs_correct_word": 0.06,
+    "connect_pairs_wrong_word": -0.074,
+    "typing_correct": 0.093,
+    "typing_first_try_bonus": 0.03,
+    "typing_fail_penalty": 0.04,
+    "typing_wrong_per_attempt": -0.06,
+    "typing_wrong_per_char": -0.01,
+    "syllable_correct_word": 0.08,
+    "syllable_wrong_word": -0.05,
+}
+
+# knowledge lost per calendar day.
+# Decay is lazy: knowledge_level is the level as of knowledge_date (ISO date);
+# the decay since then is subtracted when the level is read (effective_knowledge)
+# and only written back together with the next real change of the entry.
+DAILY_DECAY = 0.005
+KNOWLEDGE_DATE_FIELD = "knowledge_date"
+
+# self rating -> (srs quality, counts as correct)
+SELF_RATING_QUALITY = {
+    "very_easy": (1.0, True),
+    "easy": (0.75, True),
+    "hard": (0.4, False),
+    "very_hard": (0.1, False),
+}
+
+# self rating after a correct typed answer -> (delta multiplier, srs quality)
+TYPING_RATING = {
+    "very_easy": (1.2, 1.0),
+    "easy": (1.0, 0.75),
+    "hard": (0.7, 0.4),
+    "very_hard": (0.4, 0.1),
+}
+
+
+def delta(name: str) -> float:
+    """labels.knowledge_delta_<name>, falling back to DEFAULT_DELTAS."""
+    return getattr(labels, f"knowledge_delta_{name}", DEFAULT_DELTAS.get(name, 0.0))
+
+
+def _float_delta(name: str) -> float:
+    # the typing values were always read with an "or default" fallback
+    return float(delta(name) or DEFAULT_DELTAS[name])
+
+
+def _parse_day(value) -> Optional[date]:
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def pending_decay_days(entry: Dict, today: Optional[date] = None, base_date=None) -> int:
+    """Days of decay not yet applied to knowledge_level (undated entries count from base_date)."""
+    since = _parse_day(entry.get(KNOWLEDGE_DATE_FIELD)) or _parse_day(base_date)
+    if since is None:
+        return 0
+    return max(0, ((today or date.today()) - since).days)
+
+
+def effective_knowledge(entry: Dict, today: Optional[date] = None, base_date=None) -> float:
+    """knowledge_level minus the decay since knowledge_date (clamped to 0..1)."""
+    try:
+        lvl = float(entry.get("knowledge_level", 0.0) or 0.0)
+    except Exception:
+        lvl = 0.0
+    days = pending_decay_days(entry, today, base_date)
+    return max(0.0, min(1.0, lvl - DAILY_DECAY * days))
+
+
+def materialize_decay(entry: Dict, today: Optional[date] = None, base_date=None) -> float:
+    """Apply pending decay in place (knowledge_level + knowledge_date = today). Returns the level."""
+    today = today or date.today()
+    lvl = effective_knowledge(entry, today, base_date)
+    entry["knowledge_level"] = lvl
+    entry[KNOWLEDGE_DATE_FIELD] = today.isoformat()
+    return lvl
+
+
+def apply_delta(entry: Dict, d: float, today: Optional[date] = None) -> float:
+    """Add d to knowledge_level of entry (clamped to 0..1). Returns the new level."""
+    try:
+        d = float(d)
+    except Exception:
+        d = 0.0
+
+    new = max(0.0, min(1.0, materialize_decay(entry, today) + d))
+    entry["knowledge_level"] = new
+    return new
+
+
+def self_rating(quality: str) -> Tuple[float, float, bool]:
+    """Flashcard self rating -> (delta, srs quality, correct). Unknown ratings count as very_hard."""
+    if quality not in SELF_RATING_QUALITY:
+        quality = "very_hard"
+    q_val, correct = SELF_RATING_QUALITY[quality]
+    return delta(f"self_{quality}"), q_val, correct
+
+
+def multiple_choice(correct: bool) -> Tuple[float, float]:
+    """-> (delta, srs quality)"""
+    if correct:
+        return delta("multiple_choice_correct"), 1.0
+    return delta("multiple_choice_wrong"), 0.0
+
+
+def typing_auto(attempts: int) -> Tuple[float, float]:
+    """Correct typed answer without self rating after `attempts` wrong tries -> (delta, srs quality)."""
+    attempts = max(0, int(attempts or 0))
+    base = _float_delta("typing_correct")
+    bonus = _float_delta("typing_first_try_bonus") if attempts == 0 else 0.0
+    fail_pen = _float_delta("typing_fail_penalty")
+
+    d = max(0.02, base + bonus - (attempts * fail_pen))
+    q_val = max(0.1, 1.0 - 0.25 * attempts)
+    return d, q_val
+
+
+def typing_rated(quality: str) -> Tuple[float, float]:
+    """Correct typed answer + self rating -> (delta, srs quality)."""
+    mult, q_val = TYPING_RATING.get(quality, TYPING_RATING["very_hard"])
+    return _float_delta("typing_correct") * mult, q_val
+
+
+def typing_wrong_attempt() -> float:
+    return _float_delta("typing_wrong_per_attempt")
+
+
+def typing_wrong_chars(mismatches: int) -> float:
+    return delta("typing_wrong_per_char") * max(1, int(mismatches or 0))
+
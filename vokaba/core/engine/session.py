@@ -0,0 +1,194 @@
+# vokaba/core/engine/session.py
+"""
+One learning session over a pool of vocab entries, without any UI.
+
+    session = Session(entries, available_modes=["front_back", "typing"], session_size=20)
+    card = session.next_card()            # {"index", "entry", "mode"}
+    ...user answers...
+    finished = session.submit_result(correct=True, delta=0.05, quality=0.75)
+    session.summary()                     # {"done", "correct", "wrong", "goal", "finished"}
+
+Modes with several steps per card (letter salad, connect pairs, ...) use the
+building blocks directly: adjust_knowledge() per click, review() when the
+card is done, register_step() to count it.
+
+Every change to an entry is reported to on_entry_changed(entry) (LearnMixin
+hands it to the autosave). clock() returns "now"; simulations pass their own.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from vokaba.core.engine import modes, scoring, srs
+from vokaba.core.scheduler import make_scheduler
+
+
+class Session:
+    def __init__(
+        self,
+        entries: List[Dict],
+        available_modes: Iterable[str] = ("front_back",),
+        session_size: int = 20,
+        rng=None,
+        on_entry_changed: Optional[Callable[[Dict], None]] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+        scheduler_backend: str = "auto",
+    ):
+        self.entries = entries
+        self.available_modes = list(available_modes or ["front_back"])
+        self.session_size = max(1, int(session_size or 1))
+        self.rng = rng or random
+        self.on_entry_changed = on_entry_changed
+        self.clock = clock or datetime.now
+        self.scheduler_backend = scheduler_backend
+
+        self.current_index = 0
+        self.current_mode: Optional[str] = None
+        self._scheduler = None  # DueScheduler / NumpyDueScheduler
+        self.reset_counters()
+
+    # -------------------------
+    # Pool / scheduling
+    # -------------------------
+
+    def reset_counters(self) -> None:
+        self.cards_done = 0
+        self.correct = 0
+        self.wrong = 0
+
+    def set_entries(self, entries: List[Dict]) -> None:
+        """Switch to another pool list (counters are kept)."""
+        self.entries = entries
+        self._scheduler = None
+
+    def set_scheduler_backend(self, backend: str) -> None:
+        """See scheduler.SCHEDULER_BACKENDS; the scheduler is rebuilt on the next pick."""
+        if backend != self.scheduler_backend:
+            self.scheduler_backend = backend
+            self._scheduler = None
+
+    @property
+    def scheduler(self):
+        sched = self._scheduler
+        if sched is None or sched.entries is not self.entries or len(sched) != len(self.entries):
+            sched = make_scheduler(
+                self.entries,
+                rng=self.rng,
+                now=self.clock().timestamp(),
+                backend=self.scheduler_backend,
+            )
+            self._scheduler = sched
+        return sched
+
+    def pick_index(self, avoid_current: bool = True) -> int:
+        if len(self.entries) <= 1:
+            return 0
+        avoid = self.current_index if avoid_current else None
+        return self.scheduler.pick(avoid=avoid, now=self.clock().timestamp())
+
+    def choose_mode(self, entry: Optional[Dict]) -> str:
+        return modes.choose_mode(entry, self.available_modes, self.rng)
+
+    def current_entry(self) -> Optional[Dict]:
+        if not self.entries:
+            return None
+        if not (0 <= self.current_index < len(self.entries)):
+            self.current_index = 0
+        return self.entries[self.current_index]
+
+    def current_card(self) -> Optional[Dict]:
+        entry = self.current_entry()
+        if entry is None:
+            return None
+        return {"index": self.current_index, "entry": entry, "mode": self.current_mode}
+
+    def next_card(self, avoid_current: bool = True) -> Optional[Dict]:
+        """Pick the next card and its mode."""
+        if not self.entries:
+            return None
+        self.current_index = self.pick_index(avoid_current=avoid_current)
+        self.current_mode = self.choose_mode(self.current_entry())
+        return self.current_card()
+
+    # -------------------------
+    # Results
+    # -------------------------
+
+    def _changed(self, entry: Dict) -> None:
+        sched = self._scheduler
+        if sched is not None:
+            sched.update(entry, now=self.clock().timestamp())
+        if self.on_entry_changed is not None:
+            self.on_entry_changed(entry)
+
+    def adjust_knowledge(self, entry: Optional[Dict], delta: float, persist: bool = True) -> Optional[float]:
+        """Add delta to knowledge_level of entry. Returns the new level."""
+        if not entry:
+            return None
+        new = scoring.apply_delta(entry, delta, today=self.clock().date())
+        if persist:
+            self._changed(entry)
+        elif self._scheduler is not None:
+            self._scheduler.update(entry, now=self.clock().timestamp())
+        return new
+
+    def review(self, entry: Optional[Dict], was_correct: bool, quality: float = 0.5) -> None:
+        """SRS update of entry after it was answered."""
+        if not entry:
+            return
+        srs.apply_review(entry, was_correct, quality, now=self.clock())
+        self._changed(entry)
+
+    def register_step(self, was_correct: Optional[bool] = None, steps: int = 1) -> bool:
+        """Count answered cards. Returns True when the session target is reached."""
+        try:
+            steps = int(steps)
+        except Exception:
+            steps = 1
+        steps = max(1, steps)
+
+        self.cards_done += steps
+        if was_correct is True:
+            self.correct += steps
+        elif was_correct is False:
+            self.wrong += steps
+        return self.finished
+
+    def submit_result(
+        self,
+        correct: bool,
+        delta: Optional[float] = None,
+        quality: Optional[float] = None,
+        entry: Optional[Dict] = None,
+        steps: int = 1,
+    ) -> bool:
+        """
+        Apply the outcome of one card: knowledge delta and SRS review (each
+        unless None) and the session counters. entry defaults to the current
+        card. Returns True when the session target is reached.
+        """
+        entry = entry if entry is not None else self.current_entry()
+        if delta is not None:
+            self.adjust_knowledge(entry, delta)
+        if quality is not None:
+            self.review(entry, was_correct=correct, quality=quality)
+        return self.register_step(was_correct=correct, steps=steps)
+
+    # -------------------------
+    # Summary
+    # -------------------------
+
+    @property
+    def finished(self) -> bool:
+        return self.cards_done >= self.session_size
+
+    def summary(self) -> Dict:
+        return {
+            "done": self.cards_done,
+            "correct": self.correct,
+            "wrong": self.wrong,
+            "goal": self.session_size,
+            "finished": self.finished,
+        }
@@ -0,0 +1,45 @@
+# vokaba/core/engine/srs.py
+"""SRS interval math (streak-based intervals, due at midnight)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+# days until the next review, by streak (capped at the last value)
+BASE_INTERVALS = [1, 2, 4, 7, 14, 30]
+
+
+def interval_days(streak: int, quality: float = 0.5) -> int:
+    """Days until the next review for a streak; quality 0..1 scales by 0.75..1.25."""
+    idx = min(max(0, int(streak)), len(BASE_INTERVALS) - 1)
+    days = BASE_INTERVALS[idx]
+
+    try:
+        q = float(quality)
+    except Exception:
+        q = 0.5
+    q = max(0.0, min(1.0, q))
+    factor = 0.75 + 0.5 * q
+    return max(1, int(days * factor))
+
+
+def apply_review(entry: Dict, was_correct: bool, quality: float = 0.5, now: Optional[datetime] = None) -> datetime:
+    """
+    Update srs_streak / srs_last_seen / srs_due of entry after an answer.
+    Returns the new due datetime.
+    """
+    now = now or datetime.now()
+
+    try:
+        streak = int(entry.get("srs_streak", 0) or 0)
+    except Exception:
+        streak = 0
+
+    streak = streak + 1 if was_correct else 0
+    entry["srs_streak"] = streak
+    entry["srs_last_seen"] = now.isoformat()
+
+    days = interval_days(streak, quality)
+    due = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days)
+    entry["srs_due"] = due.isoformat()
+    return due
@@ -164,3 +164,31 @@ def vocab_root_string() -> str:
     if not root.endswith("/"):
         root += "/"
     return root
+
+
+def stack_key(filename) -> str:
+    """Key of a stack file in caches and indexes: the same file always gets the same key."""
+    return os.path.normcase(os.path.abspath(str(filename)))
+
+
+def fsync_file(f) -> None:
+    """Flush an open file to disk (before os.replace() puts it in place)."""
+    f.flush()
+    try:
+        os.fsync(f.fileno())
+    except OSError:
+        pass
+
+
+def fsync_dir(path) -> None:
+    """Make a rename in the folder of path durable; no-op where directories can't be opened (Windows)."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,208 @@
+# vokaba/core/progress_journal.py
+"""
+Append-only progress journal for one stack CSV.
+
+Learning only changes the progress fields of an entry (knowledge_*, srs_*),
+so instead of rewriting the whole CSV per answer we append one small JSON line
+per changed entry to "<stack>.csv.journal". load_vocab replays the journal on
+top of the CSV; save.compact_journal folds it back into the CSV.
+
+File layout (one JSON object per line):
+  {"v": 1, "csv": [size, mtime_ns]}               header, binds the journal to one CSV state
+  {"i": 3, "o": "...", "f": "...", "k": 0.42, ...} record
+
+Record keys:
+  i = row index in the CSV, o/f = own/foreign text (to re-find moved rows),
+  k = knowledge_level, s = srs_streak, l = srs_last_seen, d = srs_due,
+  kd = knowledge_date
+
+If the CSV was replaced behind our back (import, manual edit) the header no
+longer matches and the journal is ignored.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
+
+# record key -> vocab field
+RECORD_FIELDS = {
+    "k": "knowledge_level",
+    "s": "srs_streak",
+    "l": "srs_last_seen",
+    "d": "srs_due",
+    "kd": "knowledge_date",
+}
+
+
+def journal_path(filename: str) -> str:
+    return str(filename) + JOURNAL_SUFFIX
+
+
+def csv_signature(filename: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return [int(st.st_size), int(st.st_mtime_ns)]
+
+
+def journal_size(filename: str) -> int:
+    try:
+        return int(os.path.getsize(journal_path(filename)))
+    except OSError:
+        return 0
+
+
+def remove_journal(filename: str) -> None:
+    try:
+        os.remove(journal_path(filename))
+    except FileNotFoundError:
+        pass
+
+
+def make_record(index: int, entry: Dict) -> Dict:
+    rec = {
+        "i": int(index),
+        "o": entry.get("own_language") or "",
+        "f": entry.get("foreign_language") or "",
+    }
+    for key, field in RECORD_FIELDS.items():
+        rec[key] = entry.get(field, "")
+    return rec
+
+
+def append_records(filename: str, records: Iterable[Dict]) -> int:
+    """
+    Append records to the journal of filename (creates it with a header if needed).
+    Returns the number of bytes written.
+    """
+    path = journal_path(filename)
+    lines: List[str] = []
+
+    if not os.path.exists(path):
+        sig = csv_signature(filename)
+        if sig is None:
+            raise FileNotFoundError(filename)
+        lines.append(json.dumps({"v": JOURNAL_VERSION, "csv": sig}, ensure_ascii=False))
+
+    for rec in records:
+        lines.append(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+
+    if not lines:
+        return 0
+
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+    return len(data)
+
+
+def read_records(filename: str) -> List[Dict]:
+    """
+    Return the valid records for the current CSV state.
+    A stale journal (CSV changed since the header was written) is deleted.
+    A torn last line (crash during append) is skipped.
+    """
+    path = journal_path(filename)
+    if not os.path.exists(path):
+        return []
+
+    records: List[Dict] = []
+    header_ok = False
+
+    with open(path, "r", encoding="utf-8") as f:
+        for n, raw in enumerate(f):
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                obj = json.loads(raw)
+            except ValueError:
+                continue
+            if not isinstance(obj, dict):
+                continue
+            if n == 0:
+                header_ok = obj.get("v") == JOURNAL_VERSION and obj.get("csv") == csv_signature(filename)
+                if not header_ok:
+                    break
+                continue
+            records.append(obj)
+
+    if not header_ok:
+        remove_journal(filename)
+        return []
+    return records
+
+
+def _find_row(vocab: List[Dict], rec: Dict, by_pair: Dict[Tuple[str, str], int]) -> Optional[int]:
+    own = rec.get("o") or ""
+    foreign = rec.get("f") or ""
+    try:
+        idx = int(rec.get("i", -1))
+    except (TypeError, ValueError):
+        idx = -1
+
+    if 0 <= idx < len(vocab):
+        e = vocab[idx]
+        if (e.get("own_language") or "") == own and (e.get("foreign_language") or "") == foreign:
+            return idx
+    return by_pair.get((own, foreign))
+
+
+def replay(vocab: List[Dict], records: List[Dict]) -> int:
+    """Apply journal records to vocab (in place). Returns the number of applied records."""
+    if not records:
+        return 0
+
+    by_pair: Dict[Tuple[str, str], int] = {}
+    for i, e in enumerate(vocab):
+        by_pair.setdefault(((e.get("own_language") or ""), (e.get("foreign_language") or "")), i)
+
+    applied = 0
+    for rec in records:
+        idx = _find_row(vocab, rec, by_pair)
+        if idx is None:
+            continue
+        _apply_record(vocab[idx], rec)
+        applied += 1
+    return applied
+
+
+def _apply_record(entry: Dict, rec: Dict) -> None:
+    for key, field in RECORD_FIELDS.items():
+        if key in rec:
+            entry[field] = rec[key]
+
+
+def replay_iter(entries: Iterable[Dict], records: List[Dict]) -> Iterator[Dict]:
+    """
+    replay() for a stream of rows: yields the entries with their records
+    applied. Records are matched by row index only (a record whose row text
+    doesn't match is skipped, not searched for); the journal is bound to this
+    exact CSV state, so the index is right unless the files were tampered with.
+    """
+    by_index: Dict[int, List[Dict]] = {}
+    for rec in records:
+        try:
+            by_index.setdefault(int(rec.get("i", -1)), []).append(rec)
+        except (TypeError, ValueError):
+            continue
+
+    for i, entry in enumerate(entries):
+        recs = by_index.get(i) if by_index else None
+        if recs:
+            own = entry.get("own_language") or ""
+            foreign = entry.get("foreign_language") or ""
+            for rec in recs:
+                if (rec.get("o") or "") == own and (rec.get("f") or "") == foreign:
+                    _apply_record(entry, rec)
+        yield entry
@@ -0,0 +1,278 @@
+# vokaba/core/repository.py
+"""
+In-memory stack repository shared by all screens (VokabaApp.stack_repo).
+
+Every stack is loaded once; the stack screen, add/edit, export and learning
+all get the SAME list and entry dicts, so a change made on one screen is
+what the others see and write. A stack is only reloaded if its files changed
+on disk behind the app's back (signature = csv size/mtime + journal size);
+the app's own writes keep the cache valid (save.add_stack_write_listener).
+
+Entries are tied to their stack by a StackHandle instead of a bare
+id(entry) -> filename dict: the repository keeps the entry itself next to
+its id, so an id can't be reused by another dict while it is mapped.
+
+    repo = StackRepository()
+    handle = repo.get(filename)        # StackHandle(filename, vocab, meta)
+    repo.mark_entry_dirty(entry)       # autosave of one changed entry
+    repo.save(filename, vocab_list)    # full write (add/edit/import)
+    repo.flush()                       # write everything that is dirty
+"""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import save
+from vokaba.core.engine import scoring
+from vokaba.core.logging_utils import log
+from vokaba.core.paths import stack_key
+
+DEFAULT_META = ("Deutsch", "Englisch", "Latein", False)
+
+
+class StackHandle:
+    """One loaded stack. stale becomes True once the repository dropped it."""
+
+    __slots__ = ("filename", "key", "vocab", "meta", "sig", "day", "stale", "entry_ids")
+
+    def __init__(self, filename: str, vocab: List[Dict], meta: Tuple, sig: Optional[List[int]]):
+        self.filename = filename
+        self.key = stack_key(filename)
+        self.vocab = vocab
+        self.meta = meta
+        self.sig = sig
+        self.day = date.today()
+        self.stale = False
+        self.entry_ids: List[int] = []
+
+    @property
+    def own_language(self) -> str:
+        return self.meta[0]
+
+    @property
+    def foreign_language(self) -> str:
+        return self.meta[1]
+
+    @property
+    def latin_language(self) -> str:
+        return self.meta[2]
+
+    @property
+    def latin_active(self) -> bool:
+        return bool(self.meta[3])
+
+    def __repr__(self) -> str:
+        return f"StackHandle({self.filename!r}, {len(self.vocab)} entries{', stale' if self.stale else ''})"
+
+
+class StackRepository:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._stacks: Dict[str, StackHandle] = {}
+        # id(entry) -> (entry, handle); holding the entry keeps its id unique
+        self._owner: Dict[int, Tuple[Dict, StackHandle]] = {}
+        save.add_stack_write_listener(self._on_stack_written)
+
+    def close(self) -> None:
+        save.remove_stack_write_listener(self._on_stack_written)
+        self.clear()
+
+    # -------------------------
+    # Loading
+    # -------------------------
+
+    def get(self, filename: str) -> StackHandle:
+        """Handle of filename; loaded on first use or if the files changed on disk."""
+        key = stack_key(filename)
+        with self._lock:
+            handle = self._stacks.get(key)
+            if handle is not None:
+                if save.has_pending_writes(filename) or handle.sig == save.stack_signature(filename):
+                    self._refresh_decay(handle)
+                    return handle
+                log(f"stack changed on disk, reloading: {filename}")
+                self._drop(handle)
+
+            vocab, own, foreign, latin, latin_active = save.load_vocab(filename)
+            handle = StackHandle(
+                str(filename),
+                vocab,
+                (own or DEFAULT_META[0], foreign or DEFAULT_META[1], latin or DEFAULT_META[2], bool(latin_active)),
+                save.stack_signature(filename),
+            )
+            self._stacks[key] = handle
+            self._index(handle)
+            return handle
+
+    def vocab(self, filename: str) -> List[Dict]:
+        return self.get(filename).vocab
+
+    def meta(self, filename: str) -> Tuple:
+        return self.get(filename).meta
+
+    def peek(self, filename: str) -> Optional[StackHandle]:
+        """Handle if the stack is loaded (no I/O)."""
+        with self._lock:
+            return self._stacks.get(stack_key(filename))
+
+    def loaded(self) -> List[StackHandle]:
+        with self._lock:
+            return list(self._stacks.values())
+
+    def is_current(self, handle: Optional[StackHandle]) -> bool:
+        """True if handle is still the repository's copy of its stack (not reloaded/dropped)."""
+        if handle is None or handle.stale:
+            return False
+        with self._lock:
+            return self._stacks.get(handle.key) is handle
+
+    def _refresh_decay(self, handle: StackHandle) -> None:
+        # stack stayed loaded over midnight: apply the new day's decay like a load would
+        today = date.today()
+        if handle.day == today:
+            return
+        base = save.knowledge_decay_base_date()
+        for e in handle.vocab:
+            scoring.materialize_decay(e, today, base)
+        handle.day = today
+
+    # -------------------------
+    # Entry handles
+    # -------------------------
+
+    def _index(self, handle: StackHandle) -> None:
+        owner = self._owner
+        handle.entry_ids = [id(e) for e in handle.vocab]
+        for e in handle.vocab:
+            owner[id(e)] = (e, handle)
+
+    def _unindex(self, handle: StackHandle) -> None:
+        owner = self._owner
+        for k in handle.entry_ids:
+            owned = owner.get(k)
+            if owned is not None and owned[1] is handle:
+                del owner[k]
+        handle.entry_ids = []
+
+    def stack_of(self, entry: Dict) -> Optional[StackHandle]:
+        """Handle of the stack entry belongs to (None if unknown or dropped)."""
+        with self._lock:
+            owned = self._owner.get(id(entry))
+            if owned is None or owned[0] is not entry or owned[1].stale:
+                return None
+            return owned[1]
+
+    # -------------------------
+    # Writing
+    # -------------------------
+
+    def mark_entry_dirty(self, entry: Dict) -> bool:
+        """Progress of entry changed -> autosave (save.mark_entry_dirty). False if entry is unknown."""
+        handle = self.stack_of(entry)
+        if handle is None:
+            return False
+        save.mark_entry_dirty(handle.filename, handle.vocab, entry, handle.meta)
+        return True
+
+    def mark_dirty(self, filename: str) -> None:
+        """The list of filename changed (rows added/removed) -> full write on the next flush."""
+        handle = self.get(filename)
+        with self._lock:
+            self._unindex(handle)
+            self._index(handle)
+        save.mark_stack_dirty(handle.filename, handle.vocab, handle.meta)
+
+    def save(self, filename: str, vocab_list: Optional[List[Dict]] = None, meta: Optional[Tuple] = None) -> StackHandle:
+        """
+        Write filename now. vocab_list/meta default to the loaded copy; a new
+        list replaces the loaded one (handles of the old list become stale).
+        """
+        with self._lock:
+            handle = self.peek(filename)
+            if handle is None and vocab_list is None and os.path.exists(filename):
+                handle = self.get(filename)
+
+            if vocab_list is None:
+                vocab_list = handle.vocab if handle is not None else []
+            if meta is None:
+                meta = handle.meta if handle is not None else self._stored_meta(filename)
+
+            if handle is None or handle.vocab is not vocab_list or handle.meta != tuple(meta):
+                if handle is not None:
+                    self._drop(handle)
+                handle = StackHandle(str(filename), vocab_list, tuple(meta), None)
+                self._stacks[handle.key] = handle
+            self._unindex(handle)
+            self._index(handle)
+
+            own, foreign, latin, latin_active = handle.meta
+            save.save_to_vocab(
+                handle.vocab,
+                handle.filename,
+                own_lang=own,
+                foreign_lang=foreign,
+                latin_lang=latin,
+                latin_active=bool(latin_active),
+            )
+            return handle
+
+    @staticmethod
+    def _stored_meta(filename: str) -> Tuple:
+        if not os.path.exists(filename):
+            return DEFAULT_META
+        own, foreign, latin, latin_active = save.read_languages(filename)
+        return (own or DEFAULT_META[0], foreign or DEFAULT_META[1], latin or DEFAULT_META[2], bool(latin_active))
+
+    def dirty(self) -> List[StackHandle]:
+        """Loaded stacks with unsaved changes."""
+        return [h for h in self.loaded() if save.has_pending_writes(h.filename)]
+
+    def flush(self, filenames: Optional[Iterable[str]] = None) -> int:
+        """Write unsaved changes (of all stacks or only filenames). Returns the number of stacks written."""
+        if filenames is None:
+            return save.flush_pending_writes()
+        written = 0
+        for filename in filenames:
+            if save.has_pending_writes(filename):
+                written += save.flush_pending_writes(filename)
+        return written
+
+    # -------------------------
+    # Invalidation
+    # -------------------------
+
+    def _drop(self, handle: StackHandle) -> None:
+        handle.stale = True
+        self._unindex(handle)
+        if self._stacks.get(handle.key) is handle:
+            del self._stacks[handle.key]
+
+    def forget(self, filename: str) -> Optional[StackHandle]:
+        """Drop filename (deleted/renamed). Returns the dropped handle."""
+        with self._lock:
+            handle = self._stacks.get(stack_key(filename))
+            if handle is not None:
+                self._drop(handle)
+            return handle
+
+    def clear(self) -> None:
+        with self._lock:
+            for handle in list(self._stacks.values()):
+                handle.stale = True
+            self._stacks.clear()
+            self._owner.clear()
+
+    def _on_stack_written(self, filename: str, vocab_list: Optional[List[Dict]]) -> None:
+        with self._lock:
+            handle = self._stacks.get(stack_key(filename))
+            if handle is None:
+                return
+            if vocab_list is None or vocab_list is handle.vocab:
+                # our own content -> the cache stays valid
+                handle.sig = save.stack_signature(filename)
+            else:
+                # someone wrote another list (import, language change, ...)
+                self._drop(handle)
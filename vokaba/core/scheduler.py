@@ -0,0 +1,260 @@
+# vokaba/core/scheduler.py
+"""
+Due-queue scheduler for the learning session.
+
+Picks the next card the same way the old linear scan did:
+  - candidates are the entries whose srs_due is <= now, or ALL entries if none is due
+  - the current card is skipped if there is another candidate
+  - weighted random choice, weight = max(0.05, 1 - knowledge_level)
+
+but without parsing every due date per answer:
+  - due dates are parsed once into epoch seconds
+  - entries that are not due yet wait in a min-heap keyed by due time
+  - weights live in two Fenwick trees (due entries / all entries), so
+    sampling and updates after an answer are O(log n)
+
+Pure Python, no Kivy; LearnMixin owns one instance per session pool.
+make_scheduler() returns the NumPy variant (vokaba/core/scheduler_numpy.py)
+only when asked for (settings.learn.scheduler_backend: numpy), see below.
+"""
+from __future__ import annotations
+
+import heapq
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+MIN_WEIGHT = 0.05
+
+
+def entry_weight(entry: Dict) -> float:
+    try:
+        lvl = float(entry.get("knowledge_level", 0.0) or 0.0)
+    except Exception:
+        lvl = 0.0
+    lvl = max(0.0, min(1.0, lvl))
+    return max(MIN_WEIGHT, 1.0 - lvl)
+
+
+def due_epoch(entry: Dict) -> Optional[float]:
+    """srs_due as epoch seconds; None if missing/unparseable (= never due)."""
+    due_raw = entry.get("srs_due")
+    if not due_raw:
+        return None
+    try:
+        return datetime.fromisoformat(str(due_raw)).timestamp()
+    except Exception:
+        return None
+
+
+class FenwickTree:
+    """Binary indexed tree over float weights: point update, prefix sum, weighted search."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0.0] * (size + 1)
+        self.values = [0.0] * size
+        self._top = 1 << max(0, size.bit_length() - 1) if size else 0
+
+    @classmethod
+    def from_values(cls, values: List[float]) -> "FenwickTree":
+        ft = cls(len(values))
+        ft.values = list(values)
+        tree = ft.tree
+        for i, v in enumerate(values, 1):
+            tree[i] += v
+            j = i + (i & -i)
+            if j <= ft.size:
+                tree[j] += tree[i]
+        return ft
+
+    def set(self, index: int, value: float) -> None:
+        delta = value - self.values[index]
+        if delta == 0.0:
+            return
+        self.values[index] = value
+        i = index + 1
+        tree = self.tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        s = 0.0
+        i = self.size
+        tree = self.tree
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+        return s
+
+    def find(self, r: float) -> int:
+        """Smallest index whose prefix sum is > r (0 <= r < total)."""
+        pos = 0
+        step = self._top
+        tree = self.tree
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and tree[nxt] <= r:
+                pos = nxt
+                r -= tree[nxt]
+            step >>= 1
+        return min(pos, self.size - 1)
+
+
+class DueScheduler:
+    """
+    Scheduler over one list of vocab entries (kept by reference).
+
+    Call update(entry) after knowledge_level / srs_due of an entry changed.
+    Rebuild (new instance) if the list itself changes.
+    """
+
+    def __init__(self, entries: List[Dict], rng=None, now: Optional[float] = None):
+        self.entries = entries
+        self.size = len(entries)
+        self.rng = rng or random
+        self._pos: Dict[int, int] = {id(e): i for i, e in enumerate(entries)}
+
+        now = time.time() if now is None else now
+        weights = [entry_weight(e) for e in entries]
+        self._due_at: List[Optional[float]] = [due_epoch(e) for e in entries]
+        self._is_due = [False] * self.size
+        self._version = [0] * self.size
+        self._heap: List = []
+
+        due_weights = [0.0] * self.size
+        self.due_count = 0
+        for i, at in enumerate(self._due_at):
+            if at is None:
+                continue
+            if at <= now:
+                self._is_due[i] = True
+                due_weights[i] = weights[i]
+                self.due_count += 1
+            else:
+                self._heap.append((at, i, 0))
+        heapq.heapify(self._heap)
+
+        self._all = FenwickTree.from_values(weights)
+        self._due = FenwickTree.from_values(due_weights)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def index_of(self, entry: Dict) -> Optional[int]:
+        i = self._pos.get(id(entry))
+        if i is None or self.entries[i] is not entry:
+            return None
+        return i
+
+    def _release_due(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _at, i, version = heapq.heappop(heap)
+            if version != self._version[i] or self._is_due[i]:
+                continue
+            self._is_due[i] = True
+            self._due.set(i, self._all.values[i])
+            self.due_count += 1
+
+    def update(self, entry: Dict, now: Optional[float] = None) -> None:
+        """Re-read weight and due date of entry (O(log n))."""
+        i = self.index_of(entry)
+        if i is None:
+            return
+        now = time.time() if now is None else now
+
+        w = entry_weight(entry)
+        self._all.set(i, w)
+
+        at = due_epoch(entry)
+        self._due_at[i] = at
+        self._version[i] += 1
+
+        if at is not None and at <= now:
+            if not self._is_due[i]:
+                self._is_due[i] = True
+                self.due_count += 1
+            self._due.set(i, w)
+            return
+
+        if self._is_due[i]:
+            self._is_due[i] = False
+            self.due_count -= 1
+            self._due.set(i, 0.0)
+        if at is not None:
+            heapq.heappush(self._heap, (at, i, self._version[i]))
+
+    def pick(self, avoid: Optional[int] = None, now: Optional[float] = None) -> int:
+        """Index of the next card; avoid = index of the current card (or None)."""
+        n = self.size
+        if n <= 1:
+            return 0
+        self._release_due(time.time() if now is None else now)
+
+        if self.due_count > 0:
+            tree = self._due
+            candidates = self.due_count
+            avoid_ok = avoid is not None and 0 <= avoid < n and self._is_due[avoid]
+        else:
+            tree = self._all
+            candidates = n
+            avoid_ok = avoid is not None and 0 <= avoid < n
+
+        # take the current card out of the draw (only if there is another candidate)
+        held = None
+        if avoid_ok and candidates > 1:
+            held = tree.values[avoid]
+            tree.set(avoid, 0.0)
+
+        try:
+            total = tree.total()
+            if total <= 0:
+                return self._uniform(tree is self._due, avoid if held is not None else None)
+            idx = tree.find(self.rng.random() * total)
+            if tree.values[idx] <= 0.0:
+                # float rounding landed on an empty slot (held / not due)
+                idx = self._uniform(tree is self._due, avoid if held is not None else None)
+            return idx
+        finally:
+            if held is not None:
+                tree.set(avoid, held)
+
+    def _uniform(self, due_only: bool, avoid: Optional[int]) -> int:
+        pool = [i for i in range(self.size) if (not due_only or self._is_due[i]) and i != avoid]
+        return self.rng.choice(pool) if pool else 0
+
+
+# ------------------------------------------------------------
+# Backend choice
+# ------------------------------------------------------------
+
+# "auto" is the pure Python scheduler: NumpyDueScheduler builds faster on
+# huge pools, but every pick is O(n) and runs once per answer, which costs
+# far more over a session than the build saves
+# (benchmarks/bench_scheduler_numpy.py). "numpy" is an explicit opt-in
+# (settings.learn.scheduler_backend in config.yml).
+SCHEDULER_BACKENDS = ("auto", "python", "numpy")
+
+
+def numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def make_scheduler(entries: List[Dict], rng=None, now: Optional[float] = None, backend: str = "auto"):
+    """
+    DueScheduler, or NumpyDueScheduler for backend="numpy" when NumPy is
+    installed (falls back to the pure Python scheduler if it is missing).
+    """
+    b = str(backend or "auto").strip().lower()
+    if b == "numpy" and numpy_available():
+        from vokaba.core.scheduler_numpy import NumpyDueScheduler
+
+        return NumpyDueScheduler(entries, rng=rng, now=now)
+    return DueScheduler(entries, rng=rng, now=now)
@@ -0,0 +1,144 @@
+# vokaba/core/scheduler_numpy.py
+"""
+NumPy variant of DueScheduler for very large "learn all" pools.
+
+Same picking rules as vokaba.core.scheduler.DueScheduler (due entries first,
+weight = max(0.05, 1 - knowledge_level), current card skipped), but the pool
+lives in arrays:
+
+  - due times are parsed in one go (datetime64) instead of per entry
+  - weights come from the knowledge levels with array ops
+  - a pick is a due mask + cumulative sum + binary search over the weights
+
+Builds much faster than DueScheduler on 100k+ entries, but a single pick
+is O(n) vectorized instead of O(log n), so it only pays off for pools that
+are built often and picked from rarely. Opt-in: make_scheduler(...,
+backend="numpy") in vokaba.core.scheduler, which LearnMixin passes for
+settings.learn.scheduler_backend: numpy; it falls back to DueScheduler
+if NumPy isn't installed (it usually isn't on Android).
+
+Due times are compared as naive local wall-clock seconds, the same way
+datetime.fromisoformat(...) <= datetime.now() did in the old scan.
+"""
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from vokaba.core.scheduler import MIN_WEIGHT, entry_weight
+
+_EPOCH = datetime(1970, 1, 1)
+_NEVER = np.inf
+
+
+def _wall_seconds(dt: datetime) -> float:
+    return (dt.replace(tzinfo=None) - _EPOCH).total_seconds()
+
+
+def _now_wall(now: Optional[float]) -> float:
+    return _wall_seconds(datetime.fromtimestamp(time.time() if now is None else now))
+
+
+def _entry_due(entry: Dict) -> float:
+    due_raw = entry.get("srs_due")
+    if not due_raw:
+        return _NEVER
+    try:
+        return _wall_seconds(datetime.fromisoformat(str(due_raw)))
+    except Exception:
+        return _NEVER
+
+
+def _due_array(entries: List[Dict]) -> np.ndarray:
+    raw = [str(e.get("srs_due") or "") for e in entries]
+    try:
+        stamps = np.array(raw, dtype="datetime64[us]")
+    except Exception:
+        # odd values (time zones, garbage) -> parse one by one
+        return np.fromiter((_entry_due(e) for e in entries), dtype=np.float64, count=len(entries))
+    due = stamps.astype("int64").astype(np.float64) / 1e6
+    due[np.isnat(stamps)] = _NEVER
+    return due
+
+
+def _weight_array(entries: List[Dict]) -> np.ndarray:
+    try:
+        levels = np.array([e.get("knowledge_level", 0.0) or 0.0 for e in entries], dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter((entry_weight(e) for e in entries), dtype=np.float64, count=len(entries))
+    levels = np.nan_to_num(levels, nan=0.0)
+    return np.maximum(MIN_WEIGHT, 1.0 - np.clip(levels, 0.0, 1.0))
+
+
+class NumpyDueScheduler:
+    """Drop-in for DueScheduler (update / pick / index_of / due_count)."""
+
+    def __init__(self, entries: List[Dict], rng=None, now: Optional[float] = None):
+        self.entries = entries
+        self.size = len(entries)
+        self.rng = rng or random
+        self._pos: Dict[int, int] = {id(e): i for i, e in enumerate(entries)}
+
+        self._due_at = _due_array(entries)
+        self._weights = _weight_array(entries)
+        self._now = _now_wall(now)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def due_count(self) -> int:
+        return int(np.count_nonzero(self._due_at <= self._now))
+
+    def index_of(self, entry: Dict) -> Optional[int]:
+        i = self._pos.get(id(entry))
+        if i is None or self.entries[i] is not entry:
+            return None
+        return i
+
+    def update(self, entry: Dict, now: Optional[float] = None) -> None:
+        """Re-read weight and due date of entry (O(1))."""
+        i = self.index_of(entry)
+        if i is None:
+            return
+        self._weights[i] = entry_weight(entry)
+        self._due_at[i] = _entry_due(entry)
+        if now is not None:
+            self._now = _now_wall(now)
+
+    def pick(self, avoid: Optional[int] = None, now: Optional[float] = None) -> int:
+        """Index of the next card; avoid = index of the current card (or None)."""
+        n = self.size
+        if n <= 1:
+            return 0
+        self._now = _now_wall(now)
+
+        candidates = self._due_at <= self._now
+        count = int(np.count_nonzero(candidates))
+        if count == 0:
+            candidates = np.ones(n, dtype=bool)
+            count = n
+
+        weights = np.where(candidates, self._weights, 0.0)
+        if avoid is not None and 0 <= avoid < n and candidates[avoid] and count > 1:
+            weights[avoid] = 0.0
+            candidates[avoid] = False
+
+        cumulative = np.cumsum(weights)
+        total = float(cumulative[-1])
+        if total <= 0.0:
+            return self._uniform(candidates)
+        idx = int(np.searchsorted(cumulative, self.rng.random() * total, side="right"))
+        idx = min(idx, n - 1)
+        if weights[idx] <= 0.0:
+            # float rounding landed on an empty slot
+            return self._uniform(candidates)
+        return idx
+
+    def _uniform(self, candidates: np.ndarray) -> int:
+        pool = np.flatnonzero(candidates)
+        return int(pool[self.rng.randrange(len(pool))]) if len(pool) else 0
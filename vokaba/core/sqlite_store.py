@@ -0,0 +1,253 @@
+# vokaba/core/sqlite_store.py
+"""
+Optional SQLite storage backend (stdlib sqlite3, WAL mode).
+
+The CSV files in vocab/ stay the shareable format and the list of stacks.
+The database holds a parsed copy of every stack it has seen plus all learning
+progress, so:
+  - loading a stack doesn't parse the CSV again (as long as the CSV is unchanged)
+  - a learning update is a single-row UPDATE instead of a file rewrite
+
+Each stack row remembers the size/mtime of the CSV it was imported from or
+exported to. A CSV that changed behind our back (import, manual edit) is
+re-imported. Stacks with progress that isn't in the CSV yet are flagged
+csv_stale and get exported again (save.sync_csv_exports / settle_stack_file).
+
+This module knows nothing about the app; save.py is the facade.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from vokaba.core.vocab_entry import VocabEntry
+
+SCHEMA_VERSION = 2
+
+ENTRY_COLUMNS = [
+    "own_language",
+    "foreign_language",
+    "latin_language",
+    "info",
+    "knowledge_level",
+    "srs_streak",
+    "srs_last_seen",
+    "srs_due",
+    "daily_goal_anchor",
+    "daily_goal_anchor_date",
+    "knowledge_date",
+]
+
+PROGRESS_COLUMNS = ["knowledge_level", "srs_streak", "srs_last_seen", "srs_due", "knowledge_date"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stacks (
+    path             TEXT PRIMARY KEY,
+    own_language     TEXT,
+    foreign_language TEXT,
+    latin_language   TEXT,
+    latin_active     INTEGER NOT NULL DEFAULT 0,
+    csv_size         INTEGER,
+    csv_mtime_ns     INTEGER,
+    csv_stale        INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS entries (
+    stack                  TEXT NOT NULL REFERENCES stacks(path) ON DELETE CASCADE,
+    pos                    INTEGER NOT NULL,
+    own_language           TEXT NOT NULL DEFAULT '',
+    foreign_language       TEXT NOT NULL DEFAULT '',
+    latin_language         TEXT NOT NULL DEFAULT '',
+    info                   TEXT NOT NULL DEFAULT '',
+    knowledge_level        REAL NOT NULL DEFAULT 0.0,
+    srs_streak             INTEGER NOT NULL DEFAULT 0,
+    srs_last_seen          TEXT NOT NULL DEFAULT '',
+    srs_due                TEXT NOT NULL DEFAULT '',
+    daily_goal_anchor      TEXT NOT NULL DEFAULT '',
+    daily_goal_anchor_date TEXT NOT NULL DEFAULT '',
+    knowledge_date         TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (stack, pos)
+);
+
+CREATE INDEX IF NOT EXISTS idx_entries_due ON entries(stack, srs_due);
+CREATE INDEX IF NOT EXISTS idx_entries_knowledge ON entries(stack, knowledge_level);
+"""
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    return str(value)
+
+
+class SqliteStore:
+    """Thin wrapper around one sqlite3 connection. All methods are thread-safe."""
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if 0 < version < 2:
+            # v2: knowledge_date (lazy knowledge decay)
+            cols = {r[1] for r in self._conn.execute("PRAGMA table_info(entries)")}
+            if "knowledge_date" not in cols:
+                self._conn.execute("ALTER TABLE entries ADD COLUMN knowledge_date TEXT NOT NULL DEFAULT ''")
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+    # -------------------------
+    # Stack rows
+    # -------------------------
+
+    def stack_info(self, path: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT own_language, foreign_language, latin_language, latin_active,"
+                " csv_size, csv_mtime_ns, csv_stale FROM stacks WHERE path=?",
+                (path,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "own_language": row[0],
+            "foreign_language": row[1],
+            "latin_language": row[2],
+            "latin_active": bool(row[3]),
+            "csv_signature": [row[4], row[5]],
+            "csv_stale": bool(row[6]),
+        }
+
+    def stale_stacks(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT path FROM stacks WHERE csv_stale=1")]
+
+    def set_csv_signature(self, path: str, signature: Optional[List[int]]) -> None:
+        size, mtime_ns = (signature or [None, None])[:2]
+        with self._lock:
+            self._conn.execute(
+                "UPDATE stacks SET csv_size=?, csv_mtime_ns=?, csv_stale=0 WHERE path=?",
+                (size, mtime_ns, path),
+            )
+
+    def delete_stack(self, path: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM stacks WHERE path=?", (path,))
+
+    # -------------------------
+    # Entries
+    # -------------------------
+
+    def replace_stack(
+        self,
+        path: str,
+        vocab: Iterable[Dict],
+        meta: Tuple,
+        signature: Optional[List[int]],
+    ) -> None:
+        """Store a full stack (CSV import or full save) in one transaction."""
+        own, foreign, latin, latin_active = meta
+        size, mtime_ns = (signature or [None, None])[:2]
+
+        rows = []
+        for pos, e in enumerate(vocab):
+            rows.append((path, pos) + tuple(self._column_value(c, e.get(c)) for c in ENTRY_COLUMNS))
+
+        placeholders = ",".join("?" * (len(ENTRY_COLUMNS) + 2))
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.execute("DELETE FROM entries WHERE stack=?", (path,))
+                cur.execute(
+                    "INSERT INTO stacks(path, own_language, foreign_language, latin_language, latin_active,"
+                    " csv_size, csv_mtime_ns, csv_stale) VALUES (?,?,?,?,?,?,?,0)"
+                    " ON CONFLICT(path) DO UPDATE SET own_language=excluded.own_language,"
+                    " foreign_language=excluded.foreign_language, latin_language=excluded.latin_language,"
+                    " latin_active=excluded.latin_active, csv_size=excluded.csv_size,"
+                    " csv_mtime_ns=excluded.csv_mtime_ns, csv_stale=0",
+                    (path, own, foreign, latin, 1 if latin_active else 0, size, mtime_ns),
+                )
+                cur.executemany(
+                    f"INSERT INTO entries(stack, pos, {', '.join(ENTRY_COLUMNS)}) VALUES ({placeholders})",
+                    rows,
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def load_stack(self, path: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(ENTRY_COLUMNS)} FROM entries WHERE stack=? ORDER BY pos",
+                (path,),
+            ).fetchall()
+        return [VocabEntry(zip(ENTRY_COLUMNS, r)) for r in rows]
+
+    def iter_stack(self, path: str, batch: int = 500) -> Iterator[Dict]:
+        """load_stack as a stream: fetches batch rows at a time (lock held per batch only)."""
+        sql = f"SELECT pos, {', '.join(ENTRY_COLUMNS)} FROM entries WHERE stack=? AND pos>? ORDER BY pos LIMIT ?"
+        last = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(sql, (path, last, int(batch))).fetchall()
+            for r in rows:
+                yield VocabEntry(zip(ENTRY_COLUMNS, r[1:]))
+            if len(rows) < batch:
+                return
+            last = rows[-1][0]
+
+    def update_progress(self, path: str, updates: Iterable[Tuple[int, Dict]]) -> int:
+        """
+        Single-row UPDATEs of the progress columns, one per (pos, entry).
+        Flags the stack csv_stale. Returns the number of updated rows.
+        """
+        sets = ", ".join(f"{c}=?" for c in PROGRESS_COLUMNS)
+        params = [
+            tuple(self._column_value(c, e.get(c)) for c in PROGRESS_COLUMNS) + (path, int(pos))
+            for pos, e in updates
+        ]
+        if not params:
+            return 0
+
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.executemany(f"UPDATE entries SET {sets} WHERE stack=? AND pos=?", params)
+                changed = cur.rowcount
+                cur.execute("UPDATE stacks SET csv_stale=1 WHERE path=?", (path,))
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        return changed
+
+    @staticmethod
+    def _column_value(column: str, value):
+        if column == "knowledge_level":
+            try:
+                return float(value or 0.0)
+            except (TypeError, ValueError):
+                return 0.0
+        if column == "srs_streak":
+            try:
+                return int(value or 0)
+            except (TypeError, ValueError):
+                return 0
+        return _text(value)
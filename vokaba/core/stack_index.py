@@ -0,0 +1,257 @@
+# vokaba/core/stack_index.py
+"""
+Per-stack summaries for the main menu / dashboard stats.
+
+Instead of loading every stack to count vocab, the app keeps one small record
+per stack in data_dir()/stack_index.json. save.py updates the record whenever
+it writes a stack; a record whose signature no longer matches the files on
+disk is rebuilt from the stack (see save.stack_summary).
+
+Record:
+  sig        -> [csv_size, csv_mtime_ns, journal_size]
+  count      -> number of entries
+  levels     -> {knowledge_date: {bucket: [n, sum of levels]}} with
+                bucket = floor(knowledge_level / DAILY_DECAY); knowledge sum and
+                learned count for any day follow from it (see knowledge_stats),
+                so the lazy knowledge decay doesn't make records stale
+  due_days   -> {"YYYY-MM-DD": n} entries by due date (due count / next due for any day)
+  pairs_digest -> digest of the pair hashes (see below)
+  stale      -> progress changed since the record was built (see mark_stale)
+
+The pair hashes only change when words change, not with every answer, so
+they live in one sidecar file per stack (stack_pairs/<key hash>.json next to
+the index) that is only rewritten when pairs_digest changes:
+  pairs      -> short hashes of the (own, foreign) pairs, for unique counts across stacks
+                (stripped, empty pairs skipped: dashboard stats)
+  raw_pairs  -> the same over the pairs as stored, empty ones included (mode unlocks)
+
+Progress flushes (journal append / SQLite row update) don't rebuild the
+record, they only mark it stale once; the next read rebuilds it. That keeps
+a flush O(changed entries) in bytes written.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vokaba.core.engine import scoring
+from vokaba.core.paths import fsync_file
+
+INDEX_VERSION = 4
+PAIRS_DIR_NAME = "stack_pairs"
+LEARNED_THRESHOLD = 0.7
+DAILY_DECAY = scoring.DAILY_DECAY
+
+
+def _level(value) -> float:
+    try:
+        level = float(value or 0.0)
+    except (TypeError, ValueError):
+        level = 0.0
+    return max(0.0, min(1.0, level))
+
+
+def pair_hash(own: str, foreign: str) -> str:
+    raw = f"{own}\x1f{foreign}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=6).hexdigest()
+
+
+def summarize(vocab: Iterable[Dict]) -> Dict:
+    """Build a summary record (without sig) from a vocab list."""
+    count = 0
+    levels: Dict[str, Dict[str, List]] = {}
+    due_days: Dict[str, int] = {}
+    pairs = set()
+    raw_pairs = set()
+
+    for e in vocab:
+        count += 1
+        level = _level(e.get("knowledge_level", 0.0))
+        by_bucket = levels.setdefault(str(e.get(scoring.KNOWLEDGE_DATE_FIELD) or "")[:10], {})
+        slot = by_bucket.setdefault(str(_bucket(level)), [0, 0.0])
+        slot[0] += 1
+        slot[1] += level
+
+        due_raw = e.get("srs_due") or ""
+        if due_raw:
+            try:
+                day = datetime.fromisoformat(str(due_raw)).date().isoformat()
+                due_days[day] = due_days.get(day, 0) + 1
+            except ValueError:
+                pass
+
+        own = e.get("own_language") or ""
+        foreign = e.get("foreign_language") or ""
+        raw_pairs.add(pair_hash(own, foreign))
+        own = own.strip()
+        foreign = foreign.strip()
+        if own or foreign:
+            pairs.add(pair_hash(own, foreign))
+
+    return {
+        "count": count,
+        "levels": levels,
+        "due_days": due_days,
+        "pairs": sorted(pairs),
+        "raw_pairs": sorted(raw_pairs),
+    }
+
+
+def pairs_digest(summary: Dict) -> str:
+    h = hashlib.blake2b(digest_size=12)
+    for name in ("pairs", "raw_pairs"):
+        h.update(name.encode("ascii"))
+        for p in summary.get(name) or ():
+            h.update(p.encode("ascii"))
+    return h.hexdigest()
+
+
+def _bucket(level: float) -> int:
+    # small epsilon: 0.7 must land in bucket 140, not 139.999...
+    return int(level / DAILY_DECAY + 1e-9)
+
+
+def knowledge_stats(summary: Dict, today: Optional[date] = None, base_date=None) -> Tuple[float, int]:
+    """
+    (sum of knowledge levels, learned count) as of today, with the decay since
+    each entry's knowledge_date applied. Undated entries decay from base_date.
+    """
+    today = today or date.today()
+    learned_bucket = _bucket(LEARNED_THRESHOLD)
+    total = 0.0
+    learned = 0
+
+    for day, by_bucket in (summary.get("levels") or {}).items():
+        age = scoring.pending_decay_days({scoring.KNOWLEDGE_DATE_FIELD: day}, today, base_date)
+        for bucket, (n, level_sum) in by_bucket.items():
+            b = int(bucket)
+            if b < age:
+                continue  # decayed to 0
+            total += level_sum - n * age * DAILY_DECAY
+            if b - age >= learned_bucket:
+                learned += n
+    return max(0.0, total), learned
+
+
+def due_count(summary: Dict, today: Optional[date] = None) -> int:
+    """Entries due on or before today."""
+    today_iso = (today or date.today()).isoformat()
+    return sum(n for day, n in (summary.get("due_days") or {}).items() if day <= today_iso)
+
+
+def next_due(summary: Dict, today: Optional[date] = None) -> Optional[str]:
+    """First due date after today (ISO date) or None."""
+    today_iso = (today or date.today()).isoformat()
+    later = [day for day in (summary.get("due_days") or {}) if day > today_iso]
+    return min(later) if later else None
+
+
+class StackIndex:
+    """The JSON index file (+ pair sidecars); records are keyed by paths.stack_key(path)."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.pairs_dir = os.path.join(os.path.dirname(os.path.abspath(self.path)), PAIRS_DIR_NAME)
+        self._lock = threading.RLock()
+        self._records: Optional[Dict[str, Dict]] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._records is not None:
+            return self._records
+        records: Dict[str, Dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("v") == INDEX_VERSION:
+                records = dict(data.get("stacks") or {})
+        except (OSError, ValueError):
+            pass
+        self._records = records
+        return records
+
+    def _save(self) -> None:
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"v": INDEX_VERSION, "stacks": self._records}, f, ensure_ascii=False, separators=(",", ":"))
+                fsync_file(f)
+            os.replace(tmp, self.path)
+        except OSError:
+            # the index is only a cache; it gets rebuilt next time
+            pass
+
+    def _pairs_path(self, key: str) -> str:
+        name = hashlib.blake2b(key.encode("utf-8"), digest_size=10).hexdigest()
+        return os.path.join(self.pairs_dir, name + ".json")
+
+    def _save_pairs(self, key: str, digest: str, summary: Dict) -> None:
+        path = self._pairs_path(key)
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(self.pairs_dir, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"digest": digest, "pairs": summary.get("pairs") or [], "raw_pairs": summary.get("raw_pairs") or []},
+                    f,
+                    separators=(",", ":"),
+                )
+                fsync_file(f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def get(self, key: str, sig: Optional[List[int]]) -> Optional[Dict]:
+        """Record for key if it was built from the files with this signature and isn't stale."""
+        with self._lock:
+            rec = self._load().get(key)
+        if rec is None or sig is None or rec.get("sig") != sig or rec.get("stale"):
+            return None
+        return rec
+
+    def pairs(self, key: str, digest: Optional[str]) -> Optional[Dict]:
+        """{"pairs", "raw_pairs"} of key if the sidecar matches digest."""
+        if not digest:
+            return None
+        try:
+            with open(self._pairs_path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("digest") != digest:
+            return None
+        return data
+
+    def put(self, key: str, sig: Optional[List[int]], summary: Dict) -> Dict:
+        """Store summary (as built by summarize()); the pair hashes go to the sidecar if they changed."""
+        rec = {k: v for k, v in summary.items() if k not in ("pairs", "raw_pairs")}
+        rec["sig"] = sig
+        rec["pairs_digest"] = digest = pairs_digest(summary)
+        with self._lock:
+            records = self._load()
+            old = records.get(key)
+            if old is None or old.get("pairs_digest") != digest or not os.path.exists(self._pairs_path(key)):
+                self._save_pairs(key, digest, summary)
+            records[key] = rec
+            self._save()
+        return rec
+
+    def mark_stale(self, key: str) -> None:
+        """Progress of key changed: the next get() misses. Writes the index only on the first mark."""
+        with self._lock:
+            rec = self._load().get(key)
+            if rec is not None and not rec.get("stale"):
+                rec["stale"] = True
+                self._save()
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
+        try:
+            os.remove(self._pairs_path(key))
+        except OSError:
+            pass
@@ -0,0 +1,223 @@
+# vokaba/core/stats_store.py
+"""
+Learning counters (daily goal, total learn time, decay baseline) in a tiny
+fixed-size binary record instead of config.yml.
+
+The daily goal counter changes on every correct card; rewriting the YAML for
+that is wasteful. The counters live in memory here and every change
+overwrites one 36 byte record in data_dir()/stats.bin in place. Reads never
+touch the disk and have no side effects: the daily counter of a past day
+simply reads as 0 for today.
+
+The file holds two record slots. A write goes to the slot that does not hold
+the current record, with the next sequence number, and is fsynced; reading
+takes the valid slot with the higher sequence. A torn write therefore only
+loses that one update, never the counters (the config "stats" section that
+could re-seed them is gone after the migration).
+
+Record (little endian):
+  magic "VKST", version u16, flags u16,
+  daily_progress_day i32 (date ordinal, 0 = never), daily_cards_done u32,
+  total_learn_time_seconds u64, knowledge_decay_day i32 (0 = unset),
+  sequence u32, crc32 u32 over everything before it
+
+Files from before the second slot are a single record with sequence 0 and
+read as such. A slot with a wrong magic/crc (torn write, foreign file) is
+ignored; if neither slot is valid the caller seeds the store again (see
+save.learning_stats).
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import zlib
+from datetime import date
+from typing import Dict, Optional
+
+MAGIC = b"VKST"
+VERSION = 1
+
+_BODY = struct.Struct("<4sHHiIQiI")
+_CRC = struct.Struct("<I")
+RECORD_SIZE = _BODY.size + _CRC.size
+SLOTS = 2
+
+
+def _day(value) -> int:
+    """ISO date / date -> ordinal (0 for None or garbage)."""
+    if not value:
+        return 0
+    try:
+        if isinstance(value, date):
+            return value.toordinal()
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+def _iso(day: int) -> Optional[str]:
+    return date.fromordinal(day).isoformat() if day > 0 else None
+
+
+class StatsStore:
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.RLock()
+
+        self.flags = 0
+        self.daily_progress_day = 0
+        self._daily_cards_done = 0
+        self.total_learn_time_seconds = 0
+        self.knowledge_decay_day = 0
+        self._sequence = 0
+
+        self.loaded = self._read()
+
+    # -------------------------
+    # Record I/O
+    # -------------------------
+
+    def _pack(self, sequence: int) -> bytes:
+        body = _BODY.pack(
+            MAGIC,
+            VERSION,
+            self.flags & 0xFFFF,
+            self.daily_progress_day,
+            min(self._daily_cards_done, 0xFFFFFFFF),
+            min(self.total_learn_time_seconds, 0xFFFFFFFFFFFFFFFF),
+            self.knowledge_decay_day,
+            sequence,
+        )
+        return body + _CRC.pack(zlib.crc32(body))
+
+    @staticmethod
+    def _unpack(raw: bytes) -> Optional[tuple]:
+        """One slot -> record fields, or None if it is short/torn/foreign."""
+        if len(raw) != RECORD_SIZE:
+            return None
+        body, (crc,) = raw[: _BODY.size], _CRC.unpack(raw[_BODY.size:])
+        if zlib.crc32(body) != crc:
+            return None
+        fields = _BODY.unpack(body)
+        if fields[0] != MAGIC or fields[1] != VERSION:
+            return None
+        return fields
+
+    def _read(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read(RECORD_SIZE * SLOTS)
+        except OSError:
+            return False
+
+        records = [
+            fields
+            for fields in (self._unpack(raw[i * RECORD_SIZE:(i + 1) * RECORD_SIZE]) for i in range(SLOTS))
+            if fields is not None
+        ]
+        if not records:
+            return False
+        _magic, _version, flags, progress_day, cards, seconds, decay_day, sequence = max(records, key=lambda r: r[7])
+
+        self._sequence = sequence
+        self.flags = flags
+        self.daily_progress_day = progress_day
+        self._daily_cards_done = cards
+        self.total_learn_time_seconds = seconds
+        self.knowledge_decay_day = decay_day
+        return True
+
+    def _write(self) -> None:
+        sequence = (self._sequence + 1) & 0xFFFFFFFF
+        data = self._pack(sequence)
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        except OSError:
+            return
+        try:
+            # the slot not holding the current record: a torn write here
+            # leaves the other one intact
+            os.lseek(fd, (sequence % SLOTS) * RECORD_SIZE, os.SEEK_SET)
+            os.write(fd, data)
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+        finally:
+            os.close(fd)
+        self._sequence = sequence
+        self.loaded = True
+
+    # -------------------------
+    # Reads (no I/O)
+    # -------------------------
+
+    def daily_cards_done(self, today: Optional[date] = None) -> int:
+        today = today or date.today()
+        if self.daily_progress_day != today.toordinal():
+            return 0
+        return self._daily_cards_done
+
+    @property
+    def daily_progress_date(self) -> Optional[str]:
+        return _iso(self.daily_progress_day)
+
+    @property
+    def knowledge_decay_date(self) -> Optional[str]:
+        return _iso(self.knowledge_decay_day)
+
+    def as_dict(self) -> Dict:
+        return {
+            "daily_progress_date": self.daily_progress_date,
+            "daily_cards_done": self._daily_cards_done,
+            "total_learn_time_seconds": self.total_learn_time_seconds,
+            "knowledge_decay_date": self.knowledge_decay_date,
+        }
+
+    # -------------------------
+    # Updates (one record write each)
+    # -------------------------
+
+    def seed(self, values: Dict) -> None:
+        """Take over counters from an older config.yml "stats" section."""
+        def as_int(key):
+            try:
+                return max(0, int(values.get(key) or 0))
+            except (TypeError, ValueError):
+                return 0
+
+        with self._lock:
+            self.daily_progress_day = _day(values.get("daily_progress_date"))
+            self._daily_cards_done = as_int("daily_cards_done")
+            self.total_learn_time_seconds = as_int("total_learn_time_seconds")
+            self.knowledge_decay_day = _day(values.get("knowledge_decay_date"))
+            self._write()
+
+    def add_daily_cards(self, steps: int, today: Optional[date] = None) -> int:
+        """Count steps for today (resets on a new day). Returns today's count."""
+        today = today or date.today()
+        with self._lock:
+            day = today.toordinal()
+            if self.daily_progress_day != day:
+                self.daily_progress_day = day
+                self._daily_cards_done = 0
+            self._daily_cards_done += max(0, int(steps))
+            self._write()
+            return self._daily_cards_done
+
+    def add_learn_time(self, seconds: int) -> None:
+        seconds = max(0, int(seconds))
+        if not seconds:
+            return
+        with self._lock:
+            self.total_learn_time_seconds += seconds
+            self._write()
+
+    def ensure_knowledge_decay_date(self, today: Optional[date] = None) -> str:
+        """Set the decay baseline once (fresh install: today). Returns it."""
+        with self._lock:
+            if not self.knowledge_decay_day:
+                self.knowledge_decay_day = (today or date.today()).toordinal()
+                self._write()
+            return self.knowledge_decay_date
@@ -0,0 +1,255 @@
+# vokaba/core/vocab_entry.py
+"""
+Compact in-memory vocab entry.
+
+A csv.DictReader row is a dict with 11 string keys and a fresh string per
+value; with 100k cards that is ~1 KB per card. VocabEntry keeps the known
+columns in __slots__ instead:
+
+  - date columns are interned: most cards share a handful of due/knowledge
+    dates ("2026-10-19T00:00:00"), so they share one string object
+  - knowledge_level is stored as a float, srs_streak as an int, however the
+    entry was built (numeric strings are converted on assignment; values that
+    aren't numbers are kept as they are); a stack has far fewer distinct
+    levels than cards, so equal levels share one float object
+  - srs_last_seen (a timestamp with microseconds, unique per card) is held as
+    float seconds; it is read back as the same ISO string
+
+It behaves like the dict it replaces (entry["x"], .get, .setdefault, "x" in
+entry, dict(entry), ==), so code that works on rows keeps working. Unknown
+columns end up in a small side dict. Use isinstance(x, Mapping) instead of
+isinstance(x, dict) to accept both.
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+FIELDS = (
+    "own_language",
+    "foreign_language",
+    "latin_language",
+    "info",
+    "knowledge_level",
+    "srs_streak",
+    "srs_last_seen",
+    "srs_due",
+    "daily_goal_anchor",
+    "daily_goal_anchor_date",
+    "knowledge_date",
+)
+_FIELD_SET = frozenset(FIELDS)
+# few distinct values per stack -> worth interning (words are mostly unique)
+_INTERNED = frozenset(("srs_due", "daily_goal_anchor", "daily_goal_anchor_date", "knowledge_date"))
+
+# naive local datetimes, no tz -> plain difference, exact round trip
+_EPOCH = datetime(1970, 1, 1)
+_LAST_SEEN = "srs_last_seen"
+_fromisoformat = datetime.fromisoformat
+
+_sys_intern = sys.intern
+
+# level value -> shared float object; bounded, beyond that levels aren't shared
+_LEVELS: Dict[float, float] = {}
+_MAX_SHARED_LEVELS = 4096
+
+
+def _intern(value):
+    return _sys_intern(value) if type(value) is str else value
+
+
+def _pack_timestamp(value):
+    """ISO datetime string -> float seconds if it reads back unchanged, else the value itself."""
+    if type(value) is not str:
+        return value
+    n = len(value)
+    if n < 19:
+        return _sys_intern(value)
+    try:
+        dt = _fromisoformat(value)
+    except ValueError:
+        return value
+    if dt.tzinfo is not None:
+        return value
+    # the shape isoformat() writes (YYYY-MM-DDTHH:MM:SS[.ffffff], no
+    # ".000000") reads back unchanged; anything else is checked in full
+    if not (
+        value[10] == "T"
+        and value[13] == value[16] == ":"
+        and value[5] != "W"
+        and (n == 19 or (n == 26 and value[19] == "." and dt.microsecond))
+    ) and dt.isoformat() != value:
+        return value
+    return (dt - _EPOCH).total_seconds()
+
+
+def _share_level(value: float) -> float:
+    shared = _LEVELS.get(value)
+    if shared is not None:
+        return shared
+    if len(_LEVELS) < _MAX_SHARED_LEVELS:
+        _LEVELS[value] = value
+    return value
+
+
+def _to_float(value):
+    if type(value) is float:
+        return _share_level(value)
+    if type(value) is int or (type(value) is str and value.strip()):
+        try:
+            return _share_level(float(value))
+        except ValueError:
+            return value
+    return value
+
+
+def _to_int(value):
+    if type(value) is int:
+        return value
+    if type(value) is str and value.strip():
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    return value
+
+
+_COERCE = {"knowledge_level": _to_float, "srs_streak": _to_int}
+
+
+def _unpack_timestamp(value):
+    if type(value) is float:
+        return (_EPOCH + timedelta(seconds=value)).isoformat()
+    return value
+
+
+class VocabEntry(MutableMapping):
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, row: Union[Mapping, Iterable, None] = None, **kwargs):
+        self.own_language = ""
+        self.foreign_language = ""
+        self.latin_language = ""
+        self.info = ""
+        self.knowledge_level = 0.0
+        self.srs_streak = 0
+        self.srs_last_seen = ""
+        self.srs_due = ""
+        self.daily_goal_anchor = ""
+        self.daily_goal_anchor_date = ""
+        self.knowledge_date = ""
+        self._extra: Optional[Dict] = None
+        if row is not None:
+            for k, v in (row.items() if isinstance(row, Mapping) else row):
+                self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    # -------------------------
+    # Mapping protocol
+    # -------------------------
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return _unpack_timestamp(value) if key == _LAST_SEEN else value
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return _unpack_timestamp(value) if key == _LAST_SEEN else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __setitem__(self, key, value) -> None:
+        if key in _FIELD_SET:
+            if key == _LAST_SEEN:
+                value = _pack_timestamp(value)
+            elif key in _INTERNED:
+                value = _intern(value)
+            elif key in _COERCE:
+                value = _COERCE[key](value)
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key in _FIELD_SET:
+            # known columns always exist; deleting resets them like an empty CSV cell
+            setattr(self, key, 0.0 if key == "knowledge_level" else 0 if key == "srs_streak" else "")
+            return
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key) -> bool:
+        return key in _FIELD_SET or (self._extra is not None and key in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self) -> int:
+        return len(FIELDS) + (len(self._extra) if self._extra else 0)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> Iterator["VocabEntry"]:
+        """
+        Entries from rows of the FIELDS values in column order, already typed
+        (text normalized, float level, int streak, str dates). Skips the
+        per-key dispatch of __setitem__ and a call per row; used by the CSV
+        fast path.
+        """
+        new = cls.__new__
+        levels_get = _LEVELS.get
+        pack = _pack_timestamp
+        intern = _sys_intern
+        for values in rows:
+            self = new(cls)
+            (
+                self.own_language,
+                self.foreign_language,
+                self.latin_language,
+                self.info,
+                level,
+                self.srs_streak,
+                last_seen,
+                due,
+                anchor,
+                anchor_date,
+                knowledge_date,
+            ) = values
+            self.knowledge_level = levels_get(level) or _share_level(level)
+            self.srs_last_seen = pack(last_seen)
+            # csv values are always str
+            self.srs_due = intern(due)
+            self.daily_goal_anchor = intern(anchor)
+            self.daily_goal_anchor_date = intern(anchor_date)
+            self.knowledge_date = intern(knowledge_date)
+            self._extra = None
+            yield self
+
+    def copy(self) -> "VocabEntry":
+        return VocabEntry(self)
+
+    def __repr__(self) -> str:
+        return f"VocabEntry({dict(self)!r})"
+
+    # -------------------------
+    # Pickle (slots without __dict__)
+    # -------------------------
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, state) -> None:
+        self.__init__(state)
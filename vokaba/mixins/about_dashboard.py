@@ -6,6 +6,7 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.scrollview import ScrollView
 
 import labels
+import save
 from vokaba.core.logging_utils import log
 from vokaba.ui.widgets.rounded import RoundedCard
 
@@ -100,9 +101,7 @@ class AboutDashboardMixin:
         pad_mul = float(self.config_data["settings"]["gui"]["padding_multiplicator"])
 
         overall = self._compute_overall_stats()
-        stats_cfg = self.config_data.get("stats", {}) or {}
-
-        total_seconds = int(stats_cfg.get("total_learn_time_seconds", 0) or 0)
+        total_seconds = int(save.learning_stats().total_learn_time_seconds)
         hours = total_seconds // 3600
         minutes = (total_seconds % 3600) // 60
         time_str = self._format_duration(total_seconds)
@@ -167,7 +167,7 @@ class AddVocabMixin:
             "knowledge_level": 0.0,
         })
 
-        save.save_to_vocab(vocab_list, self.vocab_root() + stack)
+        self.stack_repo.save(self.vocab_root() + stack, vocab_list)
         self.add_vocab_error_label.text = ""
         self.clear_inputs()
 
@@ -65,7 +65,7 @@ source.include_patterns = assets/*,data/*
 #
 # Common examples:
 # kivy, requests, pillow, sqlite3
-requirements = python3,kivy,requests,plyer,filetype,pyyaml
+requirements = python3,kivy,requests,plyer,filetype,pyyaml,pillow
 
 # Python version (default works, but explicit is safer)
 python.version = 3.12
@@ -106,6 +106,7 @@ class EditVocabMixin:
                 entry["srs_streak"] = int(src.get("srs_streak", 0) or 0)
                 entry["srs_last_seen"] = (src.get("srs_last_seen") or "")
                 entry["srs_due"] = (src.get("srs_due") or "")
+                entry["knowledge_date"] = (src.get("knowledge_date") or "")
             else:
                 entry["knowledge_level"] = 0.0
                 entry["srs_streak"] = 0
@@ -138,7 +139,7 @@ class EditVocabMixin:
     def edit_vocab_func(self, matrix, stack: str, _instance=None):
         latin_active = save.read_languages(self.vocab_root() + stack)[3]
         vocab = self.read_vocab_from_grid(matrix, latin_active, getattr(self, "edit_vocab_original_list", None))
-        save.save_to_vocab(vocab, self.vocab_root() + stack)
+        self.stack_repo.save(self.vocab_root() + stack, vocab)
         self.select_stack(stack)
 
     def build_vocab_grid(self, parent_layout, vocab_list, latin_active: bool):
@@ -216,6 +217,7 @@ class EditVocabMixin:
                 entry["srs_streak"] = int(original_vocab_list[idx].get("srs_streak", 0) or 0)
                 entry["srs_last_seen"] = (original_vocab_list[idx].get("srs_last_seen") or "")
                 entry["srs_due"] = (original_vocab_list[idx].get("srs_due") or "")
+                entry["knowledge_date"] = (original_vocab_list[idx].get("knowledge_date") or "")
             else:
                 entry["knowledge_level"] = 0.0
                 entry["srs_streak"] = 0
@@ -316,7 +318,11 @@ class EditVocabMixin:
             if os.path.exists(new_path):
                 log(f"Cannot rename: target exists: {new_stack}")
                 return
+            # fold buffered updates + journal into the CSV before it gets a new name
+            save.settle_stack_file(old_path)
             os.rename(old_path, new_path)
+            save.forget_stack_file(old_path)
+            self.stack_repo.forget(old_path)
             stack = new_stack
             old_path = new_path
 
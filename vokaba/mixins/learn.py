@@ -3,8 +3,7 @@ from __future__ import annotations
 import os
 import random
 import re
-import unicodedata
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from kivy.animation import Animation
 from kivy.clock import Clock
@@ -21,7 +20,10 @@ import labels
 import save
 from vokaba.core.logging_utils import log
 from vokaba.ui.widgets.rounded import RoundedCard, RoundedButton
-from vokaba.core.dict_path import bool_cast
+from vokaba.core.dict_path import bool_cast, get_in
+from vokaba.core.engine import Session, answers, scoring
+from vokaba.core.engine import modes as engine_modes
+from vokaba.core.scheduler import entry_weight
 
 
 class LearnMixin:
@@ -129,11 +131,11 @@ class LearnMixin:
                 and getattr(self, "_daily_pool_stack_key", None) == stack_key
                 and getattr(self, "_daily_pool_mode", None) == expected_mode
                 and isinstance(getattr(self, "all_vocab_list", None), list)
-                and isinstance(getattr(self, "stack_vocab_lists", None), dict)
-                and isinstance(getattr(self, "stack_meta_map", None), dict)
-                and isinstance(getattr(self, "entry_to_stack_file", None), dict)
+                and isinstance(getattr(self, "_learn_stacks", None), list)
                 and len(self.all_vocab_list or []) > 0
-                and len(self.stack_vocab_lists or {}) > 0
+                and len(self._learn_stacks or []) > 0
+                # a stack reloaded/replaced since the pool was built -> pool entries are outdated
+                and all(self.stack_repo.is_current(h) for h in self._learn_stacks)
         )
 
         # IMPORTANT: if a specific stack was requested, never reuse an existing pool.
@@ -154,9 +156,7 @@ class LearnMixin:
         if not resume_pool:
             # Build vocab session list (fresh)
             self.all_vocab_list = []
-            self.stack_vocab_lists = {}
-            self.stack_meta_map = {}
-            self.entry_to_stack_file = {}
+            self._learn_stacks = []
 
             # only the selected stack OR all stacks
             if stack_file:
@@ -174,39 +174,15 @@ class LearnMixin:
 
             for filename in filenames:
                 try:
-                    data = save.load_vocab(filename)
+                    handle = self.stack_repo.get(filename)
                 except Exception as e:
-                    log(f"load_vocab failed for {filename}: {e}")
+                    log(f"loading stack failed for {filename}: {e}")
                     continue
 
-                vocab_list = []
-                own, foreign, latin = "German", "English", "Latin"
-                latin_active = False
-
-                if isinstance(data, (list, tuple)):
-                    if len(data) == 5:
-                        vocab_list, own, foreign, latin, latin_active = data
-                    elif len(data) == 4:
-                        vocab_list, own, foreign, latin = data
-                    elif len(data) == 3:
-                        vocab_list, own, foreign = data
-                    elif len(data) >= 1:
-                        vocab_list = data[0]
-                elif isinstance(data, dict):
-                    vocab_list = data.get("vocab_list", data.get("vocab", [])) or []
-                    own = data.get("own_language", own)
-                    foreign = data.get("foreign_language", foreign)
-                    latin = data.get("latin_language", latin)
-                    latin_active = bool(data.get("latin_active", latin_active))
-                else:
-                    vocab_list = data or []
-
-                self.stack_vocab_lists[filename] = vocab_list
-                self.stack_meta_map[filename] = (own, foreign, latin, latin_active)
-                for entry in vocab_list:
+                self._learn_stacks.append(handle)
+                for entry in handle.vocab:
                     if "knowledge_level" not in entry:
                         entry["knowledge_level"] = 0.0
-                    self.entry_to_stack_file[id(entry)] = filename
                     self.all_vocab_list.append(entry)
 
             random.shuffle(self.all_vocab_list)
@@ -254,8 +230,7 @@ class LearnMixin:
         not hasattr(self, "current_vocab_index")):
             self.is_back = False
             self.current_vocab_index = 0
-            self.current_vocab_index = self._pick_next_vocab_index(avoid_current=False)
-            self.learn_mode = self._choose_mode_for_vocab(self._get_current_vocab())
+            self._next_learn_card(avoid_current=False)
             self.self_rating_enabled = True
         else:
             self.is_back = False
@@ -356,19 +331,7 @@ class LearnMixin:
         # it contributes +1 to the daily goal counter.
         settings.setdefault("daily_goal_step", 0.10)
 
-        # stats defaults + daily reset
-        stats = (self.config_data or {}).setdefault("stats", {})
-        today = datetime.now().date().isoformat()
-
-        if stats.get("daily_progress_date") != today:
-            stats["daily_progress_date"] = today
-            stats["daily_cards_done"] = 0
-            try:
-                save.save_settings(self.config_data)
-            except Exception as e:
-                log(f"save_settings failed in daily reset: {e}")
-
-        stats.setdefault("daily_cards_done", 0)
+        # daily counter: save.learning_stats() (resets itself on a new day)
 
 
     def _refresh_daily_progress_ui(self):
@@ -379,10 +342,9 @@ class LearnMixin:
 
         def _apply(_dt=0):
             try:
-                stats = (self.config_data or {}).get("stats", {}) or {}
                 settings = (self.config_data or {}).get("settings", {}) or {}
 
-                done = int(stats.get("daily_cards_done", 0) or 0)
+                done = save.learning_stats().daily_cards_done()
                 target = int(settings.get("daily_target_cards", 300) or 300)
                 target = max(1, target)
 
@@ -430,13 +392,10 @@ class LearnMixin:
             inc = 1
         inc = max(0, inc)
 
-        stats = (self.config_data or {}).setdefault("stats", {})
-        stats["daily_cards_done"] = int(stats.get("daily_cards_done", 0) or 0) + inc
-
         try:
-            save.save_settings(self.config_data)
+            save.learning_stats().add_daily_cards(inc)
         except Exception as e:
-            log(f"save_settings failed in _update_daily_progress: {e}")
+            log(f"stats update failed in _update_daily_progress: {e}")
 
         self._refresh_daily_progress_ui()
 
@@ -608,23 +567,10 @@ class LearnMixin:
             return
 
         # knowledge deltas
-        if quality == "very_easy":
-            delta = getattr(labels, "knowledge_delta_self_very_easy", 0.09)
-            q_val, correct = 1.0, True
-        elif quality == "easy":
-            delta = getattr(labels, "knowledge_delta_self_easy", 0.05)
-            q_val, correct = 0.75, True
-        elif quality == "hard":
-            delta = getattr(labels, "knowledge_delta_self_hard", -0.01)
-            q_val, correct = 0.4, False
-        else:
-            delta = getattr(labels, "knowledge_delta_self_very_hard", -0.08)
-            q_val, correct = 0.1, False
+        delta, q_val, correct = scoring.self_rating(quality)
 
-        self._adjust_knowledge_level(vocab, delta)
-        self.update_srs(vocab, was_correct=correct, quality=q_val)
-
-        if self._register_session_step(was_correct=correct):
+        finished = self._learn_engine().submit_result(correct, delta=delta, quality=q_val, entry=vocab)
+        if self._after_session_step(finished, was_correct=correct):
             return
 
         self._advance_to_next()
@@ -640,26 +586,61 @@ class LearnMixin:
             steps = 1
         steps = max(1, steps)
 
-        self.session_cards_done += steps
+        finished = self._learn_engine().register_step(was_correct=was_correct, steps=steps)
+        return self._after_session_step(finished, was_correct=was_correct, steps=steps)
 
+    def _after_session_step(self, finished: bool, was_correct: bool | None = None, steps: int = 1) -> bool:
+        """Daily goal + summary after the engine session counted a card. True when the session is over."""
         # Daily goal: only award points if the user was correct AND had no mistakes on this card/mini-game.
         if was_correct is True:
-            self.session_correct += steps
             if getattr(self, "_daily_goal_perfect", True):
                 try:
                     self._update_daily_progress(steps)
                 except Exception:
                     pass
         elif was_correct is False:
-            self.session_wrong += steps
             # Once a card is marked as incorrect, never award daily points for it.
             self._daily_goal_perfect = False
 
-        if self.session_cards_done >= self.session_cards_total:
+        if finished:
             self.show_session_summary()
             return True
         return False
 
+    # Session counters live in the engine session (see _learn_engine)
+
+    @property
+    def session_cards_done(self) -> int:
+        return self._learn_engine().cards_done
+
+    @session_cards_done.setter
+    def session_cards_done(self, value):
+        self._learn_engine().cards_done = int(value or 0)
+
+    @property
+    def session_correct(self) -> int:
+        return self._learn_engine().correct
+
+    @session_correct.setter
+    def session_correct(self, value):
+        self._learn_engine().correct = int(value or 0)
+
+    @property
+    def session_wrong(self) -> int:
+        return self._learn_engine().wrong
+
+    @session_wrong.setter
+    def session_wrong(self, value):
+        self._learn_engine().wrong = int(value or 0)
+
+    @property
+    def session_cards_total(self) -> int:
+        return self._learn_engine().session_size
+
+    @session_cards_total.setter
+    def session_cards_total(self, value):
+        self._learn_engine().session_size = max(1, int(value or 1))
+
     def show_session_summary(self):
         self.learn_content.clear_widgets()
         pad_mul = float(self.config_data["settings"]["gui"]["padding_multiplicator"])
@@ -675,8 +656,9 @@ class LearnMixin:
             "session_summary_text",
             "You completed {done} cards.\nCorrect: {correct}   Wrong/hard: {wrong}\nSession target: {goal} cards.",
         )
+        summary = self._learn_engine().summary()
         body = self.make_text_label(
-            txt.format(done=self.session_cards_done, correct=self.session_correct, wrong=self.session_wrong, goal=self.session_cards_total),
+            txt.format(done=summary["done"], correct=summary["correct"], wrong=summary["wrong"], goal=summary["goal"]),
             size_hint_y=None,
             height=dp(120),
         )
@@ -687,9 +669,7 @@ class LearnMixin:
         cont_btn = self.make_primary_button(getattr(labels, "session_summary_continue_button", "Weiterlernen"), size_hint=(0.5, 1))
 
         def cont(*_a):
-            self.session_cards_done = 0
-            self.session_correct = 0
-            self.session_wrong = 0
+            self._learn_engine().reset_counters()
             self.show_current_card()
 
         back_btn.bind(on_press=lambda _i: self.exit_learning())
@@ -707,25 +687,16 @@ class LearnMixin:
     # ------------------------------------------------------------
 
     def _persist_single_entry(self, vocab: dict):
-        fn = getattr(save, "persist_single_entry", None)
-        if not callable(fn):
-            return
         try:
-            # New signature (stack-aware persistence).
-            fn(vocab, self.stack_vocab_lists, self.stack_meta_map, self.entry_to_stack_file)
-        except TypeError:
-            # Old signature: persist_single_entry(vocab)
-            try:
-                fn(vocab)
-            except Exception as e:
-                log(f"persist_single_entry failed (fallback): {e}")
+            # only marks the entry dirty; written by the autosave (see save.configure_autosave)
+            self.stack_repo.mark_entry_dirty(vocab)
         except Exception as e:
             log(f"persist_single_entry failed: {e}")
 
 
     def _finalize_learning_time(self):
         """
-        Add time since session_start_time to stats.total_learn_time_seconds exactly once.
+        Add time since session_start_time to the total learn time exactly once.
         Also used on app shutdown.
         """
         try:
@@ -739,9 +710,7 @@ class LearnMixin:
             if seconds <= 0:
                 return
 
-            stats_cfg = self.config_data.setdefault("stats", {})
-            stats_cfg["total_learn_time_seconds"] = int(stats_cfg.get("total_learn_time_seconds", 0) or 0) + seconds
-            save.save_settings(self.config_data)
+            save.learning_stats().add_learn_time(seconds)
 
         except Exception as e:
             log(f"_finalize_learning_time failed: {e}")
@@ -751,32 +720,11 @@ class LearnMixin:
 
 
     def persist_knowledge_levels(self):
-        fn = getattr(save, "persist_all_stacks", None)
-        if callable(fn):
-            try:
-                fn(self.stack_vocab_lists, self.stack_meta_map)
-                return
-            except TypeError:
-                # Old signature without args
-                try:
-                    fn()
-                    return
-                except Exception as e:
-                    log(f"persist_all_stacks failed (fallback): {e}")
-            except Exception as e:
-                log(f"persist_all_stacks failed: {e}")
-
-        # letzte Fallback-Option: versuche save_vocab pro Datei (falls vorhanden)
-        save_vocab = getattr(save, "save_vocab", None)
-        if callable(save_vocab):
-            try:
-                for filename, vocab_list in (self.stack_vocab_lists or {}).items():
-                    own, foreign, latin, latin_active = self.stack_meta_map.get(filename,
-                                                                                ("German", "English", "Latin",
-                                                                                 False))
-                    save_vocab(filename, vocab_list, own, foreign, latin, latin_active)
-            except Exception as e:
-                log(f"persist via save_vocab failed: {e}")
+        """Write the unsaved changes of the stacks in the learning pool."""
+        try:
+            self.stack_repo.flush(h.filename for h in (getattr(self, "_learn_stacks", None) or []))
+        except Exception as e:
+            log(f"persist_knowledge_levels failed: {e}")
 
     def exit_learning(self, _instance=None):
         try:
@@ -802,82 +750,58 @@ class LearnMixin:
         return self.all_vocab_list[self.current_vocab_index]
 
     def _compute_vocab_weight(self, entry: dict) -> float:
-        try:
-            lvl = float(entry.get("knowledge_level", 0.0) or 0.0)
-        except Exception:
-            lvl = 0.0
-        lvl = max(0.0, min(1.0, lvl))
-        w = 1.0 - lvl
-        return max(0.05, w)
+        return entry_weight(entry)
+
+    def _learn_engine(self) -> Session:
+        """Headless engine session for the current pool (vokaba.core.engine)."""
+        entries = getattr(self, "all_vocab_list", None)
+        if not isinstance(entries, list):
+            entries = []
+            self.all_vocab_list = entries
+
+        session = getattr(self, "_engine_session", None)
+        if session is None:
+            session = Session(entries, on_entry_changed=self._persist_single_entry)
+            self._engine_session = session
+        elif session.entries is not entries:
+            session.set_entries(entries)
+
+        session.available_modes = list(getattr(self, "available_modes", None) or ["front_back"])
+        session.set_scheduler_backend(
+            str(get_in(getattr(self, "config_data", None) or {}, ["settings", "learn", "scheduler_backend"], "auto") or "auto")
+        )
+        return session
 
     def _pick_next_vocab_index(self, avoid_current=True) -> int:
         if not self.all_vocab_list:
             return 0
-        n = len(self.all_vocab_list)
-        if n <= 1:
+        if len(self.all_vocab_list) <= 1:
             return 0
 
-        now = datetime.now()
-        due_indices = []
-        for idx, e in enumerate(self.all_vocab_list):
-            due_raw = e.get("srs_due")
-            if not due_raw:
-                continue
-            try:
-                due = datetime.fromisoformat(str(due_raw))
-            except Exception:
-                continue
-            if due <= now:
-                due_indices.append(idx)
-
-        candidates = due_indices if due_indices else list(range(n))
-        cur = getattr(self, "current_vocab_index", 0)
-
-        if avoid_current and len(candidates) > 1 and cur in candidates:
-            candidates = [i for i in candidates if i != cur]
-        if not candidates:
-            candidates = [i for i in range(n) if i != cur] or [0]
-
-        weights = [self._compute_vocab_weight(self.all_vocab_list[i]) for i in candidates]
-        total = sum(weights)
-        if total <= 0:
-            return random.choice(candidates)
-
-        r = random.random() * total
-        acc = 0.0
-        for idx, w in zip(candidates, weights):
-            acc += w
-            if r <= acc:
-                return idx
-        return candidates[-1]
+        session = self._learn_engine()
+        session.current_index = getattr(self, "current_vocab_index", 0)
+        return session.pick_index(avoid_current=avoid_current)
 
     def _get_mode_pool_for_level(self, level: float):
-        lvl = max(0.0, min(1.0, float(level or 0.0)))
-        if lvl <= 0.35:
-            base = {"front_back", "back_front", "multiple_choice", "connect_pairs"}
-        elif lvl <= 0.60:
-            base = {"multiple_choice", "connect_pairs", "letter_salad", "syllable_salad"}
-        else:
-            base = {"multiple_choice", "connect_pairs", "letter_salad", "syllable_salad", "typing"}
-
-        candidates = [m for m in getattr(self, "available_modes", ["front_back"]) if m in base]
-        if not candidates:
-            candidates = list(getattr(self, "available_modes", ["front_back"]))
-        return candidates
+        return engine_modes.mode_pool_for_level(level, getattr(self, "available_modes", ["front_back"]))
 
     def _choose_mode_for_vocab(self, vocab: dict | None) -> str:
-        if not vocab:
-            return random.choice(getattr(self, "available_modes", ["front_back"]))
-        pool = self._get_mode_pool_for_level(float(vocab.get("knowledge_level", 0.0) or 0.0))
-        return random.choice(pool) if pool else "front_back"
+        return self._learn_engine().choose_mode(vocab)
+
+    def _next_learn_card(self, avoid_current=True) -> None:
+        """Let the engine session pick the next card + mode (current_vocab_index / learn_mode)."""
+        session = self._learn_engine()
+        session.current_index = getattr(self, "current_vocab_index", 0)
+        card = session.next_card(avoid_current=avoid_current)
+        if card is None:
+            self.current_vocab_index = 0
+            return
+        self.current_vocab_index = card["index"]
+        self.learn_mode = card["mode"]
 
     def _advance_to_next(self):
-        if self.max_current_vocab_index > 1:
-            self.current_vocab_index = self._pick_next_vocab_index(avoid_current=True)
-        else:
-            self.current_vocab_index = 0
+        self._next_learn_card(avoid_current=True)
         self.is_back = False
-        self.learn_mode = self._choose_mode_for_vocab(self._get_current_vocab())
         self.show_current_card()
 
     # ------------------------------------------------------------
@@ -885,54 +809,10 @@ class LearnMixin:
     # ------------------------------------------------------------
 
     def _adjust_knowledge_level(self, vocab: dict, delta: float, persist_immediately=True):
-        if not vocab:
-            return
-
-        try:
-            cur = float(vocab.get("knowledge_level", 0.0) or 0.0)
-        except Exception:
-            cur = 0.0
-        try:
-            d = float(delta)
-        except Exception:
-            d = 0.0
-
-        new = max(0.0, min(1.0, cur + d))
-        vocab["knowledge_level"] = new
-
-        if persist_immediately:
-            self._persist_single_entry(vocab)
+        self._learn_engine().adjust_knowledge(vocab, delta, persist=persist_immediately)
 
     def update_srs(self, vocab: dict, was_correct: bool, quality: float = 0.5):
-        if not vocab:
-            return
-        now = datetime.now()
-
-        try:
-            streak = int(vocab.get("srs_streak", 0) or 0)
-        except Exception:
-            streak = 0
-
-        streak = streak + 1 if was_correct else 0
-        vocab["srs_streak"] = streak
-        vocab["srs_last_seen"] = now.isoformat()
-
-        base = [1, 2, 4, 7, 14, 30]
-        idx = min(streak, len(base) - 1)
-        days = base[idx]
-
-        try:
-            q = float(quality)
-        except Exception:
-            q = 0.5
-        q = max(0.0, min(1.0, q))
-        factor = 0.75 + 0.5 * q
-        days = max(1, int(days * factor))
-
-        due = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days)
-        vocab["srs_due"] = due.isoformat()
-
-        self._persist_single_entry(vocab)
+        self._learn_engine().review(vocab, was_correct=was_correct, quality=quality)
 
     # ------------------------------------------------------------
     # Formatting helpers
@@ -1031,13 +911,10 @@ class LearnMixin:
             and chosen.get("foreign_language", "") == correct_vocab.get("foreign_language", "")
         )
 
-        if is_correct:
-            delta = getattr(labels, "knowledge_delta_multiple_choice_correct", 0.07)
-        else:
-            delta = getattr(labels, "knowledge_delta_multiple_choice_wrong", -0.06)
+        delta, q_val = scoring.multiple_choice(is_correct)
 
         self._adjust_knowledge_level(correct_vocab, delta)
-        self.update_srs(correct_vocab, was_correct=is_correct, quality=1.0 if is_correct else 0.0)
+        self.update_srs(correct_vocab, was_correct=is_correct, quality=q_val)
 
         if is_correct:
             if isinstance(button, RoundedButton):
@@ -1180,7 +1057,7 @@ class LearnMixin:
         right_key = (right_entry.get("own_language", ""), right_entry.get("foreign_language", ""))
 
         if left_key == right_key:
-            delta = getattr(labels, "knowledge_delta_connect_pairs_correct_word", 0.06)
+            delta = scoring.delta("connect_pairs_correct_word")
             self._adjust_knowledge_level(left_entry, delta)
             self._adjust_knowledge_level(right_entry, delta)
 
@@ -1199,7 +1076,7 @@ class LearnMixin:
                 Clock.schedule_once(lambda _dt: self._connect_pairs_finish(), 0.3)
         else:
             self._daily_goal_perfect = False
-            delta_wrong = getattr(labels, "knowledge_delta_connect_pairs_wrong_word", -0.074)
+            delta_wrong = scoring.delta("connect_pairs_wrong_word")
             self._adjust_knowledge_level(left_entry, delta_wrong)
             self._adjust_knowledge_level(right_entry, delta_wrong)
 
@@ -1360,8 +1237,7 @@ class LearnMixin:
         if clicked == expected:
             button.set_bg_color(self.colors["success"])
             button.disabled = True
-            self._adjust_knowledge_level(vocab,
-                                         getattr(labels, "knowledge_delta_letter_salad_per_correct_letter", 0.01))
+            self._adjust_knowledge_level(vocab, scoring.delta("letter_salad_per_correct_letter"))
 
             self.letter_salad_progress += 1
             self.letter_salad_typed += expected  # wichtig: echtes Space anhängen
@@ -1371,14 +1247,14 @@ class LearnMixin:
                 Clock.schedule_once(lambda _dt: self._letter_salad_finish(), 0.3)
         else:
             self._daily_goal_perfect = False
-            self._adjust_knowledge_level(vocab, getattr(labels, "knowledge_delta_letter_salad_wrong_letter", -0.025))
+            self._adjust_knowledge_level(vocab, scoring.delta("letter_salad_wrong_letter"))
             button.set_bg_color(self.colors["danger"])
             Clock.schedule_once(lambda _dt, b=button: b.set_bg_color(self.colors["card"]), 0.25)
 
     def _letter_salad_finish(self):
         vocab = self.letter_salad_vocab
         if len(self.letter_salad_target) <= 4:
-            self._adjust_knowledge_level(vocab, getattr(labels, "knowledge_delta_letter_salad_short_word_bonus", 0.02))
+            self._adjust_knowledge_level(vocab, scoring.delta("letter_salad_short_word_bonus"))
         self.update_srs(vocab, was_correct=True, quality=1.0)
         if self._register_session_step(was_correct=True):
             return
@@ -1395,166 +1271,31 @@ class LearnMixin:
     # Typing mode (answer typed)
     # ------------------------------------------------------------
 
+    # answer checking lives in vokaba.core.engine.answers
+
     def _strip_accents(self, ch: str) -> str:
-        decomposed = unicodedata.normalize("NFD", ch)
-        return "".join(c for c in decomposed if not unicodedata.combining(c))
+        return answers.strip_accents(ch)
 
     def _remove_parenthetical(self, text: str) -> str:
-        if not text:
-            return ""
-        out = []
-        in_parens = False
-        for ch in text:
-            if ch == "(":
-                in_parens = True
-                continue
-            if ch == ")":
-                in_parens = False
-                continue
-            if not in_parens:
-                out.append(ch)
-        return "".join(out)
+        return answers.remove_parenthetical(text)
 
     def _normalize_for_compare(self, text: str) -> str:
-        if not text:
-            return ""
-        no_par = self._remove_parenthetical(text)
-        letters = []
-        for ch in no_par:
-            if ch.isalpha():
-                letters.append(self._strip_accents(ch).lower())
-        return "".join(letters)
+        return answers.normalize_for_compare(text)
 
     def _extract_main_lexeme(self, text: str) -> str:
-        if not text:
-            return ""
-        no_par = self._remove_parenthetical(text).strip()
-        parts = no_par.split()
-        return parts[-1] if parts else no_par
-
+        return answers.extract_main_lexeme(text)
 
     def _split_outside_parentheses(self, text: str, seps={";", ",", "/"}) -> list[str]:
-        """
-        Split text by separators, but IGNORE separators inside parentheses.
-        Example: "(to, in order to) save, keep" =>
-          ["(to, in order to) save", "keep"]
-        """
-        if text is None:
-            return [""]
-        s = str(text)
-        out = []
-        buf = []
-        depth = 0
-        for ch in s:
-            if ch == "(":
-                depth += 1
-            elif ch == ")" and depth > 0:
-                depth -= 1
-
-            if depth == 0 and ch in seps:
-                part = "".join(buf).strip()
-                if part:
-                    out.append(part)
-                buf = []
-                continue
-
-            buf.append(ch)
-
-        last = "".join(buf).strip()
-        if last:
-            out.append(last)
-
-        return out or [s.strip()]
+        return answers.split_outside_parentheses(text, seps=seps)
 
     def _expand_parenthetical_variants(self, text: str) -> list[str]:
-        """
-        Expands optional parentheses:
-          '(to) save' -> ['save', 'to save']
-          '(to, in order to) save' -> ['save', 'to save', 'in order to save']
-        Multiple parentheses are combined (cartesian product), but typically small.
-        """
-        if text is None:
-            return [""]
-        s = str(text)
-
-        variants: list[str] = []
-
-        def rec(prefix: str, rest: str):
-            m = re.search(r"\(([^)]*)\)", rest)
-            if not m:
-                variants.append(prefix + rest)
-                return
-
-            before = rest[: m.start()]
-            inside = (m.group(1) or "").strip()
-            after = rest[m.end() :]
-
-            # comma-separated options inside parentheses
-            opts = []
-            if inside:
-                for part in inside.split(","):
-                    part = part.strip()
-                    if part:
-                        opts.append(part)
-
-            # '' means "omit the parentheses entirely"
-            for opt in ([""] + opts):
-                rec(prefix + before + (opt if opt else ""), after)
-
-        rec("", s)
-
-        # cleanup spacing + dedupe (preserve order)
-        seen = set()
-        out = []
-        for v in variants:
-            v2 = re.sub(r"\s+", " ", v).strip()
-            if not v2:
-                continue
-            key = v2.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            out.append(v2)
-
-        return out or [re.sub(r"\s+", " ", s).strip()]
+        return answers.expand_parenthetical_variants(text)
 
     def _best_variant_for_expected(self, typed: str, expected: str) -> str:
-        """Pick the expected-variant (expanded from parentheses) that best matches the user's input."""
-        typed_norm = self._normalize_for_compare(typed)
-        if not typed_norm:
-            # default: expected without parentheses
-            vars_ = self._expand_parenthetical_variants(expected)
-            return vars_[0] if vars_ else (expected or "")
-
-        try:
-            import difflib
-            best_v = expected or ""
-            best_score = -1.0
-            for v in self._expand_parenthetical_variants(expected):
-                sc = difflib.SequenceMatcher(None, typed_norm, self._normalize_for_compare(v)).ratio()
-                if sc > best_score:
-                    best_score = sc
-                    best_v = v
-            return best_v
-        except Exception:
-            vars_ = self._expand_parenthetical_variants(expected)
-            return vars_[0] if vars_ else (expected or "")
-
+        return answers.best_variant_for_expected(typed, expected)
 
     def _is_correct_typed_answer(self, typed: str, vocab: dict) -> bool:
-        typed_norm = self._normalize_for_compare(typed)
-        if not typed_norm:
-            return False
-
-        for cand in self._typing_candidates(vocab):
-            # Variants: "(to) save" => ["save", "to save"]
-            for variant in self._expand_parenthetical_variants(cand):
-                full = self._normalize_for_compare(variant)
-                main = self._normalize_for_compare(self._extract_main_lexeme(variant))
-                if typed_norm == full or typed_norm == main:
-                    return True
-
-        return False
+        return answers.is_correct_typed_answer(typed, vocab)
 
     def _rgba_to_hex(self, rgba) -> str:
         try:
@@ -1564,54 +1305,13 @@ class LearnMixin:
             return "ffffff"
 
     def _typing_candidates(self, vocab: dict) -> list[str]:
-        """
-        Split the expected answer string into top-level candidates.
-        IMPORTANT: commas inside (...) are treated as "options", not separators.
-        """
-        foreign = vocab.get("foreign_language", "") or ""
-        cands = self._split_outside_parentheses(foreign, seps={";", ",", "/"})
-        cands = [c.strip() for c in cands if str(c).strip()]
-        return cands or [foreign.strip()]
+        return answers.typing_candidates(vocab)
 
     def _best_candidate_for_feedback(self, typed: str, vocab: dict) -> str:
-        """
-        Wählt den Kandidaten, der am ähnlichsten zum User-Input ist,
-        damit Feedback sinnvoll ist.
-        (Beachtet Klammern-Varianten: '(to) save' matcht auch 'to save'.)
-        """
-        typed_norm = self._normalize_for_compare(typed)
-        cands = self._typing_candidates(vocab)
-        if not typed_norm:
-            return cands[0]
-
-        try:
-            import difflib
-
-            best_cand = cands[0]
-            best_score = -1.0
-
-            for c in cands:
-                # score against best matching variant
-                score = 0.0
-                for v in self._expand_parenthetical_variants(c):
-                    score = max(score, difflib.SequenceMatcher(None, typed_norm, self._normalize_for_compare(v)).ratio())
-                if score > best_score:
-                    best_score = score
-                    best_cand = c
-
-            return best_cand
-        except Exception:
-            return cands[0]
+        return answers.best_candidate_for_feedback(typed, vocab)
 
     def _typing_mismatch_count(self, typed: str, expected: str) -> int:
-        a = self._normalize_for_compare(typed)
-        best_expected = self._best_variant_for_expected(typed, expected)
-        b = self._normalize_for_compare(best_expected)
-
-        n = min(len(a), len(b))
-        mism = sum(1 for i in range(n) if a[i] != b[i])
-        mism += abs(len(a) - len(b))
-        return int(mism)
+        return answers.typing_mismatch_count(typed, expected)
 
     def _typing_colored_input_markup(self, typed: str, expected: str) -> str:
         """
@@ -1801,14 +1501,7 @@ class LearnMixin:
             # Wenn Selbstbewertung AUS: AUTO-SCORING + weiter
             attempts = int(getattr(self, "_typing_attempts", 0) or 0)
 
-            base = float(getattr(labels, "knowledge_delta_typing_correct", 0.093) or 0.093)
-            bonus = float(
-                getattr(labels, "knowledge_delta_typing_first_try_bonus", 0.03) or 0.03) if attempts == 0 else 0.0
-            fail_pen = float(getattr(labels, "knowledge_delta_typing_fail_penalty", 0.04) or 0.04)
-
-            delta = base + bonus - (attempts * fail_pen)
-            delta = max(0.02, delta)
-            q_val = max(0.1, 1.0 - 0.25 * attempts)
+            delta, q_val = scoring.typing_auto(attempts)
 
             self._adjust_knowledge_level(vocab, delta)
             self.update_srs(vocab, was_correct=True, quality=q_val)
@@ -1828,13 +1521,11 @@ class LearnMixin:
 
         if not require_self:
             # pro Fehlversuch fixer Abzug, kein SRS-Update bis final richtig/skip
-            per_try = float(getattr(labels, "knowledge_delta_typing_wrong_per_attempt", -0.06) or -0.06)
-            self._adjust_knowledge_level(vocab, per_try)
+            self._adjust_knowledge_level(vocab, scoring.typing_wrong_attempt())
         else:
             # bisheriges Verhalten
-            per_char = getattr(labels, "knowledge_delta_typing_wrong_per_char", -0.01)
             mism = self._typing_mismatch_count(user, expected)
-            self._adjust_knowledge_level(vocab, per_char * max(1, mism))
+            self._adjust_knowledge_level(vocab, scoring.typing_wrong_chars(mism))
             self.update_srs(vocab, was_correct=False, quality=0.0)
 
         self.typing_feedback_label.color = self.colors["text"]
@@ -1876,21 +1567,10 @@ class LearnMixin:
             self._typing_pending_vocab_id = None
             return
 
-        # Base typing delta
-        base = float(getattr(labels, "knowledge_delta_typing_correct", 0.093) or 0.093)
-
         # Quality mapping (keeps typing-mode "stronger" than flashcards, but user-controlled)
-        if quality == "very_easy":
-            mult, q_val = 1.2, 1.0
-        elif quality == "easy":
-            mult, q_val = 1.0, 0.75
-        elif quality == "hard":
-            mult, q_val = 0.7, 0.4
-        else:
-            mult, q_val = 0.4, 0.1
+        delta, q_val = scoring.typing_rated(quality)
 
-        self._adjust_knowledge_level(vocab, base * mult)
-        self.update_srs(vocab, was_correct=True, quality=q_val)
+        finished = self._learn_engine().submit_result(True, delta=delta, quality=q_val, entry=vocab)
 
         # lock rating UI (avoid double taps)
         try:
@@ -1902,15 +1582,14 @@ class LearnMixin:
         self._typing_waiting_self_rating = False
         self._typing_pending_vocab_id = None
 
-        if self._register_session_step(was_correct=True):
+        if self._after_session_step(finished, was_correct=True):
             return
         self._advance_to_next()
 
     def typing_skip(self, _instance=None):
         vocab = self._get_current_vocab()
-        if vocab is not None:
-            self.update_srs(vocab, was_correct=False, quality=0.0)
-        if self._register_session_step(was_correct=False):
+        finished = self._learn_engine().submit_result(False, quality=None if vocab is None else 0.0, entry=vocab)
+        if self._after_session_step(finished, was_correct=False):
             return
         self._advance_to_next()
 
@@ -1944,8 +1623,8 @@ class LearnMixin:
         if w_i is None or not (0 <= w_i < len(self.syllable_salad_items)):
             return
 
-        wrong_delta = getattr(labels, "knowledge_delta_syllable_wrong_word", -0.05)
-        correct_delta = getattr(labels, "knowledge_delta_syllable_correct_word", 0.08)
+        wrong_delta = scoring.delta("syllable_wrong_word")
+        correct_delta = scoring.delta("syllable_correct_word")
 
         active = self.syllable_salad_active_word_index
         if active is None:
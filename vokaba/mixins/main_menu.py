@@ -35,8 +35,7 @@ class MainMenuMixin:
         # Shared stats + daily
         # ------------------------------------------------------------
         overall = self._compute_overall_stats()
-        stats_cfg = self.config_data.get("stats", {}) or {}
-        total_seconds = int(stats_cfg.get("total_learn_time_seconds", 0) or 0)
+        total_seconds = int(save.learning_stats().total_learn_time_seconds)
         hours = total_seconds // 3600
         minutes = (total_seconds % 3600) // 60
         time_str = self._format_duration(total_seconds)
@@ -57,26 +56,21 @@ class MainMenuMixin:
         file_list = GridLayout(cols=1, spacing=dp(5), size_hint_y=None)
         file_list.bind(minimum_height=file_list.setter("height"))
 
-        stacks = []
-        for full in self._list_stack_files():
-            stacks.append(full)
+        # catalog records (path, stem, languages); no stack file is reopened here
+        stacks = save.list_stacks(self.vocab_root())
 
         sort_mode = (((self.config_data or {}).get("settings") or {}).get("stack_sort_mode") or "name").lower()
 
-        def sort_key(p: str):
-            base = os.path.basename(p).lower()
+        def sort_key(rec: dict):
+            base = os.path.basename(rec["path"]).lower()
             if sort_mode != "language":
                 return ("", "", base)
-            try:
-                own, foreign, _latin, _latin_active = save.read_languages(p)
-                own = (own or "").strip().lower()
-                foreign = (foreign or "").strip().lower()
-            except Exception:
-                own, foreign = "", ""
+            own = (rec.get("own_language") or "").strip().lower()
+            foreign = (rec.get("foreign_language") or "").strip().lower()
             return (foreign, own, base)
 
-        for full in sorted(stacks, key=sort_key):
-            name = os.path.basename(full)
+        for rec in sorted(stacks, key=sort_key):
+            name = os.path.basename(rec["path"])
             btn = self.make_list_button(name[:-4])
             btn.bind(on_release=lambda _btn, fname=name: self.select_stack(fname))
             file_list.add_widget(btn)
@@ -6,9 +6,7 @@ import re
 import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-import json
-import subprocess
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 from kivy.clock import Clock
@@ -31,16 +29,141 @@ import save
 import labels
 from vokaba.core.logging_utils import log
 from vokaba.core.paths import data_dir
+from vokaba import ocr_pdf, ocr_preprocess, ocr_rows
+from vokaba.ocr_cache import OcrResultCache
+from vokaba.ocr_batch import (
+    OcrBatch,
+    PageJob,
+    PAGE_CANCELLED,
+    PAGE_DONE,
+    PAGE_FAILED,
+    PAGE_LOADING,
+    PAGE_PARSING,
+    PAGE_PREPARING,
+    PAGE_QUEUED,
+    PAGE_RECOGNIZING,
+    PAGE_RUNNING,
+)
+from vokaba.ocr_client import (
+    ERR_FILE_NOT_FOUND,
+    ERR_MISSING_DEPENDENCY,
+    ERR_OUT_OF_MEMORY,
+    ERR_RUNNER_EXITED,
+    ERR_START_FAILED,
+    ERR_TIMEOUT,
+    ERR_UNSUPPORTED_LANG,
+    OcrServerError,
+    OcrServerPool,
+    tune,
+)
 from vokaba.ui.widgets.rounded import RoundedCard
 
 
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+IMAGE_FILTERS = ["*.png", "*.jpg", "*.jpeg"]
+# desktop only: the runner rasterizes the pages (vokaba/ocr_pdf.py)
+PDF_FILTERS = ["*.pdf"]
+
+PAGE_STATE_TEXT = {
+    PAGE_QUEUED: "wartet",
+    PAGE_RUNNING: "startet …",
+    PAGE_PREPARING: "Bild wird vorbereitet …",
+    PAGE_LOADING: "Modell wird geladen …",
+    PAGE_RECOGNIZING: "Text wird erkannt …",
+    PAGE_PARSING: "wird ausgewertet …",
+    PAGE_DONE: "fertig",
+    PAGE_FAILED: "Fehler",
+    PAGE_CANCELLED: "übersprungen",
+}
+
+
+def _natural_key(name: str):
+    """Sort key for file names: "Seite 2" before "Seite 10"."""
+    return [int(part) if part.isdigit() else part.casefold() for part in re.split(r"(\d+)", name)]
+
+
+def _images_in_folder(folder: str) -> List[str]:
+    try:
+        names = os.listdir(folder)
+    except OSError as e:
+        log(f"ocr: cannot list folder {folder!r}: {e}")
+        return []
+    paths = []
+    for name in sorted(names, key=_natural_key):
+        full = os.path.join(folder, name)
+        if name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(full):
+            paths.append(full)
+    return paths
+
+
+def _is_lang_problem(err: OcrServerError) -> bool:
+    if err.code == ERR_UNSUPPORTED_LANG:
+        return True
+    low = str(err).lower()
+    return (
+            "lang" in low
+            and (
+                    "unsupported" in low
+                    or "unknown" in low
+                    or "not recognized" in low
+                    or "not support" in low
+            )
+    )
+
+
+def _friendly_desktop_error(err: OcrServerError) -> str:
+    raw = str(err or "").strip()
+    low = raw.lower()
+    code = getattr(err, "code", None)
+
+    if code == ERR_TIMEOUT:
+        return (
+            "Desktop-OCR hat zu lange benötigt.\n\n"
+            "Beim ersten Start kann das Laden der Modelle länger dauern.\n"
+            "Bitte Internetverbindung und Schreibrechte im App-Datenordner prüfen."
+        )
+
+    if code == ERR_FILE_NOT_FOUND:
+        return "Die ausgewählte Bilddatei wurde nicht gefunden."
+
+    if code == ERR_OUT_OF_MEMORY:
+        return (
+            "Für die Texterkennung war nicht genug Arbeitsspeicher frei.\n\n"
+            "Bitte andere Programme schließen oder ein kleineres Bild verwenden."
+        )
+
+    if code == ERR_MISSING_DEPENDENCY or ("no module named" in low and ("paddleocr" in low or "paddlex" in low)):
+        return (
+            "Desktop-OCR konnte nicht gestartet werden.\n\n"
+            "Wahrscheinlich fehlen OCR-Abhängigkeiten im Desktop-Build "
+            "(z. B. paddleocr/paddlex)."
+        )
+
+    if code == ERR_START_FAILED and "no module named" in low and "vokaba" in low:
+        return (
+            "Desktop-OCR konnte nicht gestartet werden.\n\n"
+            "Der OCR-Runner wurde im Desktop-Build nicht korrekt gefunden."
+        )
+
+    if code == ERR_RUNNER_EXITED:
+        return (
+            "Desktop-OCR wurde unerwartet beendet.\n\n"
+            "Bitte Build, Schreibrechte und OCR-Abhängigkeiten prüfen."
+        )
+
+    if raw:
+        return raw
+
+    return "Desktop-OCR ist fehlgeschlagen."
+
+
 class OcrImportMixin:
     """
     OCR import wizard:
-      1) Pick image (jpg/png)
-      2) Choose column count + mapping (own/foreign/third)
-      3) Run OCR (background thread) + loading animation
-      4) Review extracted vocab top-to-bottom; accept / back / skip
+      1) Pick one or more images (jpg/png), PDFs (desktop, one page per entry) or a folder
+      2) Choose column count + mapping (own/foreign/third), once for all pages
+      3) Run OCR (worker pool, see vokaba/ocr_batch.py) + per-page progress
+      4) Review extracted vocab top-to-bottom; pages are appended as they finish
       5) Import accepted entries into the current stack
     """
 
@@ -55,7 +178,8 @@ class OcrImportMixin:
 
         self._ocr_stack = stack
         self._ocr_vocab_list_ref = vocab_list
-        self._ocr_image_path = None  # local real path (not content://)
+        self._ocr_cancel_batch()
+        self._ocr_image_paths = []  # local real paths (not content://), in page order
         self._ocr_cancel_token = object()
         self._ocr_setup_screen()
 
@@ -114,6 +238,8 @@ class OcrImportMixin:
         if not stack:
             return
 
+        # back in setup = the running batch (if any) is abandoned
+        self._ocr_cancel_batch()
         self._ocr_review_active = False
         self._unbind_ocr_review_keys()
 
@@ -152,12 +278,18 @@ class OcrImportMixin:
         form.add_widget(self.make_text_label("Hinweis: das Foto sollte nur die relevanten Spalten beinhalten."))
         form.add_widget(self.make_text_label(""))
 
-        # Pick image
+        # Pick images (several files or, on desktop, a whole folder)
         pick_row = BoxLayout(orientation="horizontal", size_hint_y=None, height=input_h, spacing=dp(10))
-        pick_btn = self.make_primary_button("Bild auswählen …", size_hint=(0.55, 1))
-        self._ocr_selected_label = self.make_text_label("Kein Bild gewählt", size_hint=(0.45, 1), halign="left")
+        pick_btn = self.make_primary_button(
+            "Bilder auswählen …" if kivy_platform == "android" else "Bilder / PDF …", size_hint=(0.4, 1)
+        )
         pick_btn.bind(on_press=self._ocr_pick_image)
         pick_row.add_widget(pick_btn)
+        if kivy_platform != "android":
+            folder_btn = self.make_secondary_button("Ordner …", size_hint=(0.2, 1))
+            folder_btn.bind(on_press=self._ocr_pick_folder)
+            pick_row.add_widget(folder_btn)
+        self._ocr_selected_label = self.make_text_label(self._ocr_selection_text(), size_hint=(0.4, 1), halign="left")
         pick_row.add_widget(self._ocr_selected_label)
         form.add_widget(pick_row)
 
@@ -342,22 +474,30 @@ class OcrImportMixin:
             if isinstance(selection, (str, bytes)):
                 selection = [selection]
 
-            src = selection[0]
-            local = self._ocr_copy_to_local_file(src)
+            local_paths = []
+            failed = 0
+            for src in selection:
+                local = self._ocr_copy_to_local_file(src)
+                if local:
+                    local_paths.append(local)
+                else:
+                    failed += 1
 
-            if not local:
-                self._ocr_setup_error.text = "Konnte Bild nicht öffnen (Copy fehlgeschlagen)."
+            if not local_paths:
+                self._ocr_setup_error.text = "Konnte Datei nicht öffnen (Copy fehlgeschlagen)."
                 return
 
-            self._ocr_image_path = local
-            self._ocr_selected_label.text = os.path.basename(local) if local else "Bild gewählt"
-            self._ocr_setup_error.text = ""
+            self._ocr_set_images(local_paths)
+            if failed:
+                self._ocr_setup_error.text = f"{failed} Datei(en) konnten nicht geöffnet werden."
 
+        filters = IMAGE_FILTERS if kivy_platform == "android" else IMAGE_FILTERS + PDF_FILTERS
         try:
             if hasattr(self, "run_open_file_dialog") and self.run_open_file_dialog(
                 on_sel,
-                filters=["*.png", "*.jpg", "*.jpeg"],
-                title="Bild auswählen",
+                filters=filters,
+                title="Bilder auswählen" if kivy_platform == "android" else "Bilder oder PDF auswählen",
+                multiple=True,
             ):
                 return
         except Exception as e:
@@ -378,7 +518,7 @@ class OcrImportMixin:
 
         from kivy.uix.filechooser import FileChooserIconView
 
-        chooser = FileChooserIconView(path=os.path.expanduser("~"), dirselect=False, filters=["*.png", "*.jpg", "*.jpeg"])
+        chooser = FileChooserIconView(path=os.path.expanduser("~"), dirselect=False, multiselect=True, filters=filters)
         content = BoxLayout(orientation="vertical", spacing=dp(8), padding=dp(8))
         content.add_widget(chooser)
 
@@ -393,7 +533,7 @@ class OcrImportMixin:
 
         def _ok(*_a):
             if chooser.selection:
-                on_sel([chooser.selection[0]])
+                on_sel(sorted(chooser.selection, key=lambda p: _natural_key(os.path.basename(p))))
             popup.dismiss()
 
         ok_btn.bind(on_press=_ok)
@@ -414,6 +554,60 @@ class OcrImportMixin:
             except Exception:
                 pass
 
+    def _ocr_pick_folder(self, _instance=None):
+        """Desktop: every png/jpg in a folder, one page per image (sorted by name)."""
+        folder = None
+        try:
+            if hasattr(self, "desktop_open_folder_dialog"):
+                folder = self.desktop_open_folder_dialog(title="Ordner mit Bildern auswählen")
+        except Exception as e:
+            log(f"ocr pick folder: system dialog failed: {e}")
+        if not folder:
+            return
+
+        paths = [p for p in _images_in_folder(folder) if self._ocr_image_problem(p) is None]
+        if not paths:
+            self._ocr_setup_error.text = "Im Ordner wurden keine Bilder (png/jpg) gefunden."
+            return
+        self._ocr_set_images(paths)
+
+    def _ocr_set_images(self, paths: List[str]):
+        self._ocr_image_paths = list(paths)
+        self._ocr_setup_error.text = ""
+        self._ocr_selected_label.text = self._ocr_selection_text()
+
+    def _ocr_selection_text(self) -> str:
+        paths = list(getattr(self, "_ocr_image_paths", None) or [])
+        if not paths:
+            return "Kein Bild gewählt"
+        if len(paths) == 1:
+            return os.path.basename(paths[0])
+        if any(ocr_pdf.is_pdf(p) for p in paths):
+            return f"{len(paths)} Dateien gewählt"
+        return f"{len(paths)} Bilder gewählt"
+
+    @staticmethod
+    def _ocr_page_label(path: str) -> str:
+        """Loading screen name of a batch entry: file name, PDF pages as "liste.pdf, S. 3"."""
+        ref = ocr_pdf.split_ref(path)
+        if ref is None:
+            return os.path.basename(path)
+        return f"{os.path.basename(ref[0])}, S. {ref[1] + 1}"
+
+    @staticmethod
+    def _ocr_image_problem(path: str) -> Optional[str]:
+        """None if path (image, PDF or PDF page) looks like a usable file, else the message for the user."""
+        ref = ocr_pdf.split_ref(path)
+        img = Path(ref[0] if ref is not None else str(path)).expanduser()
+        if not img.exists() or not img.is_file():
+            return "Die ausgewählte Bilddatei wurde nicht gefunden."
+        try:
+            if int(img.stat().st_size) < 32:
+                return "Die ausgewählte Bilddatei ist leer oder unvollständig."
+        except OSError:
+            pass
+        return None
+
     def _ocr_copy_to_local_file(self, src_raw: str) -> str:
         """
         Copies a picked image into our app-internal cache folder and returns a REAL file path.
@@ -427,7 +621,9 @@ class OcrImportMixin:
         # Robust extension guess (also works for content:// URIs)
         ext = ".png"
         try:
-            if hasattr(self, "guess_image_extension"):
+            if ocr_pdf.is_pdf(src or ""):
+                ext = ".pdf"
+            elif hasattr(self, "guess_image_extension"):
                 ext = str(self.guess_image_extension(src)) or ".png"
             else:
                 low = (src or "").lower()
@@ -444,7 +640,8 @@ class OcrImportMixin:
         except Exception:
             pass
 
-        dest = base / f"ocr_input_{int(time.time())}{ext}"
+        # ns: several pictures of one selection are copied within the same second
+        dest = base / f"ocr_input_{time.time_ns()}{ext}"
 
         try:
             if hasattr(self, "copy_any_to_file"):
@@ -480,23 +677,32 @@ class OcrImportMixin:
     # -------------------------
 
     def _ocr_start(self, _instance=None):
-        image_path = str(getattr(self, "_ocr_image_path", "") or "").strip()
-        if not image_path:
+        paths = [str(p).strip() for p in (getattr(self, "_ocr_image_paths", None) or []) if str(p).strip()]
+        if not paths:
             self._ocr_setup_error.text = "Bitte zuerst ein Bild auswählen."
             return
 
-        img = Path(image_path).expanduser()
-        if not img.exists() or not img.is_file():
-            self._ocr_setup_error.text = "Die ausgewählte Bilddatei wurde nicht gefunden."
+        images = []
+        for p in paths:
+            problem = self._ocr_image_problem(p)
+            if problem is None:
+                images.append(str(Path(p).expanduser()))
+            elif len(paths) == 1:
+                self._ocr_setup_error.text = problem
+                return
+            else:
+                log(f"ocr: skipping {p!r}: {problem}")
+        if not images:
+            self._ocr_setup_error.text = "Keine der ausgewählten Bilddateien wurde gefunden."
             return
 
-        try:
-            if int(img.stat().st_size) < 32:
-                self._ocr_setup_error.text = "Die ausgewählte Bilddatei ist leer oder unvollständig."
-                return
-        except Exception:
-            pass
+        # a PDF becomes one batch entry per page
+        images, problem = self._ocr_expand_pdfs(images)
+        if problem:
+            self._ocr_setup_error.text = problem
+            return
 
+        # one column setup for every page of the batch
         try:
             n_cols = int(getattr(self, "_ocr_colcount_spinner", None).text)
         except Exception:
@@ -512,10 +718,45 @@ class OcrImportMixin:
 
         self._ocr_setup_error.text = ""
 
+        # at most one OCR job per wizard
+        self._ocr_cancel_batch()
         token = object()
         self._ocr_cancel_token = token
 
+        def recognize(image_path: str, job: PageJob) -> List[Dict[str, str]]:
+            return self._ocr_recognize_page(
+                image_path,
+                job=job,
+                lang=lang,
+                use_textline_orientation=use_ori,
+                n_cols=n_cols,
+                mapping=mapping,
+            )
+
+        def on_page(index, state, result, error):
+            Clock.schedule_once(lambda _dt: self._ocr_on_page(token, index, state, result, error), 0)
+
+        def on_done():
+            Clock.schedule_once(lambda _dt: self._ocr_on_batch_done(token), 0)
+
+        self._ocr_batch = OcrBatch(
+            images,
+            recognize,
+            workers=self._ocr_batch_workers(len(images)),
+            on_page=on_page,
+            on_done=on_done,
+        )
+        self._ocr_batch_open = True
+        self._ocr_waiting = False
+        self._ocr_entries = []
+        # recognized lines so far, per page (loading screen)
+        self._ocr_page_lines = {}
+        self._ocr_index = 0
+        self._ocr_total_all = 0
+
         self._ocr_loading_screen()
+        # created here (UI thread) so the workers share one instance with the current size cap
+        self._ocr_result_cache()
 
         if kivy_platform == "android":
             try:
@@ -526,28 +767,93 @@ class OcrImportMixin:
                 log(msg)
                 self._ocr_show_error(msg)
                 return
+        else:
+            pool = getattr(self, "_ocr_server_pool_obj", None)
+            if pool is not None and getattr(self, "_ocr_server_pool_threads", None) != self._ocr_tuning()[1]:
+                # thread count is fixed per runner process: new settings, new runners
+                self._ocr_server_pool_obj = None
+                pool.close()
+            self._ocr_server_pool().resize(self._ocr_batch_workers())
+
+        self._ocr_batch.start()
+
+    def _ocr_expand_pdfs(self, paths: List[str]) -> Tuple[List[str], str]:
+        """(batch entries, problem): every PDF replaced by its page refs; problem is "" or the message."""
+        out: List[str] = []
+        for p in paths:
+            if not ocr_pdf.is_pdf(p):
+                out.append(p)
+                continue
+            if kivy_platform == "android":
+                return [], "PDF-Import gibt es nur in der Desktop-Version. Bitte Fotos der Seiten verwenden."
+            try:
+                n = ocr_pdf.page_count(p)
+            except ImportError as e:
+                log(f"ocr: pdf import unavailable: {e}")
+                return [], "Für den PDF-Import fehlt das Paket pypdfium2 (kommt mit paddleocr)."
+            except Exception as e:
+                log(f"ocr: cannot open pdf {p!r}: {e}")
+                return [], f"Die PDF-Datei {os.path.basename(p)} konnte nicht geöffnet werden."
+            if n <= 0:
+                return [], f"Die PDF-Datei {os.path.basename(p)} hat keine Seiten."
+            out.extend(ocr_pdf.page_ref(p, i) for i in range(n))
+        return out, ""
+
+    def _ocr_tuning(self) -> Tuple[int, int]:
+        """(runners, threads per runner) from settings.ocr.batch_workers / threads; 0 = auto (ocr_client.tune)."""
+        try:
+            cfg = self.config_data["settings"]["ocr"]
+        except Exception:
+            cfg = {}
+        try:
+            workers = int(cfg.get("batch_workers", save.DEFAULT_OCR_BATCH_WORKERS))
+            threads = int(cfg.get("threads", save.DEFAULT_OCR_THREADS))
+        except (TypeError, ValueError):
+            workers, threads = save.DEFAULT_OCR_BATCH_WORKERS, save.DEFAULT_OCR_THREADS
+        return tune(workers, threads)
 
-        th = threading.Thread(
-            target=self._ocr_worker,
-            kwargs={
-                "token": token,
-                "image_path": str(img),
-                "lang": lang,
-                "use_textline_orientation": use_ori,
-                "n_cols": n_cols,
-                "mapping": mapping,
-            },
-            daemon=True,
-        )
-        th.start()
-
+    def _ocr_batch_workers(self, pages: Optional[int] = None) -> int:
+        """
+        Parallel pages: settings.ocr.batch_workers (0 = by core count),
+        capped by CPU count (and page count). Android (ML Kit) does one page
+        at a time.
+        """
+        if kivy_platform == "android":
+            return 1
+        workers = self._ocr_tuning()[0]
+        if pages is not None:
+            workers = max(1, min(workers, int(pages)))
+        return workers
+
+    def _ocr_batch_pending(self) -> bool:
+        """True until the last page of the running batch has reached the UI thread."""
+        return bool(getattr(self, "_ocr_batch_open", False)) and getattr(self, "_ocr_batch", None) is not None
+
+    def _ocr_cancel_batch(self):
+        batch = getattr(self, "_ocr_batch", None)
+        self._ocr_batch = None
+        self._ocr_batch_open = False
+        self._ocr_waiting = False
+        # callbacks that are already scheduled see a stale token
+        self._ocr_cancel_token = None
+        if batch is not None:
+            batch.cancel()
 
     def _ocr_loading_screen(self):
         self.window.clear_widgets()
         pad_mul = float(self.config_data["settings"]["gui"]["padding_multiplicator"])
 
+        batch = getattr(self, "_ocr_batch", None)
+        n_pages = len(batch) if batch is not None else 1
+
         center = AnchorLayout(anchor_x="center", anchor_y="center", padding=40 * pad_mul)
-        card = RoundedCard(orientation="vertical", size_hint=(0.85, 0.5), padding=dp(16), spacing=dp(14), bg_color=self.colors["card"])
+        card = RoundedCard(
+            orientation="vertical",
+            size_hint=(0.85, 0.5 if n_pages <= 1 else 0.85),
+            padding=dp(16),
+            spacing=dp(14),
+            bg_color=self.colors["card"],
+        )
 
         card.add_widget(self.make_title_label("OCR läuft …", size_hint_y=None, height=dp(40)))
         card.add_widget(self.make_text_label("Bitte warten. Das kann beim ersten Mal länger dauern.", size_hint_y=None, height=dp(60), halign="center"))
@@ -557,23 +863,44 @@ class OcrImportMixin:
         pb.height = dp(18)
         card.add_widget(pb)
 
-        state = {"v": 0, "dir": 1}
+        # one page: its stage; several pages: "x von n" plus one row per page with a skip button
+        progress_label = self.make_text_label(PAGE_STATE_TEXT[PAGE_QUEUED], size_hint_y=None, height=dp(30), halign="center")
+        card.add_widget(progress_label)
+        page_rows = []
+        if n_pages > 1:
+            scroll = ScrollView(size_hint=(1, 1))
+            page_list = BoxLayout(orientation="vertical", size_hint_y=None, spacing=dp(6))
+            page_list.bind(minimum_height=page_list.setter("height"))
+            for i, path in enumerate(batch.images):
+                row = BoxLayout(orientation="horizontal", size_hint_y=None, height=dp(40), spacing=dp(8))
+                row.add_widget(self.make_text_label(f"{i + 1}. {self._ocr_page_label(path)}", size_hint=(0.5, 1), halign="left"))
+                status = self.make_text_label("", size_hint=(0.27, 1), halign="left")
+                row.add_widget(status)
+                skip_btn = self.make_secondary_button("Überspringen", size_hint=(0.23, 1))
+                skip_btn.bind(on_press=lambda _inst, idx=i: batch.cancel_page(idx))
+                row.add_widget(skip_btn)
+                page_list.add_widget(row)
+                page_rows.append((status, skip_btn))
+            scroll.add_widget(page_list)
+            card.add_widget(scroll)
 
         def tick(_dt):
-            if getattr(self, "_ocr_cancel_token", None) is None:
+            if getattr(self, "_ocr_cancel_token", None) is None or batch is None:
                 return False
-            v = state["v"] + state["dir"] * 6
-            if v >= 100:
-                v = 100
-                state["dir"] = -1
-            elif v <= 0:
-                v = 0
-                state["dir"] = 1
-            state["v"] = v
-            pb.value = v
+
+            pb.value = 100.0 * batch.progress()
+            if not page_rows:
+                progress_label.text = self._ocr_page_state_text(batch, 0)
+                return True
+
+            progress_label.text = f"{batch.finished()} von {n_pages} Seiten fertig"
+            for i, (status, skip_btn) in enumerate(page_rows):
+                page_state = batch.states[i]
+                status.text = self._ocr_page_state_text(batch, i)
+                skip_btn.disabled = page_state in (PAGE_DONE, PAGE_FAILED, PAGE_CANCELLED)
             return True
 
-        self._ocr_loading_clock = Clock.schedule_interval(tick, 0.05)
+        self._ocr_loading_clock = Clock.schedule_interval(tick, 0.1)
 
         row = BoxLayout(orientation="horizontal", size_hint_y=None, height=dp(50), spacing=dp(12))
         cancel_btn = self.make_secondary_button("Abbrechen", size_hint=(1, 1))
@@ -584,8 +911,19 @@ class OcrImportMixin:
         center.add_widget(card)
         self.window.add_widget(center)
 
+    def _ocr_page_state_text(self, batch: OcrBatch, index: int) -> str:
+        page_state = batch.states[index]
+        text = PAGE_STATE_TEXT.get(page_state, page_state)
+        if page_state == PAGE_DONE:
+            text += f" ({len(batch.results[index] or [])})"
+        elif page_state == PAGE_RECOGNIZING:
+            n = getattr(self, "_ocr_page_lines", {}).get(index, 0)
+            if n:
+                text += f" ({n} Zeilen)"
+        return text
+
     def _ocr_cancel_loading(self, _instance=None):
-        self._ocr_cancel_token = None
+        self._ocr_cancel_batch()
         try:
             if hasattr(self, "_ocr_loading_clock") and self._ocr_loading_clock is not None:
                 self._ocr_loading_clock.cancel()
@@ -593,246 +931,388 @@ class OcrImportMixin:
             pass
         self._ocr_setup_screen()
 
-    def _ocr_worker(
+    def _ocr_recognize_page(
             self,
-            *,
-            token: object,
             image_path: str,
+            *,
+            job: PageJob,
             lang: str,
             use_textline_orientation: bool,
             n_cols: int,
             mapping: List[str],
-    ):
-        def _is_lang_problem(msg: str) -> bool:
-            low = (msg or "").lower()
-            return (
-                    "lang" in low
-                    and (
-                            "unsupported" in low
-                            or "unknown" in low
-                            or "not recognized" in low
-                            or "not support" in low
-                    )
+    ) -> List[Dict[str, str]]:
+        """
+        One page: OCR -> rows -> entries. Runs on a batch worker thread;
+        failures are raised as RuntimeError with the message for the user.
+        Stages go to job (loading screen); cancelling the job kills the
+        runner that is working on the page.
+        """
+        problem = self._ocr_image_problem(image_path)
+        if problem is not None:
+            raise RuntimeError(problem)
+        # PDF page: the runner rasterizes it (at settings.ocr.pdf_dpi), no photo preprocessing
+        ref = ocr_pdf.split_ref(image_path)
+        img = Path(ref[0] if ref is not None else str(image_path)).expanduser()
+        pdf_page = ref[1] if ref is not None else None
+
+        # same photo again (e.g. only the column setup changed): no inference, just parsing
+        prep = self._ocr_preprocess_options()
+        cache = self._ocr_result_cache()
+        if ref is not None:
+            source = {"page": pdf_page, "dpi": self._ocr_pdf_dpi()}
+        else:
+            source = {"prep": ocr_preprocess.options_key(**prep)}
+        cache_key = cache.key(
+            str(img),
+            lang=lang,
+            engine=self._ocr_engine_tag(),
+            textline_ori=use_textline_orientation,
+            tiled=self._ocr_tiled(),
+            **source,
+        )
+        # lines streamed by the runner become parser items right away, so
+        # only grouping them into rows/columns is left when it finishes
+        live: Dict[int, Optional[Dict[str, Any]]] = {}
+        line_counts = getattr(self, "_ocr_page_lines", {})
+
+        def on_line(line):
+            live[line["n"]] = ocr_rows.item_from_line(line["text"], line["score"], line["poly"], index=line["n"])
+            line_counts[job.index] = len(live)
+
+        json_pages = cache.get(cache_key)
+        if json_pages is not None:
+            log(f"ocr: cached result for {self._ocr_page_label(image_path)}")
+        elif ref is not None:
+            json_pages = self._ocr_run_engine(
+                img,
+                job=job,
+                lang=lang,
+                use_textline_orientation=use_textline_orientation,
+                on_line=on_line,
+                pdf_page=pdf_page,
             )
+            cache.put(cache_key, json_pages)
+        else:
+            json_pages = self._ocr_prepared_run(
+                img,
+                prep,
+                job=job,
+                lang=lang,
+                use_textline_orientation=use_textline_orientation,
+                on_line=on_line,
+            )
+            cache.put(cache_key, json_pages)
+
+        # -------------------------
+        # Common parse -> rows -> entries
+        # -------------------------
+        job.stage(PAGE_PARSING)
+        # a retry (other language) may have left lines of the first attempt behind: then from the pages
+        n_lines = sum(len((p.get("res", p) if isinstance(p, dict) else {}).get("rec_texts") or []) for p in json_pages or [])
+        if live and len(live) == n_lines:
+            items = [live[n] for n in sorted(live) if live[n] is not None]
+        else:
+            items = ocr_rows.items_from_pages(json_pages)
+        rows = ocr_rows.rows_from_items(items, n_cols=n_cols)
+        return self._ocr_rows_to_vocab_entries(rows, mapping=mapping)
 
-        def _friendly_desktop_error(raw: str) -> str:
-            raw = (raw or "").strip()
-            low = raw.lower()
-
-            if raw == "timeout":
-                return (
-                    "Desktop-OCR hat zu lange benötigt.\n\n"
-                    "Beim ersten Start kann das Laden der Modelle länger dauern.\n"
-                    "Bitte Internetverbindung und Schreibrechte im App-Datenordner prüfen."
-                )
-
-            if "file not found" in low:
-                return "Die ausgewählte Bilddatei wurde nicht gefunden."
-
-            if "no module named" in low and ("paddleocr" in low or "paddlex" in low):
-                return (
-                    "Desktop-OCR konnte nicht gestartet werden.\n\n"
-                    "Wahrscheinlich fehlen OCR-Abhängigkeiten im Desktop-Build "
-                    "(z. B. paddleocr/paddlex)."
-                )
-
-            if "no module named" in low and "vokaba" in low:
-                return (
-                    "Desktop-OCR konnte nicht gestartet werden.\n\n"
-                    "Der OCR-Runner wurde im Desktop-Build nicht korrekt gefunden."
-                )
-
-            if "output json is missing" in low:
-                return (
-                    "Desktop-OCR wurde gestartet, hat aber keine Ergebnisdatei erzeugt.\n\n"
-                    "Bitte Build, Schreibrechte und OCR-Abhängigkeiten prüfen."
-                )
+    def _ocr_prepared_run(
+            self,
+            img: Path,
+            prep: Dict[str, Any],
+            *,
+            job: PageJob,
+            lang: str,
+            use_textline_orientation: bool,
+            on_line: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """OCR on the downscaled/upright working copy; coordinates come back in original pixels (on_line too)."""
+        job.stage(PAGE_PREPARING)
+        work = Path(data_dir()) / "ocr_cache" / "work" / f"prep_{time.time_ns()}_{threading.get_ident()}.jpg"
+        transform = None
+        try:
+            work.parent.mkdir(parents=True, exist_ok=True)
+            t0 = time.perf_counter()
+            transform = ocr_preprocess.prepare_image(str(img), str(work), **prep)
+            if transform is not None:
+                log(f"ocr: prepared {img.name} ({transform.size[0]}x{transform.size[1]}) in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        except Exception as e:
+            log(f"ocr: preprocessing failed, using the original: {e}")
 
-            if raw:
-                return raw
+        line_cb = on_line
+        if on_line is not None and transform is not None:
+            def _mapped_line(line):
+                on_line(dict(line, poly=[list(transform.point(x, y)) for x, y in line["poly"]]))
 
-            return "Desktop-OCR ist fehlgeschlagen."
+            line_cb = _mapped_line
 
         try:
-            if getattr(self, "_ocr_cancel_token", None) is not token:
-                return
-
-            img = Path(str(image_path)).expanduser()
-            if not img.exists() or not img.is_file():
-                raise RuntimeError("Die ausgewählte Bilddatei wurde nicht gefunden.")
+            pages = self._ocr_run_engine(
+                work if transform is not None else img,
+                job=job,
+                lang=lang,
+                use_textline_orientation=use_textline_orientation,
+                on_line=line_cb,
+            )
+        finally:
+            if transform is not None:
+                try:
+                    work.unlink()
+                except OSError:
+                    pass
+        return transform.map_pages(pages) if transform is not None else pages
 
+    def _ocr_run_engine(
+            self,
+            img: Path,
+            *,
+            job: PageJob,
+            lang: str,
+            use_textline_orientation: bool,
+            on_line: Optional[Callable[[Dict[str, Any]], None]] = None,
+            pdf_page: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        OCR JSON pages of img (pdf_page: that page of the PDF img, desktop
+        only); desktop also streams each recognized line to on_line while
+        it runs.
+        """
+        # -------------------------
+        # ANDROID: ML Kit (on-device)
+        # -------------------------
+        if kivy_platform == "android":
+            if pdf_page is not None:
+                raise RuntimeError("PDF-Import gibt es nur in der Desktop-Version.")
+            from vokaba.ocr_android_mlkit import mlkit_to_paddle_pages_async
+            job.stage(PAGE_RECOGNIZING)
+            return mlkit_to_paddle_pages_async(str(img), timeout_sec=60.0)
+
+        # -------------------------
+        # DESKTOP: PaddleOCR (warm runner processes, see vokaba/ocr_client.py)
+        # -------------------------
+        with self._ocr_server_pool().lease() as server:
+            job.on_cancel(server.abort)
+            job.stage(PAGE_RECOGNIZING)
+            request = {
+                "textline_ori": use_textline_orientation,
+                "tiled": self._ocr_tiled(),
+                "on_stage": job.stage,
+                "on_line": on_line,
+                "on_progress": job.progress,
+                "cancelled": lambda: job.cancelled,
+            }
+            if pdf_page is not None:
+                request.update(page=pdf_page, dpi=self._ocr_pdf_dpi())
             try:
-                if int(img.stat().st_size) < 32:
-                    raise RuntimeError("Die ausgewählte Bilddatei ist leer oder unvollständig.")
-            except OSError:
-                pass
-
-            # -------------------------
-            # ANDROID: ML Kit (on-device)
-            # -------------------------
-            if kivy_platform == "android":
-                from vokaba.ocr_android_mlkit import mlkit_to_paddle_pages_async
-                json_pages = mlkit_to_paddle_pages_async(str(img), timeout_sec=60.0)
-
-            # -------------------------
-            # DESKTOP: PaddleOCR (subprocess runner)
-            # -------------------------
-            else:
-                import sys
-                from vokaba.core.paths import runtime_root
-
-                cache = Path(data_dir()) / "paddleocr_models"
-                cache.mkdir(parents=True, exist_ok=True)
-
-                out_dir = Path(data_dir()) / "ocr_cache"
-                out_dir.mkdir(parents=True, exist_ok=True)
-                out_json = out_dir / f"ocr_out_{int(time.time())}_{os.getpid()}.json"
-
-                env = os.environ.copy()
-                env.setdefault("DISABLE_AUTO_LOGGING_CONFIG", "1")
-                env.setdefault("PADDLEX_HOME", str(cache))
-                env.setdefault("PADDLEX_CACHE_DIR", str(cache))
-                env.setdefault("DISABLE_MODEL_SOURCE_CHECK", "True")
-                env.setdefault("FLAGS_use_mkldnn", "0")
-                env.setdefault("OMP_NUM_THREADS", "1")
-                env.setdefault("PYTHONUTF8", "1")
-                env.setdefault("PYTHONIOENCODING", "utf-8")
-
-                base_args = [
-                    "--image", str(img.resolve()),
-                    "--lang", str(lang),
-                    "--cache-dir", str(cache),
-                    "--out", str(out_json),
-                    "--no-source-check",
-                ]
-                if use_textline_orientation:
-                    base_args.append("--textline-ori")
-
-                candidate_cmds = []
-                is_frozen = bool(getattr(sys, "frozen", False) or hasattr(sys, "_MEIPASS"))
-
-                if is_frozen:
-                    candidate_cmds.append([sys.executable, "--ocr-runner", *base_args])
-
-                candidate_cmds.append([sys.executable, "-m", "vokaba.ocr_runner", *base_args])
-
-                runner_py = Path(runtime_root()) / "vokaba" / "ocr_runner.py"
-                if runner_py.exists():
-                    candidate_cmds.append([sys.executable, str(runner_py), *base_args])
-
-                # Dedupe
-                unique_cmds = []
-                seen = set()
-                for cmd in candidate_cmds:
-                    key = tuple(cmd)
-                    if key not in seen:
-                        seen.add(key)
-                        unique_cmds.append(cmd)
-
-                def _attempt_cmd(cmd: List[str]):
-                    try:
-                        out_json.unlink(missing_ok=True)
-                    except Exception:
-                        try:
-                            if out_json.exists():
-                                out_json.unlink()
-                        except Exception:
-                            pass
-
-                    try:
-                        proc = subprocess.run(
-                            cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            cwd=str(runtime_root()),
-                            env=env,
-                            timeout=180,
-                        )
-                    except subprocess.TimeoutExpired:
-                        return None, "timeout"
-
-                    raw = (proc.stderr or proc.stdout or "").strip()
-
-                    if proc.returncode != 0:
-                        return None, raw or f"OCR subprocess failed (code {proc.returncode})"
-
-                    if not out_json.exists():
-                        return None, raw or "OCR subprocess returned ok, but output JSON is missing."
-
-                    try:
-                        payload = json.loads(out_json.read_text(encoding="utf-8"))
-                    except Exception as e:
-                        return None, f"OCR output konnte nicht gelesen werden: {e}"
-
-                    if not isinstance(payload, list):
-                        return None, "OCR output has unexpected format."
-
-                    return payload, ""
+                return server.ocr(str(img.resolve()), lang=lang, **request)
+            except OcrServerError as e:
+                if not (_is_lang_problem(e) and lang != "en"):
+                    raise RuntimeError(_friendly_desktop_error(e))
+                try:
+                    return server.ocr(str(img.resolve()), lang="en", **request)
+                except OcrServerError as e2:
+                    raise RuntimeError(_friendly_desktop_error(e2 if str(e2) else e))
+            finally:
+                job.clear_cancel()
+
+    def _ocr_tiled(self) -> bool:
+        """settings.ocr.tiled: tall pages as overlapping bands (desktop runner, vokaba/ocr_tiles.py)."""
+        if kivy_platform == "android":
+            return False
+        try:
+            return bool(self.config_data["settings"]["ocr"].get("tiled", False))
+        except Exception:
+            return False
 
-                json_pages = None
-                last_err = ""
+    def _ocr_preprocess_options(self) -> Dict[str, Any]:
+        """prepare_image() options from settings.ocr (long_edge, grayscale, crop_to_text)."""
+        try:
+            cfg = self.config_data["settings"]["ocr"]
+        except Exception:
+            cfg = {}
+        try:
+            long_edge = max(0, int(cfg.get("long_edge", save.DEFAULT_OCR_LONG_EDGE)))
+        except (TypeError, ValueError):
+            long_edge = save.DEFAULT_OCR_LONG_EDGE
+        return {
+            "long_edge": long_edge,
+            "grayscale": bool(cfg.get("grayscale", False)),
+            "crop": bool(cfg.get("crop_to_text", False)),
+        }
 
-                for cmd in unique_cmds:
-                    if getattr(self, "_ocr_cancel_token", None) is not token:
-                        return
+    def _ocr_pdf_dpi(self) -> int:
+        """settings.ocr.pdf_dpi: resolution PDF pages are rasterized at (clamped to ocr_pdf.MIN_DPI..MAX_DPI)."""
+        try:
+            dpi = self.config_data["settings"]["ocr"].get("pdf_dpi", save.DEFAULT_OCR_PDF_DPI)
+        except Exception:
+            dpi = save.DEFAULT_OCR_PDF_DPI
+        return ocr_pdf.clamp_dpi(dpi)
 
-                    pages, err = _attempt_cmd(cmd)
+    def _ocr_result_cache(self) -> OcrResultCache:
+        """OCR results by image hash in data_dir()/ocr_cache/results (settings.ocr.cache_max_mb)."""
+        try:
+            max_mb = float(self.config_data["settings"]["ocr"]["cache_max_mb"])
+        except Exception:
+            max_mb = float(save.DEFAULT_OCR_CACHE_MAX_MB)
+        max_bytes = int(max(0.0, max_mb) * 1024 * 1024)
+
+        cache = getattr(self, "_ocr_result_cache_obj", None)
+        if cache is None:
+            cache = OcrResultCache(Path(data_dir()) / "ocr_cache" / "results", max_bytes)
+            self._ocr_result_cache_obj = cache
+        elif cache.max_bytes != max_bytes:
+            cache.max_bytes = max_bytes
+            cache.evict()
+        return cache
+
+    def _ocr_engine_tag(self) -> str:
+        """OCR engine + version for the cache key: a new PaddleOCR (models) or runner output means new results."""
+        if kivy_platform == "android":
+            return "mlkit"
+        tag = getattr(self, "_ocr_engine_tag_value", None)
+        if tag is None:
+            from vokaba.ocr_runner import RESULT_VERSION
+            try:
+                from importlib.metadata import version
+                paddle_version = version("paddleocr")
+            except Exception:
+                paddle_version = "unknown"
+            tag = f"paddleocr-{paddle_version}-r{RESULT_VERSION}"
+            self._ocr_engine_tag_value = tag
+        return tag
 
-                    if pages is None and _is_lang_problem(err) and lang != "en":
-                        cmd_en = cmd[:]
-                        for i in range(len(cmd_en) - 1):
-                            if cmd_en[i] == "--lang":
-                                cmd_en[i + 1] = "en"
-                                break
-                        pages, err2 = _attempt_cmd(cmd_en)
-                        if pages is not None:
-                            json_pages = pages
-                            break
-                        err = err2 or err
+    # -------------------------
+    # Batch results -> merged review (UI thread)
+    # -------------------------
 
-                    if pages is not None:
-                        json_pages = pages
-                        break
+    def _ocr_on_page(self, token: object, index: int, state: str, result, error):
+        """A finished page (in page order): open the review with it or append it."""
+        if getattr(self, "_ocr_cancel_token", None) is not token:
+            return
 
-                    last_err = err
+        entries = list(result or []) if state == PAGE_DONE else []
+        if not entries:
+            self._ocr_update_review_header()
+            return
 
-                try:
-                    out_json.unlink(missing_ok=True)
-                except Exception:
-                    try:
-                        if out_json.exists():
-                            out_json.unlink()
-                    except Exception:
-                        pass
+        if not getattr(self, "_ocr_review_active", False):
+            self._ocr_review_screen(entries)
+            return
 
-                if json_pages is None:
-                    raise RuntimeError(_friendly_desktop_error(last_err))
+        self._ocr_entries.extend(entries)
+        self._ocr_total_all = int(getattr(self, "_ocr_total_all", 0) or 0) + len(entries)
+        if getattr(self, "_ocr_waiting", False):
+            # the user is already waiting at the end -> show the new page
+            self._ocr_render_review()
+        else:
+            self._ocr_update_review_header()
 
-            # -------------------------
-            # Common parse -> rows -> entries
-            # -------------------------
-            rows = self._ocr_rows_from_paddle_json(json_pages, n_cols=n_cols)
-            entries = self._ocr_rows_to_vocab_entries(rows, mapping=mapping)
+    def _ocr_on_batch_done(self, token: object):
+        if getattr(self, "_ocr_cancel_token", None) is not token:
+            return
+        self._ocr_batch_open = False
+        batch = getattr(self, "_ocr_batch", None)
 
-        except Exception as e:
-            msg = f"OCR Fehler: {e}"
-            log(msg)
+        if not getattr(self, "_ocr_review_active", False):
+            errors = [e for e in (batch.errors if batch is not None else []) if e is not None]
+            if errors and batch.count(PAGE_DONE) == 0:
+                self._ocr_show_error(f"OCR Fehler: {errors[0]}")
+            else:
+                self._ocr_review_screen([])
+            return
 
-            def _show(_dt):
-                if getattr(self, "_ocr_cancel_token", None) is token:
-                    self._ocr_show_error(msg)
+        if getattr(self, "_ocr_waiting", False):
+            self._ocr_finish()
+        else:
+            self._ocr_update_review_header()
 
-            Clock.schedule_once(_show, 0)
+    def _ocr_batch_status_text(self) -> str:
+        batch = getattr(self, "_ocr_batch", None)
+        if batch is None or len(batch) <= 1:
+            return ""
+        text = f"Seiten: {batch.finished()}/{len(batch)} erkannt"
+        failed = batch.count(PAGE_FAILED)
+        if failed:
+            text += f", {failed} fehlgeschlagen"
+        return text
+
+    def _ocr_update_review_header(self):
+        """Refresh counters on the visible review screen without rebuilding it."""
+        if not getattr(self, "_ocr_review_active", False):
             return
+        label = getattr(self, "_ocr_batch_status_label", None)
+        if label is not None:
+            label.text = self._ocr_batch_status_text()
+        title = getattr(self, "_ocr_review_title", None)
+        if title is not None and not getattr(self, "_ocr_waiting", False):
+            idx = int(getattr(self, "_ocr_index", 0) or 0)
+            total_all = int(getattr(self, "_ocr_total_all", 0) or 0)
+            title.text = f"Review {min(idx + 1, total_all)}/{total_all}"
 
-        def _done(_dt):
-            if getattr(self, "_ocr_cancel_token", None) is not token:
-                return
-            self._ocr_review_screen(entries)
+    # -------------------------
+    # Desktop OCR runners (warm processes shared by all imports)
+    # -------------------------
+
+    def _ocr_server_pool(self) -> OcrServerPool:
+        """The app's runner pool; runner processes start with the first request that needs them."""
+        pool = getattr(self, "_ocr_server_pool_obj", None)
+        if pool is not None:
+            return pool
+
+        import sys
+        from vokaba.core.paths import runtime_root
+
+        cache = Path(data_dir()) / "paddleocr_models"
+        cache.mkdir(parents=True, exist_ok=True)
+
+        env = os.environ.copy()
+        env.setdefault("DISABLE_AUTO_LOGGING_CONFIG", "1")
+        env.setdefault("PADDLEX_HOME", str(cache))
+        env.setdefault("PADDLEX_CACHE_DIR", str(cache))
+        env.setdefault("DISABLE_MODEL_SOURCE_CHECK", "True")
+        env.setdefault("FLAGS_use_mkldnn", "0")
+        env.setdefault("PYTHONUTF8", "1")
+        env.setdefault("PYTHONIOENCODING", "utf-8")
+
+        threads = self._ocr_tuning()[1]
+        env["OMP_NUM_THREADS"] = str(threads)
+
+        base_args = ["--serve", "--cache-dir", str(cache), "--no-source-check", "--threads", str(threads)]
+
+        candidate_cmds = []
+        is_frozen = bool(getattr(sys, "frozen", False) or hasattr(sys, "_MEIPASS"))
+
+        if is_frozen:
+            candidate_cmds.append([sys.executable, "--ocr-runner", *base_args])
+
+        candidate_cmds.append([sys.executable, "-m", "vokaba.ocr_runner", *base_args])
+
+        runner_py = Path(runtime_root()) / "vokaba" / "ocr_runner.py"
+        if runner_py.exists():
+            candidate_cmds.append([sys.executable, str(runner_py), *base_args])
+
+        # Dedupe
+        unique_cmds = []
+        seen = set()
+        for cmd in candidate_cmds:
+            key = tuple(cmd)
+            if key not in seen:
+                seen.add(key)
+                unique_cmds.append(cmd)
+
+        pool = OcrServerPool(unique_cmds, size=self._ocr_batch_workers(), env=env, cwd=str(runtime_root()))
+        log(f"ocr: up to {pool.size} runner(s), {threads} thread(s) each")
+        self._ocr_server_pool_obj = pool
+        self._ocr_server_pool_threads = threads
+        return pool
+
+    def _ocr_shutdown_server(self):
+        self._ocr_cancel_batch()
+        pool = getattr(self, "_ocr_server_pool_obj", None)
+        self._ocr_server_pool_obj = None
+        if pool is not None:
+            pool.close()
 
-        Clock.schedule_once(_done, 0)
-        
     def _ocr_show_error(self, msg: str):
         try:
             if hasattr(self, "_ocr_loading_clock") and self._ocr_loading_clock is not None:
@@ -857,125 +1337,7 @@ class OcrImportMixin:
     # -------------------------
 
     def _ocr_rows_from_paddle_json(self, pages: List[Dict[str, Any]], *, n_cols: int) -> List[List[str]]:
-        items = []
-
-        def bbox_from_poly(poly):
-            try:
-                xs = [p[0] for p in poly]
-                ys = [p[1] for p in poly]
-                return min(xs), min(ys), max(xs), max(ys)
-            except Exception:
-                return None
-
-        for page in pages or []:
-            payload = page.get("res", page) if isinstance(page, dict) else {}
-            texts = payload.get("rec_texts") or []
-            scores = payload.get("rec_scores") or []
-            boxes = (
-                payload.get("dt_polys")
-                or payload.get("dt_boxes")
-                or payload.get("rec_boxes")
-                or payload.get("boxes")
-                or []
-            )
-
-            if not boxes or not isinstance(boxes, list):
-                for i, t in enumerate(texts):
-                    t = (t or "").strip()
-                    if not t:
-                        continue
-                    sc = float(scores[i]) if i < len(scores) else 1.0
-                    if sc < 0.45:
-                        continue
-                    items.append({"text": t, "x": 0.0, "y": float(i) * 10.0, "h": 10.0})
-                continue
-
-            for i, t in enumerate(texts):
-                t = (t or "").strip()
-                if not t:
-                    continue
-                sc = float(scores[i]) if i < len(scores) else 1.0
-                if sc < 0.45:
-                    continue
-
-                b = boxes[i] if i < len(boxes) else None
-                bb = None
-                if isinstance(b, (list, tuple)) and b and isinstance(b[0], (list, tuple)):
-                    bb = bbox_from_poly(b)
-                if bb is None and isinstance(b, (list, tuple)) and len(b) == 4 and all(isinstance(x, (int, float)) for x in b):
-                    bb = (float(b[0]), float(b[1]), float(b[2]), float(b[3]))
-
-                if bb is None:
-                    items.append({"text": t, "x": 0.0, "y": float(i) * 10.0, "h": 10.0})
-                    continue
-
-                x1, y1, x2, y2 = bb
-                items.append(
-                    {
-                        "text": t,
-                        "x": float((x1 + x2) / 2.0),
-                        "y": float((y1 + y2) / 2.0),
-                        "h": float(max(1.0, y2 - y1)),
-                    }
-                )
-
-        if not items:
-            return []
-
-        items.sort(key=lambda it: (it["y"], it["x"]))
-
-        hs = sorted([float(it.get("h", 10.0) or 10.0) for it in items])
-        med_h = hs[len(hs) // 2] if hs else 10.0
-        line_tol = max(8.0, med_h * 0.65)
-
-        lines: List[Dict[str, Any]] = []
-        for it in items:
-            y = float(it["y"])
-            if not lines:
-                lines.append({"y": y, "items": [it]})
-                continue
-            if abs(y - float(lines[-1]["y"])) <= line_tol:
-                lines[-1]["items"].append(it)
-                ys = [x["y"] for x in lines[-1]["items"]]
-                lines[-1]["y"] = sum(ys) / max(1, len(ys))
-            else:
-                lines.append({"y": y, "items": [it]})
-
-        xs = [float(it["x"]) for it in items]
-        _, bounds = self._kmeans_1d(xs, k=n_cols)
-
-        def col_idx(x: float) -> int:
-            for i, b in enumerate(bounds):
-                if x <= b:
-                    return i
-            return n_cols - 1
-
-        rows: List[List[str]] = []
-        for ln in lines:
-            its = sorted(ln["items"], key=lambda it: it["x"])
-            cols = [[] for _ in range(n_cols)]
-            for it in its:
-                c = col_idx(float(it["x"]))
-                cols[c].append(it["text"])
-
-            row = []
-            for c in cols:
-                txt = " ".join([self._clean_cell_text(x) for x in c if self._clean_cell_text(x)])
-                row.append(txt.strip())
-            if self._row_is_noise(row):
-                continue
-            rows.append(row)
-
-        fixed = []
-        for row in rows:
-            if sum(1 for x in row if x) <= 1:
-                merged = " ".join([x for x in row if x]).strip()
-                parts = self._split_by_separators(merged, n_cols=n_cols)
-                fixed.append(parts if parts else row)
-            else:
-                fixed.append(row)
-
-        return fixed
+        return ocr_rows.rows_from_items(ocr_rows.items_from_pages(pages), n_cols=n_cols)
 
     def _ocr_rows_to_vocab_entries(self, rows: List[List[str]], *, mapping: List[str]) -> List[Dict[str, str]]:
         entries: List[Dict[str, str]] = []
@@ -1056,6 +1418,14 @@ class OcrImportMixin:
             self.main_menu()
             return
 
+        live_total = len(getattr(self, "_ocr_entries", []) or [])
+        idx = int(getattr(self, "_ocr_index", 0) or 0)
+        # reviewed everything that is there, but pages are still being recognized
+        self._ocr_waiting = idx >= live_total and self._ocr_batch_pending()
+        if self._ocr_waiting:
+            self._ocr_render_waiting()
+            return
+
         self.window.clear_widgets()
         pad_mul = float(self.config_data["settings"]["gui"]["padding_multiplicator"])
         input_h = self.get_textinput_height()
@@ -1082,13 +1452,11 @@ class OcrImportMixin:
             bg_color=self.colors["card"],
         )
 
-        live_total = len(getattr(self, "_ocr_entries", []) or [])
         total_all = int(getattr(self, "_ocr_total_all", 0) or 0)
         if total_all <= 0:
             total_all = live_total
             self._ocr_total_all = total_all
 
-        idx = int(getattr(self, "_ocr_index", 0) or 0)
         if live_total <= 0:
             self._ocr_review_active = False
             self._unbind_ocr_review_keys()
@@ -1104,7 +1472,14 @@ class OcrImportMixin:
         form = BoxLayout(orientation="vertical", size_hint_y=None, spacing=dp(12), padding=dp(4))
         form.bind(minimum_height=form.setter("height"))
 
-        form.add_widget(self.make_title_label(f"Review {current}/{total_all}", size_hint_y=None, height=dp(40)))
+        self._ocr_review_title = self.make_title_label(f"Review {current}/{total_all}", size_hint_y=None, height=dp(40))
+        form.add_widget(self._ocr_review_title)
+
+        self._ocr_batch_status_label = None
+        status_text = self._ocr_batch_status_text()
+        if status_text:
+            self._ocr_batch_status_label = self.make_text_label(status_text, size_hint_y=None, height=dp(26), halign="center")
+            form.add_widget(self._ocr_batch_status_label)
 
         form.add_widget(self.make_title_label("Fremdsprache", size_hint_y=None, height=dp(30)))
         self._ocr_in_foreign = self.style_textinput(
@@ -1169,48 +1544,89 @@ class OcrImportMixin:
         outer.add_widget(card)
         self.window.add_widget(outer)
 
-        Clock.schedule_once(lambda _dt: setattr(self._ocr_in_foreign, "focus", True), 0.05)
+        first_input = self._ocr_in_foreign
+        Clock.schedule_once(lambda _dt: setattr(first_input, "focus", True), 0.05)
+
+    def _ocr_render_waiting(self):
+        """End of the merged review while later pages are still running."""
+        self._ocr_in_foreign = self._ocr_in_own = self._ocr_in_third = None
+
+        self.window.clear_widgets()
+        pad_mul = float(self.config_data["settings"]["gui"]["padding_multiplicator"])
+
+        center = AnchorLayout(anchor_x="center", anchor_y="center", padding=40 * pad_mul)
+        card = RoundedCard(orientation="vertical", size_hint=(0.85, 0.5), padding=dp(16), spacing=dp(14), bg_color=self.colors["card"])
+
+        self._ocr_review_title = None
+        card.add_widget(self.make_title_label("Weitere Seiten werden erkannt …", size_hint_y=None, height=dp(40)))
+        card.add_widget(
+            self.make_text_label(
+                "Neue Vokabeln erscheinen hier, sobald die nächste Seite fertig ist.",
+                size_hint_y=None,
+                height=dp(60),
+                halign="center",
+            )
+        )
+        self._ocr_batch_status_label = self.make_text_label(
+            self._ocr_batch_status_text(), size_hint_y=None, height=dp(30), halign="center"
+        )
+        card.add_widget(self._ocr_batch_status_label)
+        card.add_widget(Widget())
+
+        row = BoxLayout(orientation="horizontal", size_hint_y=None, height=dp(50), spacing=dp(12))
+        back_btn = self.make_secondary_button("Zurück", size_hint=(0.5, 1))
+        back_btn.bind(on_press=self._ocr_prev)
+        done_btn = self.make_primary_button("Import abschließen", size_hint=(0.5, 1))
+        done_btn.bind(on_press=self._ocr_finish)
+        row.add_widget(back_btn)
+        row.add_widget(done_btn)
+        card.add_widget(row)
+
+        center.add_widget(card)
+        self.window.add_widget(center)
 
     def _ocr_store_current_edits(self):
         idx = int(getattr(self, "_ocr_index", 0) or 0)
         if not (0 <= idx < len(self._ocr_entries)):
             return
+        if getattr(self, "_ocr_in_foreign", None) is None or getattr(self, "_ocr_in_own", None) is None:
+            return
         e = self._ocr_entries[idx]
-        e["foreign_language"] = (getattr(self, "_ocr_in_foreign", None).text or "").strip()
-        e["own_language"] = (getattr(self, "_ocr_in_own", None).text or "").strip()
+        e["foreign_language"] = (self._ocr_in_foreign.text or "").strip()
+        e["own_language"] = (self._ocr_in_own.text or "").strip()
         if getattr(self, "_ocr_in_third", None) is not None:
             e["latin_language"] = (self._ocr_in_third.text or "").strip()
 
     def _ocr_prev(self, _instance=None):
         self._ocr_store_current_edits()
-        idx = int(getattr(self, "_ocr_index", 0) or 0)
+        idx = min(int(getattr(self, "_ocr_index", 0) or 0), len(self._ocr_entries))
         if idx <= 0:
             self._ocr_setup_screen()
             return
         self._ocr_index = idx - 1
         self._ocr_render_review()
 
+    def _ocr_next(self):
+        """Past the last entry: wait for pending pages, otherwise import."""
+        self._ocr_index = min(int(getattr(self, "_ocr_index", 0) or 0) + 1, len(self._ocr_entries))
+        if self._ocr_index >= len(self._ocr_entries) and not self._ocr_batch_pending():
+            self._ocr_finish()
+            return
+        self._ocr_render_review()
+
     def _ocr_skip(self, _instance=None):
         self._ocr_store_current_edits()
         idx = int(getattr(self, "_ocr_index", 0) or 0)
         if 0 <= idx < len(self._ocr_entries):
             self._ocr_entries[idx]["_keep"] = ""
-        self._ocr_index = idx + 1
-        if self._ocr_index >= len(self._ocr_entries):
-            self._ocr_finish()
-            return
-        self._ocr_render_review()
+        self._ocr_next()
 
     def _ocr_accept(self, _instance=None):
         self._ocr_store_current_edits()
         idx = int(getattr(self, "_ocr_index", 0) or 0)
         if 0 <= idx < len(self._ocr_entries):
             self._ocr_entries[idx]["_keep"] = "1"
-        self._ocr_index = idx + 1
-        if self._ocr_index >= len(self._ocr_entries):
-            self._ocr_finish()
-            return
-        self._ocr_render_review()
+        self._ocr_next()
 
     def _ocr_delete_current(self, _instance=None):
         """Remove the currently reviewed entry from the OCR result list."""
@@ -1225,18 +1641,22 @@ class OcrImportMixin:
         # >>> optional/sauber: wenn du löschst, Gesamtzahl anpassen
         self._ocr_total_all = len(getattr(self, "_ocr_entries", []) or [])
 
-        if not getattr(self, "_ocr_entries", None):
+        if not getattr(self, "_ocr_entries", None) and not self._ocr_batch_pending():
             self._ocr_review_active = False
             self._unbind_ocr_review_keys()
             self._ocr_setup_screen()
             return
 
-        if idx >= len(self._ocr_entries):
+        if idx >= len(self._ocr_entries) and not self._ocr_batch_pending():
             idx = len(self._ocr_entries) - 1
         self._ocr_index = max(0, idx)
         self._ocr_render_review()
 
     def _ocr_finish(self, _instance=None):
+        batch = getattr(self, "_ocr_batch", None)
+        failed_pages = batch.count(PAGE_FAILED) if batch is not None else 0
+        # "Import abschließen" with pages still running: those are dropped
+        self._ocr_cancel_batch()
         self._ocr_review_active = False
         self._unbind_ocr_review_keys()
         stack = getattr(self, "_ocr_stack", None)
@@ -1277,11 +1697,15 @@ class OcrImportMixin:
             )
             added += 1
 
-        save.save_to_vocab(vocab_list, self.vocab_root() + stack)
+        self.stack_repo.save(self.vocab_root() + stack, vocab_list)
 
         Popup(
             title="OCR Import",
-            content=self.make_text_label(f" Importiert: {added} Einträge", halign="center"),
+            content=self.make_text_label(
+                f" Importiert: {added} Einträge"
+                + (f"\n{failed_pages} Seite(n) konnten nicht gelesen werden." if failed_pages else ""),
+                halign="center",
+            ),
             size_hint=(0.7, None),
             height=dp(180),
         ).open()
@@ -1293,94 +1717,4 @@ class OcrImportMixin:
     # -------------------------
 
     def _clean_cell_text(self, s: str) -> str:
-        s = "" if s is None else str(s)
-        s = s.replace("\u00ad", "")
-        s = re.sub(r"\s+", " ", s).strip()
-        s = re.sub(r"^(?:\(?\d{1,3}\)?[.)]\s*|[A-Za-z][.)]\s*|[-•·]\s*)", "", s).strip()
-        if re.fullmatch(r"\d{1,4}", s or ""):
-            return ""
-        return s
-
-    def _row_is_noise(self, row: List[str]) -> bool:
-        cols = [(c or "").strip() for c in row]
-        if not any(cols):
-            return True
-        nonempty = [c for c in cols if c]
-        if len(nonempty) == 1:
-            c = nonempty[0]
-            if re.fullmatch(r"\d{1,4}", c):
-                return True
-            if len(c) == 1 and not c.isdigit():
-                return True
-            if c.lower() in ("unit", "lektion", "kapitel"):
-                return True
-        joined = " ".join(nonempty).lower()
-        if "©" in joined or "copyright" in joined or "www." in joined:
-            return True
-        return False
-
-    def _split_by_separators(self, s: str, *, n_cols: int) -> Optional[List[str]]:
-        s = (s or "").strip()
-        if not s:
-            return None
-        seps = [" | ", " - ", " – ", " — ", "\t"]
-        for sep in seps:
-            if sep.strip() and sep in s:
-                parts = [p.strip() for p in s.split(sep) if p.strip()]
-                if len(parts) >= n_cols:
-                    out = parts[:n_cols]
-                    out += [""] * (n_cols - len(out))
-                    return out
-        if re.search(r"\s{3,}", s):
-            parts = [p.strip() for p in re.split(r"\s{3,}", s) if p.strip()]
-            if len(parts) >= n_cols:
-                out = parts[:n_cols]
-                out += [""] * (n_cols - len(out))
-                return out
-        return None
-
-    def _kmeans_1d(self, values: List[float], *, k: int, iters: int = 18) -> Tuple[List[float], List[float]]:
-        vals = [float(v) for v in values if v is not None]
-        if not vals:
-            centers = [0.0] * k
-            bounds = [0.0] * max(0, k - 1)
-            return centers, bounds
-
-        vals.sort()
-        if len(vals) < k:
-            centers = (vals + [vals[-1]] * (k - len(vals)))[:k]
-            centers.sort()
-            bounds = [(centers[i] + centers[i + 1]) / 2.0 for i in range(k - 1)]
-            return centers, bounds
-
-        centers = []
-        for i in range(k):
-            pos = int(((i + 0.5) / k) * (len(vals) - 1))
-            centers.append(vals[pos])
-        centers.sort()
-
-        for _ in range(iters):
-            groups = [[] for _ in range(k)]
-            for v in vals:
-                best_i = 0
-                best_d = abs(v - centers[0])
-                for i in range(1, k):
-                    d = abs(v - centers[i])
-                    if d < best_d:
-                        best_d = d
-                        best_i = i
-                groups[best_i].append(v)
-
-            new_centers = []
-            for i in range(k):
-                g = groups[i]
-                new_centers.append(sum(g) / len(g) if g else centers[i])
-
-            if max(abs(new_centers[i] - centers[i]) for i in range(k)) < 1e-3:
-                centers = new_centers
-                break
-            centers = new_centers
-
-        centers.sort()
-        bounds = [(centers[i] + centers[i + 1]) / 2.0 for i in range(k - 1)]
-        return centers, bounds
\ No newline at end of file
+        return ocr_rows.clean_cell_text(s)
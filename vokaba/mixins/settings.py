@@ -15,6 +15,7 @@ import webbrowser
 import datetime
 from vokaba.core.dict_path import get_in, set_in, bool_cast
 from vokaba.core.logging_utils import log
+from vokaba.core.engine import modes as engine_modes
 from vokaba.ui.widgets.rounded import RoundedCard
 from vokaba.ui.widgets.slider import NoScrollSlider
 from vokaba.theme.theme_manager import apply_theme_from_config
@@ -464,38 +465,17 @@ class SettingsMixin:
         modes_cfg = get_in(self.config_data, ["settings", "modes"], {}) or {}
         total_vocab, unique_vocab = self._get_vocab_counts_for_modes()
 
-        available = []
-        if bool_cast(modes_cfg.get("front_back", True)):
-            available.append("front_back")
-        if bool_cast(modes_cfg.get("back_front", True)):
-            available.append("back_front")
-        if bool_cast(modes_cfg.get("letter_salad", True)):
-            available.append("letter_salad")
-        if bool_cast(modes_cfg.get("typing", True)):
-            available.append("typing")
-
-        if bool_cast(modes_cfg.get("multiple_choice", True)) and total_vocab >= 5:
-            available.append("multiple_choice")
-        if bool_cast(modes_cfg.get("connect_pairs", True)) and unique_vocab >= 5:
-            available.append("connect_pairs")
-        if bool_cast(modes_cfg.get("syllable_salad", True)) and total_vocab >= 3:
-            available.append("syllable_salad")
-
-        if not available:
-            available = ["front_back"]
+        available = engine_modes.available_modes(modes_cfg, total_vocab, unique_vocab)
 
         self.available_modes = available
 
     def _open_global_learn_language_popup(self):
         # verfügbare Sprachen aus Stack-Meta sammeln
         langs = set()
-        for f in self._list_stack_files():
-            try:
-                own, foreign, _latin, _latin_active = save.read_languages(f)
-                if own: langs.add(str(own).strip())
-                if foreign: langs.add(str(foreign).strip())
-            except Exception:
-                pass
+        for rec in save.list_stacks(self.vocab_root()):
+            own, foreign = rec.get("own_language"), rec.get("foreign_language")
+            if own: langs.add(str(own).strip())
+            if foreign: langs.add(str(foreign).strip())
         langs = sorted([l for l in langs if l])
 
         selected = set(get_in(self.config_data, ["settings", "global_learn_languages"], []) or [])
@@ -43,8 +43,8 @@ class StacksMixin:
 
         pad_mul = float(self.config_data["settings"]["gui"]["padding_multiplicator"])
         vocab_file = os.path.join(self.vocab_root(), stack)
-        data = save.load_vocab(vocab_file)
-        vocab_current = data[0] if isinstance(data, tuple) else data
+        # shared list: add/edit work on the same entries as learning
+        vocab_current = self.stack_repo.vocab(vocab_file)
 
         # Top-center: stack title
         top_center = AnchorLayout(anchor_x="center", anchor_y="top", padding=15 * pad_mul)
@@ -152,6 +152,9 @@ class StacksMixin:
     def delete_stack(self, stack: str, _instance=None):
         filename = os.path.abspath(os.path.join(self.vocab_root(), stack))
 
+        # buffered learning updates must not re-create the file after deletion
+        save.forget_stack_file(filename)
+
         try:
             os.remove(filename)
         except Exception as e:
@@ -159,17 +162,12 @@ class StacksMixin:
 
         # purge in-memory autosave caches so it can't be re-created on exit
         try:
-            if isinstance(getattr(self, "all_vocab_list", None), list) and isinstance(
-                    getattr(self, "entry_to_stack_file", None), dict):
-                ids_in_stack = {id(e) for e in self.all_vocab_list if self.entry_to_stack_file.get(id(e)) == filename}
+            handle = self.stack_repo.forget(filename)
+            if handle is not None and isinstance(getattr(self, "all_vocab_list", None), list):
+                ids_in_stack = {id(e) for e in handle.vocab}
                 self.all_vocab_list = [e for e in self.all_vocab_list if id(e) not in ids_in_stack]
-                for _id in ids_in_stack:
-                    self.entry_to_stack_file.pop(_id, None)
-
-            if isinstance(getattr(self, "stack_vocab_lists", None), dict):
-                self.stack_vocab_lists.pop(filename, None)
-            if isinstance(getattr(self, "stack_meta_map", None), dict):
-                self.stack_meta_map.pop(filename, None)
+            if isinstance(getattr(self, "_learn_stacks", None), list):
+                self._learn_stacks = [h for h in self._learn_stacks if h is not handle]
 
             # also invalidate daily pool cache if it referenced this stack
             if getattr(self, "_daily_pool_stack_key", None) == filename:
@@ -194,8 +192,9 @@ class StacksMixin:
                 return
             src = src_raw
 
-            # Backup
+            # Backup (including buffered learning updates)
             try:
+                save.settle_stack_file(target)
                 if os.path.exists(target):
                     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                     shutil.copy2(target, target + f".backup_{ts}")
@@ -325,6 +324,9 @@ class StacksMixin:
         if not src or not dest:
             return False
 
+        # the copy below must see buffered learning updates + the progress journal
+        save.settle_stack_file(src)
+
         # Default / current behavior
         if include_progress:
             try:
@@ -335,51 +337,28 @@ class StacksMixin:
                 return False
 
         # "No progress" export: sanitize only the exported file
-        try:
-            vocab_list, own, foreign, latin, latin_active = save.load_vocab(src)
-        except Exception as e:
-            log(f"export load_vocab failed (fallback to copy): {e}")
-            try:
-                shutil.copy2(src, dest)
-                return True
-            except Exception:
-                return False
-
         today = datetime.now().date().isoformat()
 
-        cleaned = []
-        for entry in (vocab_list or []):
-            if not isinstance(entry, dict):
-                continue
-
-            row = dict(entry)  # do NOT mutate app data
-
+        # entry is a streamed copy (save.transform_vocab), not the app's loaded entry
+        def reset(entry):
             # Lernlevel / Fortschritt resetten (nur im Export)
-            row["knowledge_level"] = 0.0
-            row["srs_streak"] = 0
+            entry["knowledge_level"] = 0.0
+            entry["srs_streak"] = 0
 
             # Alle Datumswerte auf "heute"
-            row["srs_last_seen"] = today
-            row["srs_due"] = today
-            row["daily_goal_anchor_date"] = today
+            entry["srs_last_seen"] = today
+            entry["srs_due"] = today
+            entry["daily_goal_anchor_date"] = today
 
             # Optional: Anker resetten (steht im CSV-Schema)
-            row["daily_goal_anchor"] = 0
-
-            cleaned.append(row)
+            entry["daily_goal_anchor"] = 0
+            return entry
 
         try:
-            save.save_to_vocab(
-                cleaned,
-                dest,
-                own_lang=own or "Deutsch",
-                foreign_lang=foreign or "Englisch",
-                latin_lang=latin or "Latein",
-                latin_active=bool(latin_active),
-            )
+            save.transform_vocab(src, dest, reset)
             return True
         except Exception as e:
-            log(f"export save_to_vocab failed (fallback to copy): {e}")
+            log(f"export transform_vocab failed (fallback to copy): {e}")
             try:
                 shutil.copy2(src, dest)
                 return True
@@ -392,55 +371,22 @@ class StacksMixin:
           - knowledge_level = 0
           - SRS Felder/Anker auf "heute"
         """
-        data = save.load_vocab(src_path)
-
-        vocab_list = []
-        own = "Deutsch"
-        foreign = "Englisch"
-        latin = "Latein"
-        latin_active = False
-
-        if isinstance(data, tuple):
-            if len(data) == 5:
-                vocab_list, own, foreign, latin, latin_active = data
-            elif len(data) == 4:
-                vocab_list, own, foreign, latin = data
-            elif len(data) == 3:
-                vocab_list, own, foreign = data
-            elif len(data) >= 1:
-                vocab_list = data[0]
-        elif isinstance(data, dict):
-            vocab_list = data.get("vocab_list", data.get("vocab", [])) or []
-            own = data.get("own_language", own) or own
-            foreign = data.get("foreign_language", foreign) or foreign
-            latin = data.get("latin_language", latin) or latin
-            latin_active = bool(data.get("latin_active", latin_active))
-        else:
-            vocab_list = data or []
-
         now = datetime.now()
         today_iso = now.date().isoformat()
         now_iso = now.isoformat()
         due_iso = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
 
-        for e in vocab_list:
-            if not isinstance(e, dict):
-                continue
+        def reset(e):
             e["knowledge_level"] = 0.0
             e["srs_streak"] = 0
             e["srs_last_seen"] = now_iso
             e["srs_due"] = due_iso
             e["daily_goal_anchor"] = 0
             e["daily_goal_anchor_date"] = today_iso
+            return e
 
-        save.save_to_vocab(
-            vocab=vocab_list,
-            filename=dst_path,
-            own_lang=own or "Deutsch",
-            foreign_lang=foreign or "Englisch",
-            latin_lang=latin or "Latein",
-            latin_active=bool(latin_active),
-        )
+        # streamed row by row: the export never holds the whole stack
+        save.transform_vocab(src_path, dst_path, reset)
 
     def export_stack_dialog(self, stack: str, _instance=None):
         """
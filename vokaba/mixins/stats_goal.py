@@ -1,9 +1,8 @@
-import os
-from datetime import datetime
 import save
 import labels
 from vokaba.core.logging_utils import log
 from vokaba.core.paths import vocab_root_string
+from vokaba.core import stack_index
 
 
 class StatsGoalMixin:
@@ -18,17 +17,15 @@ class StatsGoalMixin:
 
 
     def _list_stack_files(self):
-        root = self.vocab_root()
-        for name in os.listdir(root):
-            full = os.path.join(root, name)
-            if os.path.isfile(full) and name.lower().endswith(".csv"):
-                yield full
+        for rec in save.list_stacks(self.vocab_root()):
+            yield rec["path"]
 
     def _compute_overall_stats(self) -> dict:
         """
         Compute global stats over all stacks.
         Returns:
-          stacks, total_vocab, unique_pairs, learned_vocab, avg_knowledge
+          stacks, total_vocab, unique_pairs, learned_vocab, avg_knowledge,
+          due_vocab, next_due (ISO date or None)
         """
         stats = {
             "stacks": 0,
@@ -36,36 +33,32 @@ class StatsGoalMixin:
             "unique_pairs": 0,
             "learned_vocab": 0,
             "avg_knowledge": 0.0,
+            "due_vocab": 0,
+            "next_due": None,
         }
 
         unique_pairs = set()
         total_knowledge = 0.0
         total_entries = 0
 
+        # per-stack summaries (see save.stack_summary): no full stack loads here
         for filename in self._list_stack_files():
             stats["stacks"] += 1
-            data = save.load_vocab(filename)
-            vocab_list = data[0] if isinstance(data, tuple) else data
+            summary = save.stack_summary(filename)
 
-            stats["total_vocab"] += len(vocab_list)
+            count = int(summary.get("count", 0) or 0)
+            knowledge, learned = stack_index.knowledge_stats(summary, base_date=save.knowledge_decay_base_date())
+            stats["total_vocab"] += count
+            stats["learned_vocab"] += learned
+            unique_pairs.update(save.stack_pairs(filename))
 
-            for e in vocab_list:
-                own = (e.get("own_language") or "").strip()
-                foreign = (e.get("foreign_language") or "").strip()
-                if own or foreign:
-                    unique_pairs.add((own, foreign))
+            stats["due_vocab"] += stack_index.due_count(summary)
+            nxt = stack_index.next_due(summary)
+            if nxt and (stats["next_due"] is None or nxt < stats["next_due"]):
+                stats["next_due"] = nxt
 
-                try:
-                    level = float(e.get("knowledge_level", 0.0) or 0.0)
-                except Exception:
-                    level = 0.0
-                level = max(0.0, min(1.0, level))
-
-                total_knowledge += level
-                total_entries += 1
-
-                if level >= 0.7:
-                    stats["learned_vocab"] += 1
+            total_knowledge += knowledge
+            total_entries += count
 
         stats["unique_pairs"] = len(unique_pairs)
         stats["avg_knowledge"] = (total_knowledge / total_entries) if total_entries else 0.0
@@ -82,108 +75,65 @@ class StatsGoalMixin:
 
         for filename in self._list_stack_files():
             try:
-                data = save.load_vocab(filename)
-                vocab_list = data[0] if isinstance(data, tuple) else data
+                summary = save.stack_summary(filename)
+                # pairs as stored (not stripped, empty ones count), like before the summaries
+                pairs = save.stack_pairs(filename, raw=True)
             except Exception:
                 continue
 
-            total += len(vocab_list)
-            for e in vocab_list:
-                key = ((e.get("own_language") or ""), (e.get("foreign_language") or ""))
-                unique.add(key)
+            total += int(summary.get("count", 0) or 0)
+            unique.update(pairs)
 
         return total, len(unique)
 
     # ---------------------------
-    # Daily goal (config-backed)
+    # Daily goal (settings in config, counter in save.learning_stats())
     # ---------------------------
 
     def _init_daily_goal_defaults(self):
         """
-        Ensure daily goal exists; reset daily progress if day changed.
-        Also applies daily knowledge decay once per day.
+        Ensure the daily goal settings exist. Writes config.yml only if a
+        default was missing. The daily counter resets by itself on a new day
+        and knowledge decay is lazy (see save.load_vocab), so nothing else
+        to do here.
         """
         cfg = self.config_data
         settings = cfg.setdefault("settings", {})
         stats_cfg = cfg.setdefault("stats", {})
+        changed = False
 
         # Default daily goal = 50 (one-time migration if old default 300)
         if "daily_target_cards" not in settings:
             settings["daily_target_cards"] = 50
+            changed = True
         else:
             try:
                 migrated = bool(stats_cfg.get("migrated_daily_goal_50", False))
                 if (not migrated) and int(settings.get("daily_target_cards", 0) or 0) == 300:
                     settings["daily_target_cards"] = 50
                     stats_cfg["migrated_daily_goal_50"] = True
+                    changed = True
             except Exception:
                 pass
 
-        settings.setdefault("daily_goal_step", 0.10)
+        if "daily_goal_step" not in settings:
+            settings["daily_goal_step"] = 0.10
+            changed = True
 
-        today = datetime.now().date()
-        today_iso = today.isoformat()
+        save.configure_knowledge_decay_from_settings(cfg)
 
-        # ----- daily decay -----
-        last_decay_iso = stats_cfg.get("knowledge_decay_date")
-        if last_decay_iso and last_decay_iso != today_iso:
-            try:
-                last_d = datetime.fromisoformat(str(last_decay_iso)).date()
-                days = max(1, (today - last_d).days)
-            except Exception:
-                days = 1
-
-            decay = 0.005 * days
-
-            for filename in self._list_stack_files():
-                try:
-                    vocab_list, own, foreign, latin, latin_active = save.load_vocab(filename)
-                except Exception:
-                    continue
-
-                changed = False
-                for e in vocab_list:
-                    try:
-                        lvl = float(e.get("knowledge_level", 0.0) or 0.0)
-                    except Exception:
-                        lvl = 0.0
-                    new_lvl = max(0.0, min(1.0, lvl - decay))
-                    if new_lvl != lvl:
-                        e["knowledge_level"] = new_lvl
-                        changed = True
-
-                if changed:
-                    try:
-                        save.save_to_vocab(
-                            vocab_list,
-                            filename,
-                            own_lang=own or "Deutsch",
-                            foreign_lang=foreign or "Englisch",
-                            latin_lang=latin or "Latein",
-                            latin_active=bool(latin_active),
-                        )
-                    except Exception:
-                        pass
-
-            stats_cfg["knowledge_decay_date"] = today_iso
-
-        elif not last_decay_iso:
-            stats_cfg["knowledge_decay_date"] = today_iso
-
-        # ----- daily progress reset -----
-        if stats_cfg.get("daily_progress_date") != today_iso:
-            stats_cfg["daily_progress_date"] = today_iso
-            stats_cfg["daily_cards_done"] = 0
-
-        save.save_settings(cfg)
+        if changed:
+            save.save_settings(cfg)
 
 
     def _get_daily_progress_values(self) -> tuple[int, int]:
-        self._init_daily_goal_defaults()
-        stats_cfg = self.config_data.get("stats", {}) or {}
+        """(done today, target); no I/O."""
         settings = self.config_data.get("settings", {}) or {}
-        done = int(stats_cfg.get("daily_cards_done", 0) or 0)
-        target = int(settings.get("daily_target_cards", 1) or 1)
+        done = save.learning_stats().daily_cards_done()
+        try:
+            target = int(settings.get("daily_target_cards", 1) or 1)
+        except Exception:
+            target = 1
         if target <= 0:
             target = 1
         return done, target
@@ -193,21 +143,16 @@ class StatsGoalMixin:
         Increase daily done counter (used only when you decide something counts
         as a "completed" card for daily goal).
         """
-        self._init_daily_goal_defaults()
         try:
             steps = int(steps)
         except Exception:
             steps = 1
         steps = max(1, steps)
 
-        stats_cfg = self.config_data.setdefault("stats", {})
-        today = datetime.now().date().isoformat()
-        if stats_cfg.get("daily_progress_date") != today:
-            stats_cfg["daily_progress_date"] = today
-            stats_cfg["daily_cards_done"] = 0
-
-        stats_cfg["daily_cards_done"] = int(stats_cfg.get("daily_cards_done", 0) or 0) + steps
-        save.save_settings(self.config_data)
+        try:
+            save.learning_stats().add_daily_cards(steps)
+        except Exception as e:
+            log(f"daily progress update failed: {e}")
 
         # Refresh UI if present
         try:
@@ -0,0 +1,272 @@
+# vokaba/ocr_batch.py
+"""
+Batch OCR: several pages through a bounded worker pool.
+
+Each page is handed to recognize(image, job) on one of `workers` threads
+(desktop: one warm runner process per worker, see OcrServerPool). Finished
+pages are released in page order, so the merged review always shows page 1
+before page 2 no matter which one the pool finished first:
+
+    batch = OcrBatch(paths, recognize, workers=2, on_page=..., on_done=...)
+    batch.start()
+    ...
+    batch.cancel_page(3)   # skip one page (queued or running)
+    batch.cancel()         # stop the whole batch, no more callbacks
+
+The job (PageJob) is how recognize() reports its stage (preparing / loading
+model / recognizing / parsing, shown on the loading screen) and how far
+recognizing is (job.progress(done, total)), and learns about a cancel:
+job.on_cancel(fn) registers what stops the work, e.g. killing the runner
+that is busy with the page.
+
+on_page(index, state, result, error) and on_done() are called from the
+worker threads; the UI schedules them onto its own thread. No Kivy in here.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from vokaba.core.logging_utils import log
+
+PAGE_QUEUED = "queued"
+PAGE_RUNNING = "running"  # picked up, waiting for a runner
+PAGE_PREPARING = "preparing"  # downscale / rotate (vokaba/ocr_preprocess.py)
+PAGE_LOADING = "loading"  # runner start / model load
+PAGE_RECOGNIZING = "recognizing"
+PAGE_PARSING = "parsing"
+PAGE_DONE = "done"
+PAGE_FAILED = "failed"
+PAGE_CANCELLED = "cancelled"
+
+STAGES = (PAGE_PREPARING, PAGE_LOADING, PAGE_RECOGNIZING, PAGE_PARSING)
+_ACTIVE = (PAGE_RUNNING,) + STAGES
+_PENDING = (PAGE_QUEUED,) + _ACTIVE
+
+# rough share of a page's time spent before each state (loading screen progress bar)
+STAGE_PROGRESS = {
+    PAGE_QUEUED: 0.0,
+    PAGE_RUNNING: 0.02,
+    PAGE_PREPARING: 0.05,
+    PAGE_LOADING: 0.15,
+    PAGE_RECOGNIZING: 0.45,
+    PAGE_PARSING: 0.9,
+    PAGE_DONE: 1.0,
+    PAGE_FAILED: 1.0,
+    PAGE_CANCELLED: 1.0,
+}
+
+
+def _page_progress(state: str, fraction: float) -> float:
+    base = STAGE_PROGRESS.get(state, 0.0)
+    if state == PAGE_RECOGNIZING:
+        return base + fraction * (STAGE_PROGRESS[PAGE_PARSING] - base)
+    return base
+
+
+class PageJob:
+    """Handle for one page, passed to recognize()."""
+
+    def __init__(self, batch: "OcrBatch", index: int):
+        self._batch = batch
+        self.index = index
+
+    @property
+    def cancelled(self) -> bool:
+        return self._batch.states[self.index] == PAGE_CANCELLED or self._batch.cancelled
+
+    def stage(self, stage: str) -> None:
+        """Report progress (one of STAGES); ignored once the page is finished or cancelled."""
+        if stage not in STAGES:
+            return
+        with self._batch._lock:
+            if self._batch.states[self.index] in _ACTIVE:
+                self._batch.states[self.index] = stage
+
+    def progress(self, done: int, total: int) -> None:
+        """How far the recognizing stage is (e.g. bands of a tiled page); moves the progress bar within it."""
+        if total <= 0:
+            return
+        with self._batch._lock:
+            if self._batch.states[self.index] in _ACTIVE:
+                self._batch.fractions[self.index] = max(0.0, min(1.0, done / float(total)))
+
+    def on_cancel(self, fn: Callable[[], None]) -> None:
+        """Call fn when the page gets cancelled (right away if it already is)."""
+        with self._batch._lock:
+            if not self.cancelled:
+                self._batch._cancel_hooks.setdefault(self.index, []).append(fn)
+                return
+        fn()
+
+    def clear_cancel(self) -> None:
+        with self._batch._lock:
+            self._batch._cancel_hooks.pop(self.index, None)
+
+
+class OcrBatch:
+    def __init__(
+        self,
+        images: Sequence[str],
+        recognize: Callable[[str, PageJob], Any],
+        *,
+        workers: int = 1,
+        on_page: Optional[Callable[[int, str, Any, Optional[BaseException]], None]] = None,
+        on_done: Optional[Callable[[], None]] = None,
+    ):
+        self.images = [str(p) for p in images]
+        self.workers = max(1, min(int(workers or 1), max(1, len(self.images))))
+        self.states: List[str] = [PAGE_QUEUED] * len(self.images)
+        self.results: List[Any] = [None] * len(self.images)
+        self.errors: List[Optional[BaseException]] = [None] * len(self.images)
+        # share of the recognizing stage that is done (PageJob.progress)
+        self.fractions: List[float] = [0.0] * len(self.images)
+        self.cancelled = False
+
+        self._recognize = recognize
+        self._on_page = on_page
+        self._on_done = on_done
+        self._lock = threading.Lock()
+        # serializes the callbacks so pages come out in order and on_done once
+        self._emit_lock = threading.Lock()
+        self._released = 0
+        self._done_sent = False
+        self._futures = []
+        self._cancel_hooks: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    # -------------------------
+    # Control
+    # -------------------------
+
+    def start(self) -> None:
+        if not self.images:
+            self._release()
+            return
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr-batch")
+        self._futures = [pool.submit(self._run, i) for i in range(len(self.images))]
+        # worker threads exit once the queue is drained
+        pool.shutdown(wait=False)
+
+    def cancel_page(self, index: int) -> None:
+        """Skip one page; a page that is being recognized is stopped through its on_cancel hooks."""
+        hooks = []
+        with self._lock:
+            if 0 <= index < len(self.states) and self.states[index] in _PENDING:
+                self.states[index] = PAGE_CANCELLED
+                hooks = self._cancel_hooks.pop(index, [])
+        self._run_hooks(hooks)
+        self._release()
+
+    def cancel(self) -> None:
+        """Stop the batch: queued pages are dropped, running ones stopped, no callbacks from here on."""
+        hooks = []
+        with self._lock:
+            self.cancelled = True
+            for i, state in enumerate(self.states):
+                if state in _PENDING:
+                    self.states[i] = PAGE_CANCELLED
+            for fns in self._cancel_hooks.values():
+                hooks.extend(fns)
+            self._cancel_hooks.clear()
+        for f in self._futures:
+            f.cancel()
+        self._run_hooks(hooks)
+
+    @staticmethod
+    def _run_hooks(hooks) -> None:
+        for fn in hooks:
+            try:
+                fn()
+            except Exception as e:
+                log(f"ocr batch: cancel hook failed: {e}")
+
+    # -------------------------
+    # Progress
+    # -------------------------
+
+    def progress(self) -> float:
+        """0..1 over all pages, running pages counted by their stage (and how far recognizing is)."""
+        with self._lock:
+            pages = list(zip(self.states, self.fractions))
+        if not pages:
+            return 1.0
+        return sum(_page_progress(s, f) for s, f in pages) / len(pages)
+
+    def page_progress(self, index: int) -> float:
+        with self._lock:
+            return _page_progress(self.states[index], self.fractions[index])
+
+    def pending(self) -> bool:
+        with self._lock:
+            return not self.cancelled and any(s in _PENDING for s in self.states)
+
+    def count(self, state: str) -> int:
+        with self._lock:
+            return sum(1 for s in self.states if s == state)
+
+    def finished(self) -> int:
+        """Pages that are no longer queued or running (done, failed or skipped)."""
+        with self._lock:
+            return sum(1 for s in self.states if s not in _PENDING)
+
+    # -------------------------
+    # Workers
+    # -------------------------
+
+    def _run(self, index: int) -> None:
+        with self._lock:
+            if self.cancelled or self.states[index] != PAGE_QUEUED:
+                return
+            self.states[index] = PAGE_RUNNING
+
+        job = PageJob(self, index)
+        result, error = None, None
+        try:
+            result = self._recognize(self.images[index], job)
+        except Exception as e:
+            error = e
+        finally:
+            job.clear_cancel()
+
+        with self._lock:
+            # a cancel may have been faster; then the result (or the error the kill caused) is dropped
+            if self.states[index] in _ACTIVE:
+                self.states[index] = PAGE_DONE if error is None else PAGE_FAILED
+                self.results[index] = result
+                self.errors[index] = error
+                if error is not None:
+                    log(f"ocr batch: page {index + 1} failed: {error}")
+        self._release()
+
+    def _release(self) -> None:
+        """Emit every finished page at the head of the batch, then on_done once."""
+        with self._emit_lock:
+            while True:
+                with self._lock:
+                    if self.cancelled:
+                        return
+                    index = self._released
+                    if index >= len(self.states):
+                        break
+                    state = self.states[index]
+                    if state in _PENDING:
+                        return
+                    self._released += 1
+                    result, error = self.results[index], self.errors[index]
+                if self._on_page is not None:
+                    try:
+                        self._on_page(index, state, result, error)
+                    except Exception as e:
+                        log(f"ocr batch: on_page failed: {e}")
+
+            if not self._done_sent:
+                self._done_sent = True
+                if self._on_done is not None:
+                    try:
+                        self._on_done()
+                    except Exception as e:
+                        log(f"ocr batch: on_done failed: {e}")
@@ -0,0 +1,173 @@
+# vokaba/ocr_cache.py
+"""
+Content-addressed cache for OCR results (the JSON pages that the runner or
+ML Kit return, before any row/column parsing).
+
+The key is a SHA-256 over the image bytes plus the request parameters (OCR
+language, engine/model version, options). Picking the same photo again, e.g.
+after changing the column count or mapping, skips the inference; only the
+cheap parsing runs again. A new engine version simply misses.
+
+    cache = OcrResultCache(data_dir() / "ocr_cache" / "results", max_bytes=64 << 20)
+    key = cache.key(image_path, lang="german", engine="paddleocr-3.1.0")
+    pages = cache.get(key)
+    if pages is None:
+        pages = run_ocr(image_path)
+        cache.put(key, pages)
+
+One JSON file per result. A hit bumps the file's mtime; when the folder
+grows beyond max_bytes the least recently used results are deleted. Cache
+problems are logged and treated as a miss, never as an OCR failure.
+
+The hash of the file itself is remembered per (path, size, mtime), so the
+pages of one PDF (key(pdf, page=3, ...)) read the document only once.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional
+
+from vokaba.core.logging_utils import log
+
+CACHE_VERSION = 1
+_CHUNK = 1 << 20
+# file hashes remembered (key(), e.g. every page of a PDF)
+_DIGEST_MEMO = 16
+
+
+class OcrResultCache:
+    def __init__(self, root, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._digests: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    def key(self, image: str, **params) -> Optional[str]:
+        """Hex key for image + params; None if the image can't be read."""
+        h = self._file_hash(image)
+        if h is None:
+            return None
+        h.update(f"\0v{CACHE_VERSION}".encode("ascii"))
+        for name in sorted(params):
+            h.update(f"\0{name}={params[name]}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _file_hash(self, image: str):
+        """sha256 state after the file's bytes (a copy; the memo keeps the original)."""
+        try:
+            st = os.stat(image)
+            memo_key = (os.path.abspath(image), st.st_size, st.st_mtime_ns)
+        except OSError as e:
+            log(f"ocr cache: cannot hash {image!r}: {e}")
+            return None
+        with self._lock:
+            h = self._digests.get(memo_key)
+            if h is not None:
+                self._digests.move_to_end(memo_key)
+                return h.copy()
+
+        h = hashlib.sha256()
+        try:
+            with open(image, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK), b""):
+                    h.update(chunk)
+        except OSError as e:
+            log(f"ocr cache: cannot hash {image!r}: {e}")
+            return None
+        with self._lock:
+            self._digests[memo_key] = h
+            while len(self._digests) > _DIGEST_MEMO:
+                self._digests.popitem(last=False)
+        return h.copy()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: Optional[str]) -> Optional[List[Any]]:
+        if not key or self.max_bytes <= 0:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                pages = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log(f"ocr cache: dropping unreadable entry {path.name}: {e}")
+            self._unlink(path)
+            return None
+        if not isinstance(pages, list):
+            self._unlink(path)
+            return None
+        try:
+            os.utime(path)  # LRU: mtime = last use
+        except OSError:
+            pass
+        return pages
+
+    def put(self, key: Optional[str], pages: List[Any]) -> None:
+        if not key or self.max_bytes <= 0:
+            return
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(pages, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as e:
+            log(f"ocr cache: write failed: {e}")
+            self._unlink(tmp)
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used results until the folder fits max_bytes. Returns the number deleted."""
+        with self._lock:
+            files = []
+            total = 0
+            try:
+                with os.scandir(self.root) as it:
+                    for entry in it:
+                        if not entry.name.endswith(".json"):
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        files.append((st.st_mtime_ns, st.st_size, entry.path))
+                        total += st.st_size
+            except OSError:
+                return 0
+
+            removed = 0
+            files.sort()
+            for _mtime, size, p in files:
+                if total <= self.max_bytes:
+                    break
+                if self._unlink(Path(p)):
+                    total -= size
+                    removed += 1
+            return removed
+
+    def clear(self) -> None:
+        try:
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    if entry.name.endswith((".json", ".tmp")):
+                        self._unlink(Path(entry.path))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _unlink(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,562 @@
+# vokaba/ocr_client.py
+"""
+Client for a long-running "ocr_runner --serve" process (desktop OCR).
+
+The runner is started on the first request and then reused, so PaddleOCR
+is imported and its models are built once instead of once per image (see
+the protocol notes in vokaba/ocr_runner.py). If the process dies it is
+started again on the next request; close() shuts it down (app on_stop).
+
+    server = OcrServer(candidate_cmds, env=env, cwd=root)
+    pages = server.ocr(image_path, lang="german")   # PaddleOCR JSON pages
+    server.close()
+
+The runner streams its result line by line; ocr(on_line=..., on_progress=...)
+hands the lines and the page progress over while the request is still
+running, the returned page is assembled from the same lines.
+
+OcrServerPool holds up to `size` such runners for batch imports; each
+worker leases one, so pages are recognized in parallel without two
+requests sharing a process:
+
+    pool = OcrServerPool(candidate_cmds, size=2, env=env, cwd=root)
+    with pool.lease() as server:
+        pages = server.ocr(image_path, lang="german")
+
+tune() picks the number of runners and the inference threads of each
+from the core count (settings.ocr.batch_workers / threads, 0 = auto).
+
+Each runner gets its own process group (PaddleOCR may start helper
+processes). A timeout, abort() (the user cancelled the page) or close()
+terminates the whole group and kills it if it doesn't exit.
+
+No Kivy in here; the OCR import mixin owns one pool per app.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from vokaba import ocr_pdf, ocr_tiles
+from vokaba.core.logging_utils import log
+from vokaba.ocr_runner import (  # codes of failed replies, re-exported for the app
+    ERR_BAD_REQUEST,
+    ERR_FILE_NOT_FOUND,
+    ERR_MISSING_DEPENDENCY,
+    ERR_OCR_FAILED,
+    ERR_OUT_OF_MEMORY,
+    ERR_UNSUPPORTED_LANG,
+)
+
+__all__ = [
+    "OcrServer",
+    "OcrServerPool",
+    "OcrServerError",
+    "tune",
+    "START_TIMEOUT_SEC",
+    "REQUEST_TIMEOUT_SEC",
+    "KILL_GRACE_SEC",
+    "ERR_TIMEOUT",
+    "ERR_CANCELLED",
+    "ERR_RUNNER_EXITED",
+    "ERR_START_FAILED",
+    "ERR_BAD_REQUEST",
+    "ERR_FILE_NOT_FOUND",
+    "ERR_MISSING_DEPENDENCY",
+    "ERR_OCR_FAILED",
+    "ERR_OUT_OF_MEMORY",
+    "ERR_UNSUPPORTED_LANG",
+]
+
+START_TIMEOUT_SEC = 180.0
+REQUEST_TIMEOUT_SEC = 180.0
+# SIGTERM -> SIGKILL
+KILL_GRACE_SEC = 2.0
+# auto tuning (tune()): every runner holds its own models, so not too many of them
+MAX_AUTO_WORKERS = 4
+CORES_PER_AUTO_WORKER = 4
+MAX_AUTO_THREADS = 8
+
+# failures on this side of the pipe (OcrServerError.code)
+ERR_TIMEOUT = "timeout"
+ERR_CANCELLED = "cancelled"
+ERR_RUNNER_EXITED = "runner_exited"
+ERR_START_FAILED = "start_failed"
+
+
+class OcrServerError(RuntimeError):
+    """
+    OCR request failed. str(e) is the runner's message (or "timeout" /
+    "cancelled"), e.code says what went wrong: one of the runner's ERR_*
+    codes or ERR_TIMEOUT / ERR_CANCELLED / ERR_RUNNER_EXITED / ERR_START_FAILED.
+    """
+
+    def __init__(self, message: str = "", code: str = ERR_OCR_FAILED):
+        super().__init__(message)
+        self.code = code
+
+
+def tune(workers: int = 0, threads: int = 0, cpu_count: Optional[int] = None) -> Tuple[int, int]:
+    """
+    (runners, inference threads per runner) for this machine; 0 means auto.
+    Auto: one runner per CORES_PER_AUTO_WORKER cores (up to MAX_AUTO_WORKERS),
+    the cores split evenly between them. Explicit values are capped by the
+    core count.
+    """
+    cpus = max(1, int(cpu_count or os.cpu_count() or 1))
+    workers = int(workers or 0)
+    threads = int(threads or 0)
+    if workers > 0:
+        workers = min(workers, cpus)
+    else:
+        workers = max(1, min(MAX_AUTO_WORKERS, cpus // CORES_PER_AUTO_WORKER))
+    if threads > 0:
+        threads = min(threads, cpus)
+    else:
+        threads = max(1, min(MAX_AUTO_THREADS, cpus // workers))
+    return workers, threads
+
+
+def _new_group_kwargs() -> Dict:
+    """Popen kwargs that put the child into a process group of its own."""
+    if os.name == "nt":
+        return {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+    return {"start_new_session": True}
+
+
+class _Process:
+    """One runner process plus reader threads for stdout (protocol) and stderr (log tail)."""
+
+    def __init__(self, cmd: List[str], env: Optional[Dict], cwd: Optional[str]):
+        self.cmd = cmd
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            cwd=cwd,
+            env=env,
+            **_new_group_kwargs(),
+        )
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.stderr_tail: deque = deque(maxlen=40)
+        threading.Thread(target=self._pump_stdout, daemon=True).start()
+        self._stderr_thread = threading.Thread(target=self._pump_stderr, daemon=True)
+        self._stderr_thread.start()
+
+    def _pump_stdout(self) -> None:
+        try:
+            for line in self.proc.stdout:
+                self.lines.put(line)
+        except Exception:
+            pass
+        self.lines.put(None)  # EOF
+
+    def _pump_stderr(self) -> None:
+        try:
+            for line in self.proc.stderr:
+                self.stderr_tail.append(line.rstrip("\n"))
+        except Exception:
+            pass
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def stderr_text(self) -> str:
+        if not self.alive():
+            # let the reader catch up with what the process wrote before exiting
+            self._stderr_thread.join(timeout=1.0)
+        return "\n".join(self.stderr_tail).strip()
+
+    def send(self, obj: Dict) -> None:
+        self.proc.stdin.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self.proc.stdin.flush()
+
+    def receive(self, timeout: float) -> Optional[Dict]:
+        """Next protocol message; None on EOF. Raises queue.Empty on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            line = self.lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            if line is None:
+                return None
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                # stray output that still made it to stdout
+                continue
+            if isinstance(msg, dict):
+                return msg
+
+    def kill(self, grace: float = KILL_GRACE_SEC) -> None:
+        """Terminate the runner's process group, SIGKILL whatever is left after grace seconds."""
+        if os.name == "nt":
+            if self.alive():
+                try:
+                    # /T: the whole tree
+                    subprocess.run(
+                        ["taskkill", "/F", "/T", "/PID", str(self.proc.pid)],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        timeout=10,
+                    )
+                except Exception:
+                    pass
+        elif self.proc.returncode is None:
+            # Until the leader is reaped its pgid can't be reused, so the
+            # group is signalled first and the leader only waited for after.
+            self._signal_group(signal.SIGTERM)
+            self._await_exit_unreaped(grace)
+            # helpers may outlive the leader
+            if self.proc.returncode is None:
+                self._signal_group(signal.SIGKILL)
+        try:
+            self.proc.kill()
+        except Exception:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    def _await_exit_unreaped(self, timeout: float) -> None:
+        """Wait up to timeout for the leader to exit, leaving it a zombie (not reaped)."""
+        deadline = time.monotonic() + timeout
+        waitid = getattr(os, "waitid", None)  # not on macOS
+        while time.monotonic() < deadline:
+            if waitid is not None:
+                try:
+                    if waitid(os.P_PID, self.proc.pid, os.WEXITED | os.WNOWAIT | os.WNOHANG) is not None:
+                        return
+                except ChildProcessError:
+                    return
+                except OSError:
+                    waitid = None
+            time.sleep(0.05)
+
+    def _signal_group(self, sig) -> None:
+        try:
+            os.killpg(self.proc.pid, sig)  # start_new_session: pgid == pid
+        except (ProcessLookupError, PermissionError):
+            pass
+        except OSError:
+            pass
+
+
+class OcrServer:
+    def __init__(
+        self,
+        candidate_cmds: Sequence[List[str]],
+        *,
+        env: Optional[Dict] = None,
+        cwd: Optional[str] = None,
+        start_timeout: float = START_TIMEOUT_SEC,
+    ):
+        self.candidate_cmds = [list(c) for c in candidate_cmds]
+        self.env = env
+        self.cwd = cwd
+        self.start_timeout = float(start_timeout)
+
+        self._lock = threading.RLock()
+        self._proc: Optional[_Process] = None
+        self._next_id = 0
+        self.starts = 0
+
+        # the process a request is waiting on right now (what abort() kills)
+        self._busy_lock = threading.Lock()
+        self._busy: Optional[_Process] = None
+
+    # -------------------------
+    # Process lifecycle
+    # -------------------------
+
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.alive()
+
+    def _set_busy(self, proc: Optional[_Process]) -> None:
+        with self._busy_lock:
+            self._busy = proc
+
+    def abort(self) -> None:
+        """Kill the runner a request is waiting on; that ocr() call raises "cancelled". No-op when idle."""
+        with self._busy_lock:
+            proc = self._busy
+        if proc is not None:
+            log("ocr server: request cancelled, stopping runner")
+            proc.kill(grace=0.5)
+
+    def _start(self, cancelled: Callable[[], bool]) -> _Process:
+        """Start the first candidate command that reports ready."""
+        last_err = ""
+        last_code = ERR_START_FAILED
+        for cmd in self.candidate_cmds:
+            try:
+                proc = _Process(cmd, self.env, self.cwd)
+            except OSError as e:
+                last_err = str(e)
+                continue
+
+            self._set_busy(proc)
+            try:
+                if cancelled():
+                    proc.kill()
+                    raise OcrServerError("cancelled", ERR_CANCELLED)
+                msg = proc.receive(self.start_timeout)
+            except queue.Empty:
+                proc.kill()
+                raise OcrServerError("timeout", ERR_TIMEOUT)
+            finally:
+                self._set_busy(None)
+
+            if msg is None and cancelled():
+                proc.kill()
+                raise OcrServerError("cancelled", ERR_CANCELLED)
+
+            if msg is not None and msg.get("event") == "ready":
+                self.starts += 1
+                log(f"ocr server started: {' '.join(cmd[:3])} ...")
+                return proc
+
+            proc.kill()
+            if msg is not None and msg.get("error"):
+                last_err = str(msg["error"])
+                last_code = str(msg.get("code") or ERR_START_FAILED)
+            else:
+                last_err = proc.stderr_text() or f"OCR subprocess failed (code {proc.proc.returncode})"
+                last_code = ERR_START_FAILED
+        raise OcrServerError(last_err or "OCR subprocess could not be started.", last_code)
+
+    def _ensure(self, cancelled: Callable[[], bool]) -> _Process:
+        if self._proc is None or not self._proc.alive():
+            if self._proc is not None:
+                log(f"ocr server died, restarting: {self._proc.stderr_text()[-300:]}")
+                self._proc.kill()
+            self._proc = None
+            self._proc = self._start(cancelled)
+        return self._proc
+
+    def close(self) -> None:
+        """Ask the runner to exit (kill it if it doesn't)."""
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.alive():
+                proc.send({"op": "shutdown"})
+                proc.proc.stdin.close()
+                proc.proc.wait(timeout=5)
+        except Exception:
+            pass
+        proc.kill()
+
+    # -------------------------
+    # Requests
+    # -------------------------
+
+    def ocr(
+        self,
+        image: str,
+        *,
+        lang: str = "en",
+        textline_ori: bool = False,
+        tiled: bool = False,
+        page: Optional[int] = None,
+        dpi: int = 0,
+        timeout: float = REQUEST_TIMEOUT_SEC,
+        on_stage: Optional[Callable[[str], None]] = None,
+        on_line: Optional[Callable[[Dict], None]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[Dict]:
+        """
+        PaddleOCR JSON pages for image. A runner that crashed is restarted
+        and the request retried once; a timeout kills the runner.
+
+        tiled: tall pages as overlapping bands (vokaba/ocr_tiles.py).
+        image a PDF: page (0-based) is rasterized by the runner at dpi
+        (0 = ocr_pdf.DEFAULT_DPI). on_stage gets "loading" (runner start /
+        model build), "preparing" (PDF page) and "recognizing"; on_line each recognized line ({"n", "text", "score",
+        "poly"}; a retry sends the same n again), on_progress(done, total)
+        the parts of the page. cancelled() is checked before each step; pair
+        it with abort() to stop a request that is already running.
+        """
+        is_cancelled = cancelled or (lambda: False)
+        stage = on_stage or (lambda _stage: None)
+        request = {"image": str(image), "lang": str(lang), "textline_ori": bool(textline_ori), "tiled": bool(tiled)}
+        if page is not None:
+            request.update(page=int(page), dpi=ocr_pdf.clamp_dpi(dpi))
+        input_path = str(image) if page is None else ocr_pdf.page_ref(str(image), int(page))
+        with self._lock:
+            for attempt in (1, 2):
+                if is_cancelled():
+                    raise OcrServerError("cancelled", ERR_CANCELLED)
+                if not self.alive():
+                    stage("loading")
+                proc = self._ensure(is_cancelled)
+                self._next_id += 1
+                rid = self._next_id
+                lines: Dict[int, Dict] = {}
+                self._set_busy(proc)
+                try:
+                    # a cancel between the check above and _set_busy() would have found nothing to abort
+                    if is_cancelled():
+                        raise OcrServerError("cancelled", ERR_CANCELLED)
+                    proc.send(dict(request, id=rid))
+                    msg = self._receive_reply(proc, rid, timeout, stage, lines, on_line, on_progress)
+                except queue.Empty:
+                    proc.kill()
+                    self._proc = None
+                    raise OcrServerError("timeout", ERR_TIMEOUT)
+                except OSError:
+                    msg = None  # broken pipe: the runner is gone
+                finally:
+                    self._set_busy(None)
+
+                if msg is None and is_cancelled():
+                    proc.kill()
+                    self._proc = None
+                    raise OcrServerError("cancelled", ERR_CANCELLED)
+
+                if msg is None:
+                    proc.kill()
+                    log(f"ocr server exited (code {proc.proc.returncode}): {proc.stderr_text()[-300:]}")
+                    self._proc = None
+                    if attempt == 1:
+                        continue
+                    raise OcrServerError("OCR subprocess exited unexpectedly.", ERR_RUNNER_EXITED)
+
+                if not msg.get("ok"):
+                    raise OcrServerError(
+                        str(msg.get("error") or "OCR subprocess failed."),
+                        str(msg.get("code") or ERR_OCR_FAILED),
+                    )
+
+                if msg.get("lines") != len(lines) or sorted(lines) != list(range(len(lines))):
+                    raise OcrServerError("OCR output has unexpected format.", ERR_OCR_FAILED)
+                log(
+                    f"ocr: {msg.get('seconds')} s, {len(lines)} lines"
+                    f"{' (model load)' if msg.get('loaded') else ''}"
+                )
+                return [ocr_tiles.lines_page([lines[n] for n in range(len(lines))], input_path=input_path)]
+        raise OcrServerError("OCR subprocess failed.")
+
+    @staticmethod
+    def _receive_reply(
+        proc: _Process,
+        rid: int,
+        timeout: float,
+        on_stage: Callable[[str], None],
+        lines: Dict[int, Dict],
+        on_line: Optional[Callable[[Dict], None]],
+        on_progress: Optional[Callable[[int, int], None]],
+    ) -> Optional[Dict]:
+        """Events of request rid until its final reply (returned); lines are collected by number."""
+        deadline = time.monotonic() + timeout
+        while True:
+            msg = proc.receive(max(0.0, deadline - time.monotonic()))
+            if msg is None:
+                return None
+            if msg.get("id") != rid:
+                continue  # late answer to a request we gave up on, pong, ...
+            event = msg.get("event")
+            if event == "stage":
+                on_stage(str(msg.get("stage") or ""))
+            elif event == "line":
+                try:
+                    n = int(msg["n"])
+                    line = {"n": n, "text": str(msg.get("text") or ""), "score": float(msg.get("score", 1.0)), "poly": msg["poly"]}
+                except (KeyError, TypeError, ValueError):
+                    continue
+                lines[n] = line
+                if on_line is not None:
+                    on_line(line)
+            elif event == "progress":
+                if on_progress is not None:
+                    try:
+                        on_progress(int(msg.get("done") or 0), int(msg.get("total") or 1))
+                    except (TypeError, ValueError):
+                        pass
+            else:
+                return msg
+
+
+class OcrServerPool:
+    """
+    Up to `size` OcrServer runners. lease() hands out an idle one, starts
+    another while the pool is below size, and otherwise waits for one to be
+    returned. Runners stay warm between batches until close().
+    """
+
+    def __init__(
+        self,
+        candidate_cmds: Sequence[List[str]],
+        *,
+        size: int = 1,
+        env: Optional[Dict] = None,
+        cwd: Optional[str] = None,
+        start_timeout: float = START_TIMEOUT_SEC,
+    ):
+        self.candidate_cmds = [list(c) for c in candidate_cmds]
+        self.env = env
+        self.cwd = cwd
+        self.start_timeout = float(start_timeout)
+        self.size = max(1, int(size))
+
+        self._lock = threading.Lock()
+        self._servers: List[OcrServer] = []
+        # LIFO: the runner used last is the one most likely to have the right model loaded
+        self._idle: "queue.LifoQueue[OcrServer]" = queue.LifoQueue()
+
+    def resize(self, size: int) -> None:
+        """New upper bound; surplus runners are closed when they are returned."""
+        with self._lock:
+            self.size = max(1, int(size))
+
+    def _acquire(self) -> OcrServer:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._servers) < self.size:
+                server = OcrServer(self.candidate_cmds, env=self.env, cwd=self.cwd, start_timeout=self.start_timeout)
+                self._servers.append(server)
+                return server
+        return self._idle.get()
+
+    def _release(self, server: OcrServer) -> None:
+        with self._lock:
+            surplus = len(self._servers) > self.size
+            if surplus:
+                self._servers.remove(server)
+        if surplus:
+            server.close()
+        else:
+            self._idle.put(server)
+
+    @contextmanager
+    def lease(self) -> Iterator[OcrServer]:
+        server = self._acquire()
+        try:
+            yield server
+        finally:
+            self._release(server)
+
+    def close(self) -> None:
+        """Shut down every runner (app on_stop). The pool can be used again afterwards."""
+        with self._lock:
+            servers = list(self._servers)
+        for server in servers:
+            server.close()
@@ -0,0 +1,129 @@
+# vokaba/ocr_pdf.py
+"""
+PDF pages as OCR input.
+
+A PDF is imported page by page: the wizard turns it into one batch entry
+per page ("liste.pdf#page=3", the usual PDF open parameter, 1-based), and
+the desktop runner rasterizes only the page a request asks for, at the
+configured DPI, right before recognizing it:
+
+    refs = [page_ref(path, i) for i in range(page_count(path))]
+    path, index = split_ref(refs[2])              # ("liste.pdf", 2)
+    pixels = render_array(path, index, dpi=200)   # BGR, like cv2.imread
+
+So a 60-page PDF never has more rasterized pages in memory than there are
+runners; each page is rendered, recognized and dropped. Huge pages
+(posters) are rendered smaller than the DPI asks, up to MAX_PAGE_PIXELS.
+
+Needs pypdfium2 (desktop: comes with paddleocr/paddlex), render_array()
+also numpy. PDFium is not thread-safe, every call holds one lock. No Kivy
+in here.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from typing import Optional, Tuple
+
+try:
+    import pypdfium2 as pdfium
+except Exception:
+    pdfium = None
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+DEFAULT_DPI = 200
+MIN_DPI = 72
+MAX_DPI = 600
+# A4 at 300 DPI is ~8.7 MP
+MAX_PAGE_PIXELS = 25_000_000
+
+_POINTS_PER_INCH = 72.0
+_REF_RE = re.compile(r"^(?P<path>.+\.pdf)#page=(?P<page>\d+)$", re.IGNORECASE)
+_LOCK = threading.Lock()
+
+
+def available() -> bool:
+    return pdfium is not None
+
+
+def is_pdf(path) -> bool:
+    """By file name; page refs ("x.pdf#page=2") are not PDF paths."""
+    return str(path).lower().endswith(".pdf")
+
+
+def clamp_dpi(dpi) -> int:
+    try:
+        dpi = int(dpi)
+    except (TypeError, ValueError):
+        return DEFAULT_DPI
+    if dpi <= 0:
+        return DEFAULT_DPI
+    return max(MIN_DPI, min(MAX_DPI, dpi))
+
+
+def page_ref(path: str, index: int) -> str:
+    """Batch entry for page index (0-based) of path."""
+    return f"{path}#page={int(index) + 1}"
+
+
+def split_ref(ref) -> Optional[Tuple[str, int]]:
+    """(pdf path, 0-based page) of a page ref, None for anything else."""
+    m = _REF_RE.match(str(ref))
+    if m is None or int(m.group("page")) < 1:
+        return None
+    return m.group("path"), int(m.group("page")) - 1
+
+
+def page_count(path: str) -> int:
+    """Pages of the PDF (only the document structure is read). Raises ImportError without pypdfium2."""
+    _require()
+    with _LOCK:
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def render_page(path: str, index: int, *, dpi: int = DEFAULT_DPI):
+    """One page as an RGB PIL image at dpi (less for pages beyond MAX_PAGE_PIXELS)."""
+    _require()
+    dpi = clamp_dpi(dpi)
+    with _LOCK:
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            if not 0 <= int(index) < len(pdf):
+                raise IndexError(f"page {int(index) + 1} of {len(pdf)}")
+            page = pdf[int(index)]
+            try:
+                w, h = page.get_size()
+                scale = dpi / _POINTS_PER_INCH
+                if w * h * scale * scale > MAX_PAGE_PIXELS:
+                    scale = (MAX_PAGE_PIXELS / float(w * h)) ** 0.5
+                bitmap = page.render(scale=scale)
+                try:
+                    img = bitmap.to_pil()
+                finally:
+                    bitmap.close()
+            finally:
+                page.close()
+        finally:
+            pdf.close()
+    return img.convert("RGB")
+
+
+def render_array(path: str, index: int, *, dpi: int = DEFAULT_DPI):
+    """render_page() as a BGR uint8 array (what PaddleOCR takes besides file paths)."""
+    if np is None:
+        raise ImportError("numpy is required to rasterize PDF pages")
+    img = render_page(path, index, dpi=dpi)
+    return np.ascontiguousarray(np.asarray(img)[:, :, ::-1])
+
+
+def _require() -> None:
+    if pdfium is None:
+        raise ImportError("No module named 'pypdfium2' (needed for PDF import)")
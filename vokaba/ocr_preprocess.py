@@ -0,0 +1,214 @@
+# vokaba/ocr_preprocess.py
+"""
+Image preparation before OCR.
+
+Phone photos are 12-50 MP; text detection cost grows with the pixel count,
+and a vocabulary page doesn't need that much. prepare_image() writes a
+smaller working copy:
+
+  - EXIF orientation applied (the pixels are upright, no rotate flag)
+  - long edge scaled down to `long_edge` px (JPEGs are decoded at reduced
+    size right away via Image.draft, which is most of the win)
+  - optional: grayscale, crop to the region that contains ink
+
+and returns a Transform that maps OCR coordinates of the copy back to the
+upright original, so the row/column reconstruction sees the same geometry
+as without preprocessing:
+
+    t = prepare_image(src, dest, long_edge=2000)
+    pages = ocr(dest if t else src)
+    if t:
+        pages = t.map_pages(pages)
+
+Needs Pillow (desktop: comes with paddleocr; Android: p4a recipe). Without
+it, or when there is nothing to do, prepare_image() returns None and the
+original is used. No Kivy in here.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageFilter, ImageOps
+except Exception:
+    Image = ImageFilter = ImageOps = None
+
+DEFAULT_LONG_EDGE = 2000
+JPEG_QUALITY = 90
+
+# EXIF orientations that swap width and height
+_TRANSPOSED = (5, 6, 7, 8)
+_EXIF_ORIENTATION = 0x0112
+
+# crop: size of the image the ink box is searched in, margin around the box
+_CROP_PROBE = 384
+_CROP_MARGIN = 0.03
+
+_POLY_KEYS = ("dt_polys", "rec_polys")
+_BOX_KEYS = ("dt_boxes", "rec_boxes", "boxes")
+
+
+def available() -> bool:
+    return Image is not None
+
+
+class Transform:
+    """Working copy -> upright original: x = offset_x + x' / scale_x (same for y)."""
+
+    __slots__ = ("scale_x", "scale_y", "offset_x", "offset_y", "size")
+
+    def __init__(self, scale_x: float, scale_y: float, offset_x: float, offset_y: float, size: Tuple[int, int]):
+        self.scale_x = float(scale_x)
+        self.scale_y = float(scale_y)
+        self.offset_x = float(offset_x)
+        self.offset_y = float(offset_y)
+        self.size = size  # upright original (w, h)
+
+    def point(self, x: float, y: float) -> Tuple[float, float]:
+        return self.offset_x + float(x) / self.scale_x, self.offset_y + float(y) / self.scale_y
+
+    def map_pages(self, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """OCR JSON pages (PaddleOCR / ML Kit shape) with every polygon and box mapped back."""
+        out = []
+        for page in pages or []:
+            if not isinstance(page, dict):
+                out.append(page)
+                continue
+            nested = isinstance(page.get("res"), dict)
+            payload = dict(page["res"] if nested else page)
+            for key in _POLY_KEYS + _BOX_KEYS:
+                value = payload.get(key)
+                if isinstance(value, list):
+                    payload[key] = [self._map_shape(shape) for shape in value]
+            if nested:
+                page = dict(page)
+                page["res"] = payload
+                out.append(page)
+            else:
+                out.append(payload)
+        return out
+
+    def _map_shape(self, shape):
+        if not isinstance(shape, (list, tuple)) or not shape:
+            return shape
+        if isinstance(shape[0], (list, tuple)):
+            # polygon [[x, y], ...]
+            return [list(self.point(p[0], p[1])) if len(p) >= 2 else p for p in shape]
+        if len(shape) == 4 and all(isinstance(v, (int, float)) for v in shape):
+            x1, y1 = self.point(shape[0], shape[1])
+            x2, y2 = self.point(shape[2], shape[3])
+            return [x1, y1, x2, y2]
+        return shape
+
+
+def options_key(*, long_edge: int, grayscale: bool, crop: bool) -> str:
+    """Stable text for the OCR result cache key (a different preparation means different results)."""
+    return f"le={int(long_edge)};g={int(bool(grayscale))};c={int(bool(crop))}"
+
+
+def prepare_image(
+    src: str,
+    dest: str,
+    *,
+    long_edge: int = DEFAULT_LONG_EDGE,
+    grayscale: bool = False,
+    crop: bool = False,
+) -> Optional[Transform]:
+    """
+    Write the OCR working copy of src to dest (JPEG). Returns the Transform
+    back to the original, or None if src should be used as it is (no
+    Pillow, nothing to change, unreadable image).
+    """
+    if Image is None:
+        return None
+    long_edge = int(long_edge or 0)
+
+    try:
+        with Image.open(src) as im:
+            raw_w, raw_h = im.size
+            try:
+                orientation = int(im.getexif().get(_EXIF_ORIENTATION, 1) or 1)
+            except Exception:
+                orientation = 1
+            full_w, full_h = (raw_h, raw_w) if orientation in _TRANSPOSED else (raw_w, raw_h)
+
+            shrink = long_edge > 0 and max(full_w, full_h) > long_edge
+            if not (shrink or orientation != 1 or grayscale or crop):
+                return None
+
+            if shrink and im.format == "JPEG":
+                # decode at 1/2, 1/4 or 1/8 straight away (never below the target size)
+                f = long_edge / float(max(raw_w, raw_h))
+                im.draft("L" if grayscale else "RGB", (max(1, int(raw_w * f)), max(1, int(raw_h * f))))
+
+            img = ImageOps.exif_transpose(im) if orientation != 1 else im
+            img = img.convert("L" if grayscale else "RGB")
+    except Exception:
+        return None
+
+    # decoded (possibly drafted) -> full resolution
+    fx = full_w / float(img.size[0])
+    fy = full_h / float(img.size[1])
+
+    box = (0, 0, img.size[0], img.size[1])
+    if crop:
+        found = _ink_bbox(img)
+        if found is not None:
+            box = found
+            img = img.crop(box)
+
+    crop_w = img.size[0] * fx
+    crop_h = img.size[1] * fy
+    s = min(1.0, long_edge / max(crop_w, crop_h)) if long_edge > 0 else 1.0
+    target = (max(1, int(round(crop_w * s))), max(1, int(round(crop_h * s))))
+    if target != img.size:
+        img = img.resize(target, Image.BICUBIC, reducing_gap=3.0)
+
+    try:
+        img.save(dest, "JPEG", quality=JPEG_QUALITY)
+    except Exception:
+        return None
+
+    return Transform(
+        scale_x=target[0] / crop_w,
+        scale_y=target[1] / crop_h,
+        offset_x=box[0] * fx,
+        offset_y=box[1] * fy,
+        size=(full_w, full_h),
+    )
+
+
+def _ink_bbox(img) -> Optional[Tuple[int, int, int, int]]:
+    """Bounding box of the dark (text) pixels in img coordinates, with a margin; None if unclear."""
+    w, h = img.size
+    probe = img.convert("L")
+    probe.thumbnail((_CROP_PROBE, _CROP_PROBE))
+    pw, ph = probe.size
+
+    hist = probe.histogram()
+    total = float(pw * ph)
+    mean = sum(i * n for i, n in enumerate(hist)) / total
+    # ink = clearly darker than the page
+    threshold = max(0, int(mean * 0.6))
+    mask = probe.point(lambda v: 255 if v < threshold else 0)
+    # drop single specks (dust, JPEG noise)
+    mask = mask.filter(ImageFilter.MedianFilter(3))
+    bbox = mask.getbbox()
+    if not bbox:
+        return None
+
+    x0, y0, x1, y1 = bbox
+    mx = (x1 - x0) * _CROP_MARGIN + 2
+    my = (y1 - y0) * _CROP_MARGIN + 2
+    sx, sy = w / float(pw), h / float(ph)
+    box = (
+        max(0, int((x0 - mx) * sx)),
+        max(0, int((y0 - my) * sy)),
+        min(w, int((x1 + mx) * sx + 0.999)),
+        min(h, int((y1 + my) * sy + 0.999)),
+    )
+    # almost the whole image anyway, or suspiciously small -> leave it
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    if area >= 0.95 * w * h or area < 0.05 * w * h:
+        return None
+    return box
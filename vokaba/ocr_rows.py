@@ -0,0 +1,308 @@
+# vokaba/ocr_rows.py
+"""
+Row/column reconstruction for OCR output: recognized text boxes -> table rows.
+
+    items = items_from_pages(json_pages)      # [{"text", "x", "y", "h"}, ...] box centres
+    rows = rows_from_items(items, n_cols=2)   # [["das Haus", "the house"], ...]
+
+  1. lines: one sweep over the boxes sorted by y; a box joins the current
+     line while its y is within line_tol of the line's running mean
+  2. columns: the x centres are split into n_cols groups with the smallest
+     total squared distance to their group mean (optimal 1-D k-means,
+     dynamic programming over the x pixels), a box goes to the group whose
+     range it falls in
+  3. cells: text cleaned once (numbering, bullets, stray page numbers),
+     noise rows dropped (page numbers, "Unit", copyright lines), rows that
+     ended up in one cell are split at separators (" - ", " | ", wide gaps)
+
+On regular pages the rows are the same as from the old per-item
+heuristics in OcrImportMixin (golden check in benchmarks/bench_ocr_rows.py);
+where the old Lloyd k-means stopped in a worse split, columns are now the
+best one. Pure Python, no Kivy.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence
+
+MIN_LINE_TOL = 8.0
+LINE_TOL_SHARE = 0.65  # of the median box height
+MIN_SCORE = 0.45
+
+_WS_RE = re.compile(r"\s+")
+_LEAD_RE = re.compile(r"^(?:\(?\d{1,3}\)?[.)]\s*|[A-Za-z][.)]\s*|[-•·]\s*)")
+_NUMBER_RE = re.compile(r"\d{1,4}")
+_GAP_RE = re.compile(r"\s{3,}")
+
+_SEPARATORS = (" | ", " - ", " – ", " — ", "\t")
+_NOISE_WORDS = ("unit", "lektion", "kapitel")
+
+
+def items_from_pages(pages: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Parser items of OCR JSON pages (PaddleOCR / ML Kit shape)."""
+    items = []
+    for page in pages or []:
+        payload = page.get("res", page) if isinstance(page, dict) else {}
+        texts = payload.get("rec_texts") or []
+        scores = payload.get("rec_scores") or []
+        boxes = (
+            payload.get("dt_polys")
+            or payload.get("dt_boxes")
+            or payload.get("rec_boxes")
+            or payload.get("boxes")
+            or []
+        )
+        if not isinstance(boxes, list):
+            boxes = []
+
+        for i, t in enumerate(texts):
+            sc = scores[i] if i < len(scores) else 1.0
+            b = boxes[i] if i < len(boxes) else None
+            it = item_from_line(t, sc, b, index=i)
+            if it is not None:
+                items.append(it)
+    return items
+
+
+def item_from_line(text, score, shape, *, index: int = 0) -> Optional[Dict[str, Any]]:
+    """
+    One parser item from a recognized line (polygon or [x1, y1, x2, y2]);
+    None for empty or low-confidence text. Lines without geometry are
+    stacked by index.
+    """
+    t = (text or "").strip()
+    if not t:
+        return None
+    try:
+        sc = float(score) if score is not None else 1.0
+    except (TypeError, ValueError):
+        sc = 1.0
+    if sc < MIN_SCORE:
+        return None
+
+    bb = None
+    if isinstance(shape, (list, tuple)) and shape and isinstance(shape[0], (list, tuple)):
+        try:
+            xs = [p[0] for p in shape]
+            ys = [p[1] for p in shape]
+            bb = min(xs), min(ys), max(xs), max(ys)
+        except Exception:
+            bb = None
+    if bb is None and isinstance(shape, (list, tuple)) and len(shape) == 4 and all(isinstance(x, (int, float)) for x in shape):
+        bb = (float(shape[0]), float(shape[1]), float(shape[2]), float(shape[3]))
+
+    if bb is None:
+        return {"text": t, "x": 0.0, "y": float(index) * 10.0, "h": 10.0}
+
+    x1, y1, x2, y2 = bb
+    return {
+        "text": t,
+        "x": float((x1 + x2) / 2.0),
+        "y": float((y1 + y2) / 2.0),
+        "h": float(max(1.0, y2 - y1)),
+    }
+
+
+def rows_from_items(items: Sequence[Dict[str, Any]], *, n_cols: int) -> List[List[str]]:
+    """Table rows (n_cols cells each) from parser items {"text", "x", "y", "h"}."""
+    if not items:
+        return []
+    n_cols = max(1, int(n_cols))
+
+    lines = group_lines(items)
+    bounds = column_breaks([float(it["x"]) for it in items], n_cols)
+
+    rows: List[List[str]] = []
+    for line in lines:
+        cols: List[List[str]] = [[] for _ in range(n_cols)]
+        for it in sorted(line, key=lambda it: it["x"]):
+            c = min(bisect_left(bounds, float(it["x"])), n_cols - 1)
+            text = clean_cell_text(it["text"])
+            if text:
+                cols[c].append(text)
+        row = [" ".join(c).strip() for c in cols]
+        if row_is_noise(row):
+            continue
+        if sum(1 for x in row if x) <= 1:
+            merged = " ".join(x for x in row if x).strip()
+            row = split_by_separators(merged, n_cols=n_cols) or row
+        rows.append(row)
+    return rows
+
+
+def group_lines(items: Sequence[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Items grouped into text lines (top to bottom); tolerance from the median box height."""
+    ordered = sorted(items, key=lambda it: (it["y"], it["x"]))
+
+    hs = sorted(float(it.get("h", 10.0) or 10.0) for it in ordered)
+    line_tol = max(MIN_LINE_TOL, hs[len(hs) // 2] * LINE_TOL_SHARE)
+
+    lines: List[List[Dict[str, Any]]] = []
+    mean = total = 0.0
+    count = 0
+    for it in ordered:
+        y = float(it["y"])
+        if count and abs(y - mean) <= line_tol:
+            lines[-1].append(it)
+            total += y
+            count += 1
+        else:
+            lines.append([it])
+            total, count = y, 1
+        mean = total / count
+    return lines
+
+
+def column_breaks(values: Sequence[float], k: int) -> List[float]:
+    """
+    k - 1 ascending bounds; x <= bounds[i] (first match) is column i. Bounds
+    lie halfway between the means of neighbouring groups of the optimal
+    split of values into k groups (least squares).
+    """
+    k = max(1, int(k))
+    vals = sorted(float(v) for v in values if v is not None)
+    if k == 1:
+        return []
+    if not vals:
+        return [0.0] * (k - 1)
+    if len(vals) < k:
+        centers = (vals + [vals[-1]] * (k - len(vals)))[:k]
+    else:
+        centers = _optimal_means(vals, k)
+    return [(centers[i] + centers[i + 1]) / 2.0 for i in range(k - 1)]
+
+
+def _optimal_means(vals: List[float], k: int) -> List[float]:
+    """
+    Group means of the least-squares split of sorted vals into k contiguous
+    groups (1-D k-means, exact). Values are pooled per pixel first (a page
+    has far fewer distinct x pixels than boxes); the best start of the last
+    group never moves left as the end moves right, so each inner layer is
+    solved by divide and conquer, the last one only for the whole range:
+    O(k * m * log m) for m distinct pixels.
+    """
+    # shift for the sums of squares (pixel coordinates, keeps them small)
+    base = vals[len(vals) // 2]
+    c1, s1, s2 = [0], [0.0], [0.0]
+    last = None
+    for v in vals:
+        d = v - base
+        px = int(v // 1.0)
+        if px != last:
+            c1.append(c1[-1])
+            s1.append(s1[-1])
+            s2.append(s2[-1])
+            last = px
+        c1[-1] += 1
+        s1[-1] += d
+        s2[-1] += d * d
+    n = len(c1) - 1
+    if n < k:
+        # fewer distinct pixels than columns: one pixel per group, the rest repeat the last
+        means = [base + (s1[i + 1] - s1[i]) / (c1[i + 1] - c1[i]) for i in range(n)]
+        return means + [means[-1]] * (k - n)
+
+    def cost(j: int, i: int) -> float:
+        """Squared error of pixels j..i around their mean."""
+        s = s1[i + 1] - s1[j]
+        return (s2[i + 1] - s2[j]) - s * s / (c1[i + 1] - c1[j])
+
+    inf = float("inf")
+    prev = [cost(0, i) for i in range(n)]
+    starts: List[List[int]] = [[0] * n]
+
+    for m in range(1, k):
+        cur = [inf] * n
+        arg = [0] * n
+
+        if m == k - 1:
+            # last group: only the split of the whole range matters
+            for j in range(m, n):
+                c = prev[j - 1] + cost(j, n - 1)
+                if c < cur[n - 1]:
+                    cur[n - 1], arg[n - 1] = c, j
+        else:
+            # (lo, hi, jlo, jhi): fill cur[lo..hi], last group starts in [jlo, jhi]
+            stack = [(m, n - 1, m, n - 1)]
+            while stack:
+                lo, hi, jlo, jhi = stack.pop()
+                if lo > hi:
+                    continue
+                mid = (lo + hi) // 2
+                best, best_j = inf, jlo
+                for j in range(max(m, jlo), min(mid, jhi) + 1):
+                    c = prev[j - 1] + cost(j, mid)
+                    if c < best:
+                        best, best_j = c, j
+                cur[mid], arg[mid] = best, best_j
+                stack.append((lo, mid - 1, jlo, best_j))
+                stack.append((mid + 1, hi, best_j, jhi))
+
+        prev = cur
+        starts.append(arg)
+
+    means = []
+    end = n - 1
+    for m in range(k - 1, -1, -1):
+        j = starts[m][end] if m > 0 else 0
+        means.append(base + (s1[end + 1] - s1[j]) / (c1[end + 1] - c1[j]))
+        end = j - 1
+    means.reverse()
+    return means
+
+
+# -------------------------
+# Cells
+# -------------------------
+
+def clean_cell_text(s: Optional[str]) -> str:
+    """Cell text without soft hyphens, numbering ("3.", "b)", "•") and bare numbers."""
+    s = "" if s is None else str(s)
+    s = s.replace("\u00ad", "")
+    s = _WS_RE.sub(" ", s).strip()
+    s = _LEAD_RE.sub("", s, count=1).strip()
+    if _NUMBER_RE.fullmatch(s):
+        return ""
+    return s
+
+
+def row_is_noise(row: Sequence[str]) -> bool:
+    """Empty rows, lone page numbers / letters / chapter words, copyright and URL lines."""
+    cols = [(c or "").strip() for c in row]
+    nonempty = [c for c in cols if c]
+    if not nonempty:
+        return True
+    if len(nonempty) == 1:
+        c = nonempty[0]
+        if _NUMBER_RE.fullmatch(c):
+            return True
+        if len(c) == 1 and not c.isdigit():
+            return True
+        if c.lower() in _NOISE_WORDS:
+            return True
+    joined = " ".join(nonempty).lower()
+    return "©" in joined or "copyright" in joined or "www." in joined
+
+
+def split_by_separators(s: str, *, n_cols: int) -> Optional[List[str]]:
+    """A one-cell row split into n_cols cells at " - ", " | ", tabs or wide gaps; None if it doesn't split."""
+    s = (s or "").strip()
+    if not s:
+        return None
+    for sep in _SEPARATORS:
+        if sep.strip() and sep in s:
+            parts = [p.strip() for p in s.split(sep) if p.strip()]
+            if len(parts) >= n_cols:
+                return _fit(parts, n_cols)
+    if _GAP_RE.search(s):
+        parts = [p.strip() for p in _GAP_RE.split(s) if p.strip()]
+        if len(parts) >= n_cols:
+            return _fit(parts, n_cols)
+    return None
+
+
+def _fit(parts: List[str], n_cols: int) -> List[str]:
+    out = parts[:n_cols]
+    return out + [""] * (n_cols - len(out))
+
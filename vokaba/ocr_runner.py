@@ -11,6 +11,15 @@ from pathlib import Path
 import builtins
 import io
 
+try:
+    from vokaba import ocr_pdf, ocr_tiles
+except ImportError:  # started as a script (python vokaba/ocr_runner.py)
+    import ocr_pdf
+    import ocr_tiles
+
+# bump when the recognized lines/pages change (invalidates cached OCR results, see vokaba/ocr_cache.py)
+RESULT_VERSION = 2
+
 
 def _needs_paddlex_dot_version_hack() -> bool:
     """
@@ -54,40 +63,24 @@ def _patch_open_for_missing_paddlex_version():
     return real_open, patched_open
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser(description="Vokaba OCR subprocess runner (PaddleOCR)")
-    ap.add_argument("--image", required=True, help="Path to image (jpg/png)")
-    ap.add_argument("--lang", default="en", help="PaddleOCR lang, e.g. en, german, fr ...")
-    ap.add_argument("--textline-ori", action="store_true", help="Use textline orientation")
-    ap.add_argument("--cache-dir", required=True, help="Model cache dir")
-    ap.add_argument("--out", required=True, help="Output JSON file path")
-    ap.add_argument("--no-source-check", action="store_true", help="Disable model source connectivity check")
-    args = ap.parse_args()
-
-    img_path = Path(args.image).expanduser().resolve()
-    if not img_path.exists():
-        print(f"File not found: {img_path}", file=sys.stderr)
-        return 2
-
-    cache_dir = Path(args.cache_dir).expanduser().resolve()
-    cache_dir.mkdir(parents=True, exist_ok=True)
-
-    out_path = Path(args.out).expanduser().resolve()
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
+def _setup_env(cache_dir: Path, no_source_check: bool, threads: int = 0) -> None:
     os.environ.setdefault("DISABLE_AUTO_LOGGING_CONFIG", "1")
     os.environ.setdefault("PADDLEX_HOME", str(cache_dir))
     os.environ.setdefault("PADDLEX_CACHE_DIR", str(cache_dir))
-    if args.no_source_check:
+    if no_source_check:
         os.environ["DISABLE_MODEL_SOURCE_CHECK"] = "True"
 
     os.environ.setdefault("FLAGS_use_mkldnn", "0")
-    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    if threads > 0:
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+    else:
+        os.environ.setdefault("OMP_NUM_THREADS", "1")
 
-    # NEU: targeted workaround for missing paddlex/.version
+
+def _import_paddleocr():
+    """Imports PaddleOCR, with the targeted workaround for a missing paddlex/.version."""
     use_hack = _needs_paddlex_dot_version_hack()
     real_open = None
-
     try:
         if use_hack:
             real_open, patched_open = _patch_open_for_missing_paddlex_version()
@@ -99,26 +92,414 @@ def main() -> int:
             )
 
         from paddleocr import PaddleOCR
+        return PaddleOCR, use_hack, real_open
+    except Exception:
+        if use_hack and real_open is not None:
+            builtins.open = real_open
+        raise
+
+
+def _new_model(PaddleOCR, lang: str, textline_ori: bool, threads: int):
+    if threads > 0:
+        try:
+            return PaddleOCR(lang=lang, use_textline_orientation=textline_ori, cpu_threads=threads)
+        except TypeError:  # paddleocr without cpu_threads: OMP_NUM_THREADS still applies
+            pass
+    return PaddleOCR(lang=lang, use_textline_orientation=textline_ori)
+
+
+def _json_pages(results) -> list:
+    json_pages = []
+    for res in results or []:
+        j = getattr(res, "json", None)
+        if isinstance(j, dict):
+            json_pages.append(j)
+    return json_pages
+
+
+def _predict_pages(ocr, image, textline_ori: bool) -> list:
+    return _json_pages(ocr.predict(image, use_textline_orientation=textline_ori))
+
+
+def _bands(image):
+    """(pixels, bands) for tiled OCR, or (None, None) if the page isn't cut (short, unreadable for cv2)."""
+    if not isinstance(image, str):
+        pixels = image  # already rasterized (PDF page)
+    else:
+        try:
+            import cv2
+            pixels = cv2.imread(image, cv2.IMREAD_COLOR)
+        except Exception:
+            pixels = None
+    if pixels is None:
+        return None, None
+    height, width = pixels.shape[:2]
+    bands = ocr_tiles.plan_bands(height, width)
+    if len(bands) < 2:
+        return None, None
+    return pixels, bands
+
+
+def _recognize(ocr, image, textline_ori: bool, *, tiled: bool = False, on_lines=None, on_progress=None) -> list:
+    """
+    Recognized lines of image, a file path or BGR pixels ({"text", "score",
+    "poly"}, see vokaba/ocr_tiles.py). on_lines(lines) gets them as soon as they are
+    final, on_progress(done, total) counts the parts of the page (bands
+    when tiled, otherwise 1).
+
+    tiled: tall pages as overlapping bands in one batched predict() call,
+    merged band by band.
+    """
+    emit = on_lines or (lambda _lines: None)
+    progress = on_progress or (lambda _done, _total: None)
+
+    pixels, bands = _bands(image) if tiled else (None, None)
+    if not bands:
+        progress(0, 1)
+        lines = ocr_tiles.page_lines(_predict_pages(ocr, image, textline_ori))
+        emit(lines)
+        progress(1, 1)
+        return lines
+
+    progress(0, len(bands))
+    parts = [pixels[top:bottom] for top, bottom in bands]
+    # predict_iter hands out one band after the other; plain predict() all at the end
+    run = getattr(ocr, "predict_iter", None) or ocr.predict
+    merger = ocr_tiles.BandMerger(bands)
+    lines = []
+    done = 0
+    for res in run(parts, use_textline_orientation=textline_ori) or []:
+        final = merger.add(_json_pages([res]))
+        done += 1
+        lines.extend(final)
+        emit(final)
+        progress(done, len(bands))
+    if done != len(bands):
+        raise RuntimeError(f"tiled OCR: {done} results for {len(bands)} bands")
+    rest = merger.finish()
+    lines.extend(rest)
+    emit(rest)
+    return lines
+
+
+# ------------------------------------------------------------
+# Error codes (the "code" of failed replies; the app words the message)
+# ------------------------------------------------------------
+
+ERR_FILE_NOT_FOUND = "file_not_found"
+ERR_UNSUPPORTED_LANG = "unsupported_lang"
+ERR_MISSING_DEPENDENCY = "missing_dependency"
+ERR_OUT_OF_MEMORY = "out_of_memory"
+ERR_BAD_REQUEST = "bad_request"
+ERR_OCR_FAILED = "ocr_failed"
+
+
+class BadRequest(ValueError):
+    """The request itself is wrong (e.g. a PDF without page); reported as ERR_BAD_REQUEST."""
+
+
+def _error_code(exc: BaseException) -> str:
+    if isinstance(exc, BadRequest):
+        return ERR_BAD_REQUEST
+    if isinstance(exc, FileNotFoundError):
+        return ERR_FILE_NOT_FOUND
+    if isinstance(exc, MemoryError):
+        return ERR_OUT_OF_MEMORY
+    if isinstance(exc, ImportError):
+        return ERR_MISSING_DEPENDENCY
+    low = str(exc).lower()
+    if "lang" in low and any(w in low for w in ("unsupported", "unknown", "not recognized", "not support")):
+        return ERR_UNSUPPORTED_LANG
+    if "out of memory" in low or "bad_alloc" in low or "memoryerror" in low:
+        return ERR_OUT_OF_MEMORY
+    return ERR_OCR_FAILED
+
+
+def _wire(line: dict) -> dict:
+    """A line as it goes over stdout (coordinates rounded, that's plenty for row reconstruction)."""
+    return {
+        "text": line["text"],
+        "score": round(float(line["score"]), 4),
+        "poly": [[round(float(x), 1), round(float(y), 1)] for x, y in line["poly"]],
+    }
+
+
+def _pdf_page(path: str, page, dpi):
+    """Pixels of one PDF page (the only one held in memory); BadRequest for a missing/invalid page number."""
+    try:
+        index = int(page)
+    except (TypeError, ValueError):
+        raise BadRequest(f"PDF needs a page number: {path}")
+    try:
+        return ocr_pdf.render_array(path, index, dpi=ocr_pdf.clamp_dpi(dpi))
+    except IndexError as e:
+        raise BadRequest(f"no such PDF page: {e}")
+
+
+def _run_request(send, ocr, image, textline_ori: bool, tiled: bool, rid=None, page=None) -> int:
+    """
+    Stream one image's lines and progress as events (see the protocol notes
+    below); returns the line count. page: added to every event (single-shot
+    runs over a whole PDF).
+    """
+    count = 0
+    extra = {} if page is None else {"page": page}
 
-        ocr = PaddleOCR(lang=args.lang, use_textline_orientation=args.textline_ori)
-        results = ocr.predict(str(img_path), use_textline_orientation=args.textline_ori)
+    def on_lines(lines):
+        nonlocal count
+        for line in lines:
+            send({"id": rid, "event": "line", "n": count, **extra, **_wire(line)})
+            count += 1
 
+    def on_progress(done, total):
+        send({"id": rid, "event": "progress", "done": done, "total": total, **extra})
+
+    _recognize(ocr, image, textline_ori, tiled=tiled, on_lines=on_lines, on_progress=on_progress)
+    return count
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Vokaba OCR subprocess runner (PaddleOCR)")
+    ap.add_argument("--image", help="Path to image (jpg/png) or PDF (every page, one after the other)")
+    ap.add_argument("--lang", default="en", help="PaddleOCR lang, e.g. en, german, fr ...")
+    ap.add_argument("--textline-ori", action="store_true", help="Use textline orientation")
+    ap.add_argument("--tiled", action="store_true", help="Tall pages as overlapping bands (see _recognize())")
+    ap.add_argument("--threads", type=int, default=0, help="CPU threads for inference (0: OMP_NUM_THREADS or 1)")
+    ap.add_argument("--dpi", type=int, default=ocr_pdf.DEFAULT_DPI, help="PDF input: rasterization resolution")
+    ap.add_argument("--cache-dir", required=True, help="Model cache dir")
+    ap.add_argument("--out", help="Write the result as one JSON file instead of streaming events on stdout")
+    ap.add_argument("--no-source-check", action="store_true", help="Disable model source connectivity check")
+    ap.add_argument("--serve", action="store_true", help="Keep running and answer JSON requests on stdin (see serve())")
+    ap.add_argument("--max-models", type=int, default=2, help="--serve: PaddleOCR instances kept loaded")
+    args = ap.parse_args()
+
+    cache_dir = Path(args.cache_dir).expanduser().resolve()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.serve:
+        return serve(cache_dir, no_source_check=args.no_source_check, max_models=args.max_models, threads=args.threads)
+
+    if not args.image:
+        ap.error("--image is required (or use --serve)")
+
+    # without --out: the same events as one --serve request (no "id"), on stdout
+    proto = None if args.out else _protocol_channel()
+
+    def send(obj: dict) -> None:
+        if proto is not None:
+            obj.pop("id", None)
+            proto.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            proto.flush()
+
+    img_path = Path(args.image).expanduser().resolve()
+    if not img_path.exists():
+        print(f"File not found: {img_path}", file=sys.stderr)
+        send({"ok": False, "code": ERR_FILE_NOT_FOUND, "error": f"File not found: {img_path}"})
+        return 2
+
+    out_path = None
+    if args.out:
+        out_path = Path(args.out).expanduser().resolve()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    _setup_env(cache_dir, args.no_source_check, args.threads)
+
+    use_hack = False
+    real_open = None
+
+    try:
+        PaddleOCR, use_hack, real_open = _import_paddleocr()
+
+        send({"event": "stage", "stage": "loading"})
+        ocr = _new_model(PaddleOCR, args.lang, args.textline_ori, args.threads)
+
+        # a PDF: its pages one after the other, each rasterized only while it is recognized
+        pdf = ocr_pdf.is_pdf(img_path.name)
+        pages = range(ocr_pdf.page_count(str(img_path))) if pdf else [None]
         json_pages = []
-        for res in results or []:
-            j = getattr(res, "json", None)
-            if isinstance(j, dict):
-                json_pages.append(j)
+        count = 0
+        for page in pages:
+            if page is not None:
+                send({"event": "stage", "stage": "preparing", "page": page})
+            image = str(img_path) if page is None else _pdf_page(str(img_path), page, args.dpi)
+            send({"event": "stage", "stage": "recognizing", **({} if page is None else {"page": page})})
 
-        out_path.write_text(json.dumps(json_pages, ensure_ascii=False), encoding="utf-8")
+            if out_path is not None:
+                lines = _recognize(ocr, image, args.textline_ori, tiled=args.tiled)
+                ref = str(img_path) if page is None else ocr_pdf.page_ref(str(img_path), page)
+                json_pages.append(ocr_tiles.lines_page(lines, input_path=ref))
+            else:
+                count += _run_request(send, ocr, image, args.textline_ori, args.tiled, page=page)
+            image = None
+
+        if out_path is not None:
+            out_path.write_text(json.dumps(json_pages, ensure_ascii=False), encoding="utf-8")
+        else:
+            send({"ok": True, "event": "done", "lines": count, **({"pages": len(pages)} if pdf else {})})
         return 0
 
     except Exception as e:
         print(f"OCR subprocess failed: {e}", file=sys.stderr)
+        send({"ok": False, "code": _error_code(e), "error": f"OCR subprocess failed: {e}"})
         return 1
 
     finally:
         if use_hack and real_open is not None:
             builtins.open = real_open
+        if proto is not None:
+            try:
+                proto.close()
+            except Exception:
+                pass
+
+
+def _protocol_channel():
+    """Keep stdout for the protocol; anything paddle prints goes to stderr from here on."""
+    proto = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", newline="\n")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return proto
+
+
+# ------------------------------------------------------------
+# --serve: one warm process for many images
+# ------------------------------------------------------------
+#
+# Spawning the runner per image re-imports paddle/paddlex and rebuilds
+# PaddleOCR every time, which takes far longer than the OCR itself. With
+# --serve the runner stays up and speaks line-delimited JSON:
+#
+#   stdout  {"event": "ready"}                            once paddleocr is imported
+#           {"event": "fatal", "code": "...", "error": "..."}   import failed (process exits)
+#   stdin   {"id": 1, "image": "...", "lang": "german", "textline_ori": false, "tiled": false}
+#           {"id": 2, "image": "liste.pdf", "page": 0, "dpi": 200, ...}   one page of a PDF (0-based)
+#   stdout  {"id": 1, "event": "stage", "stage": "loading"}      model has to be built first
+#           {"id": 2, "event": "stage", "stage": "preparing"}    PDF page is rasterized
+#           {"id": 1, "event": "stage", "stage": "recognizing"}
+#           {"id": 1, "event": "progress", "done": 0, "total": 3}   parts of the page (bands)
+#           {"id": 1, "event": "line", "n": 0, "text": "Haus", "score": 0.98, "poly": [[x, y], ...]}
+#           ...                                                      lines as they are final
+#           {"id": 1, "ok": true, "event": "done", "lines": 42, "loaded": true, "seconds": 1.9}
+#           {"id": 1, "ok": false, "code": "file_not_found", "error": "..."}
+#   stdin   {"op": "ping"} -> {"event": "pong"};  {"op": "shutdown"} or EOF -> exit
+#
+# Lines are numbered per request ("n"); the "done" summary says how many
+# there were. Failed replies carry one of the ERR_* codes above, the text is
+# for the log. "loaded" says whether a model had to be constructed for the
+# request. Models are kept per (lang, textline_ori), the least recently used
+# one is dropped beyond --max-models. "tiled" cuts tall pages into bands
+# (see _recognize()); --threads is the inference thread count of every
+# model. A PDF request names one page; the runner rasterizes just that page
+# (vokaba/ocr_pdf.py), recognizes it and drops the pixels, so memory stays
+# at one page per runner however long the PDF is. Anything paddle prints
+# goes to stderr; stdout carries the protocol only. The client starts the
+# runner in a process group of its own and cancels a request by terminating
+# that group.
+#
+# Without --serve and --out, the runner handles --image the same way and
+# streams that one request's events (without "id") before it exits; for a
+# PDF it goes through every page (--dpi), the events carry "page" and
+# "done" counts the lines of all pages. --out writes one JSON page per
+# PDF page.
+
+def serve(cache_dir: Path, *, no_source_check: bool = True, max_models: int = 2, threads: int = 0) -> int:
+    import time
+    from collections import OrderedDict
+
+    # keep the protocol channel for ourselves, library output goes to stderr
+    proto = _protocol_channel()
+
+    def send(obj: dict) -> None:
+        proto.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        proto.flush()
+
+    _setup_env(cache_dir, no_source_check, threads)
+
+    use_hack = False
+    real_open = None
+    try:
+        try:
+            PaddleOCR, use_hack, real_open = _import_paddleocr()
+        except Exception as e:
+            send({"event": "fatal", "code": _error_code(e), "error": f"OCR subprocess failed: {e}"})
+            return 1
+
+        send({"event": "ready"})
+        models: "OrderedDict[tuple, object]" = OrderedDict()
+
+        for raw in sys.stdin:
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                req = json.loads(raw)
+            except ValueError:
+                send({"ok": False, "code": ERR_BAD_REQUEST, "error": "bad request (not JSON)"})
+                continue
+            if not isinstance(req, dict):
+                send({"ok": False, "code": ERR_BAD_REQUEST, "error": "bad request"})
+                continue
+
+            op = req.get("op", "ocr")
+            if op == "shutdown":
+                break
+            if op == "ping":
+                send({"event": "pong", "id": req.get("id")})
+                continue
+
+            rid = req.get("id")
+            t0 = time.monotonic()
+            try:
+                img_path = Path(str(req.get("image") or "")).expanduser().resolve()
+                if not img_path.is_file():
+                    raise FileNotFoundError(f"File not found: {img_path}")
+                pdf = ocr_pdf.is_pdf(img_path.name)
+                if pdf and req.get("page") is None:
+                    raise BadRequest(f"PDF needs a page number: {img_path}")
+
+                lang = str(req.get("lang") or "en")
+                ori = bool(req.get("textline_ori", False))
+                key = (lang, ori)
+
+                ocr = models.get(key)
+                loaded = ocr is None
+                if loaded:
+                    send({"id": rid, "event": "stage", "stage": "loading"})
+                    ocr = _new_model(PaddleOCR, lang, ori, threads)
+                    models[key] = ocr
+                    while len(models) > max(1, max_models):
+                        models.popitem(last=False)
+                models.move_to_end(key)
+
+                image = str(img_path)
+                if pdf:
+                    send({"id": rid, "event": "stage", "stage": "preparing"})
+                    image = _pdf_page(image, req.get("page"), req.get("dpi"))
+
+                send({"id": rid, "event": "stage", "stage": "recognizing"})
+                count = _run_request(send, ocr, image, ori, bool(req.get("tiled")), rid=rid)
+                image = None  # don't hold a PDF page's pixels while idle
+                send(
+                    {
+                        "id": rid,
+                        "ok": True,
+                        "event": "done",
+                        "lines": count,
+                        "loaded": loaded,
+                        "seconds": round(time.monotonic() - t0, 3),
+                    }
+                )
+            except Exception as e:
+                send({"id": rid, "ok": False, "code": _error_code(e), "error": f"OCR subprocess failed: {e}"})
+        return 0
+
+    finally:
+        if use_hack and real_open is not None:
+            builtins.open = real_open
+        try:
+            proto.close()
+        except Exception:
+            pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,230 @@
+# vokaba/ocr_tiles.py
+"""
+Tiled OCR: a tall page is recognized as overlapping horizontal bands.
+
+Text detection scales the whole page to a fixed size limit, so small
+handwriting on a long page gets blurry, and one big image keeps a single
+core busy. The runner (--serve, request "tiled": true) cuts the page into
+bands, hands them to PaddleOCR as one batched predict() call and merges
+the per-band results back into one page:
+
+    bands = plan_bands(height, width, max_bands=4)
+    band_pages = [ocr(image[top:bottom]) for top, bottom in bands]
+    page = merge_bands(band_pages, bands)
+
+Neighbouring bands overlap, so a line cut by one band edge is complete in
+the other. merge_bands() shifts every box by its band's top and keeps a
+line only from the band that owns its centre (split at the middle of the
+overlap); what is still doubled after that (lines taller than half the
+overlap) is dropped by box overlap. BandMerger does the same band by band,
+so the runner can stream finished lines while later bands are still being
+recognized.
+
+Lines are plain dicts {"text", "score", "poly"} (page_lines() /
+lines_page() convert from and to the PaddleOCR JSON page); they are also
+what the runner streams to the app. Pure Python, no paddle in here.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAX_BANDS = 4
+# pages less tall than this (height / width) stay in one piece
+MIN_ASPECT = 1.3
+# overlap between two bands: share of the page height, at least MIN_OVERLAP px
+OVERLAP_SHARE = 1 / 16.0
+MIN_OVERLAP = 96
+# two lines from neighbouring bands are the same line above this overlap
+# (intersection / smaller box)
+DUP_OVERLAP = 0.6
+
+
+def plan_bands(
+        height: int,
+        width: int,
+        *,
+        max_bands: int = MAX_BANDS,
+        overlap: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """(top, bottom) rows of each band, roughly square; [(0, height)] if the page isn't worth cutting."""
+    height, width = int(height), int(width)
+    if max_bands < 2 or width <= 0 or height < MIN_ASPECT * width:
+        return [(0, height)]
+
+    n = min(int(max_bands), max(2, int(round(height / float(width)))))
+    if overlap is None:
+        overlap = max(MIN_OVERLAP, int(height * OVERLAP_SHARE))
+    half = int(overlap) // 2
+    core = height / float(n)
+
+    bands = []
+    for i in range(n):
+        top = 0 if i == 0 else max(0, int(core * i) - half)
+        bottom = height if i == n - 1 else min(height, int(core * (i + 1)) + half)
+        bands.append((top, bottom))
+    return bands
+
+
+def merge_bands(
+        band_pages: Sequence[List[Dict[str, Any]]],
+        bands: Sequence[Tuple[int, int]],
+        *,
+        input_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    One PaddleOCR-shaped page ({"res": {...}}) from the JSON pages of every
+    band, in page coordinates, overlap duplicates removed.
+    """
+    merger = BandMerger(bands)
+    lines = []
+    for pages in band_pages:
+        lines.extend(merger.add(pages))
+    lines.extend(merger.finish())
+    page = lines_page(lines, input_path=input_path)
+    page["res"]["tiles"] = len(bands)
+    return page
+
+
+class BandMerger:
+    """
+    merge_bands() one band at a time (bands in page order): add() returns the
+    lines that are final already, i.e. all except those in the overlap with
+    the next band, which wait for it. finish() returns what is left.
+    """
+
+    def __init__(self, bands: Sequence[Tuple[int, int]]):
+        self.bands = list(bands)
+        # where ownership switches from band i to band i + 1: middle of their overlap
+        self._seams = [(self.bands[i][1] + self.bands[i + 1][0]) / 2.0 for i in range(len(self.bands) - 1)]
+        self._next = 0
+        self._held: List[Dict[str, Any]] = []
+
+    def add(self, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        i = self._next
+        if i >= len(self.bands):
+            raise ValueError("more results than bands")
+        self._next += 1
+
+        top = self.bands[i][0]
+        lo = self._seams[i - 1] if i > 0 else float("-inf")
+        hi = self._seams[i] if i < len(self._seams) else float("inf")
+        owned = []
+        for item in page_lines(pages):
+            item["poly"] = [[x, y + top] for x, y in item["poly"]]
+            x1, y1, x2, y2 = _bbox(item["poly"])
+            if lo <= (y1 + y2) / 2.0 < hi:
+                item["bbox"] = (x1, y1, x2, y2)
+                owned.append(item)
+
+        held, self._held = self._held, []
+        if i > 0:
+            zone_top, zone_bottom = self.bands[i][0], self.bands[i - 1][1]
+            lower = [it for it in owned if _in_zone(it, zone_top, zone_bottom)]
+            dropped = _seam_duplicates(held, lower)
+            held = [it for it in held if id(it) not in dropped]
+            owned = [it for it in owned if id(it) not in dropped]
+
+        final = held
+        if i + 1 < len(self.bands):
+            zone_top, zone_bottom = self.bands[i + 1][0], self.bands[i][1]
+            for it in owned:
+                (self._held if _in_zone(it, zone_top, zone_bottom) else final).append(it)
+        else:
+            final = final + owned
+        return [_public(it) for it in final]
+
+    def finish(self) -> List[Dict[str, Any]]:
+        held, self._held = self._held, []
+        return [_public(it) for it in held]
+
+
+def page_lines(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Recognized lines of OCR JSON pages: {"text", "score", "poly"}; lines without geometry are left out."""
+    out = []
+    for page in pages or []:
+        payload = page.get("res", page) if isinstance(page, dict) else {}
+        texts = payload.get("rec_texts") or []
+        scores = payload.get("rec_scores") or []
+        polys = payload.get("rec_polys") or []
+        if len(polys) != len(texts):
+            polys = payload.get("dt_polys") or []
+        boxes = payload.get("rec_boxes") or []
+
+        for i, text in enumerate(texts):
+            poly = _poly(polys[i]) if i < len(polys) else None
+            box = boxes[i] if i < len(boxes) else None
+            if poly is None and _is_box(box):
+                x1, y1, x2, y2 = box
+                poly = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+            if poly is None:
+                continue
+            try:
+                score = float(scores[i]) if i < len(scores) else 1.0
+            except (TypeError, ValueError):
+                score = 1.0
+            out.append({"text": str(text or ""), "score": score, "poly": poly})
+    return out
+
+
+def lines_page(lines: Sequence[Dict[str, Any]], *, input_path: Optional[str] = None) -> Dict[str, Any]:
+    """The PaddleOCR-shaped page for a list of lines (inverse of page_lines())."""
+    polys = [ln["poly"] for ln in lines]
+    res = {
+        "rec_texts": [ln["text"] for ln in lines],
+        "rec_scores": [ln["score"] for ln in lines],
+        "rec_polys": polys,
+        # rec_* and dt_polys line up one to one (the parser pairs them by index)
+        "dt_polys": [list(p) for p in polys],
+    }
+    if input_path is not None:
+        res["input_path"] = input_path
+    return {"res": res}
+
+
+def _public(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {"text": item["text"], "score": item["score"], "poly": item["poly"]}
+
+
+def _seam_duplicates(upper: List[Dict[str, Any]], lower: List[Dict[str, Any]]) -> set:
+    """ids of the lines to drop: of two overlapping lines from neighbouring bands, the worse scored."""
+    dropped = set()
+    for a in upper:
+        for b in lower:
+            if id(a) in dropped or id(b) in dropped:
+                continue
+            if _overlap(a["bbox"], b["bbox"]) > DUP_OVERLAP:
+                dropped.add(id(b) if a["score"] >= b["score"] else id(a))
+    return dropped
+
+
+def _in_zone(item: Dict[str, Any], zone_top: float, zone_bottom: float) -> bool:
+    _x1, y1, _x2, y2 = item["bbox"]
+    return y2 > zone_top and y1 < zone_bottom
+
+
+def _overlap(a, b) -> float:
+    """Intersection over the smaller of the two boxes."""
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return (w * h) / smaller if smaller > 0 else 0.0
+
+
+def _poly(value) -> Optional[List[List[float]]]:
+    try:
+        pts = [[float(p[0]), float(p[1])] for p in value]
+    except (TypeError, ValueError, IndexError):
+        return None
+    return pts or None
+
+
+def _is_box(value) -> bool:
+    return isinstance(value, (list, tuple)) and len(value) == 4 and all(isinstance(v, (int, float)) for v in value)
+
+
+def _bbox(poly) -> Tuple[float, float, float, float]:
+    xs = [p[0] for p in poly]
+    ys = [p[1] for p in poly]
+    return min(xs), min(ys), max(xs), max(ys)
@@ -357,11 +357,15 @@ class UIFactoryMixin:
 
         return root, filedialog
 
-    def desktop_open_file_dialog(self, *, title="Datei öffnen", filetypes=None, initialdir=None):
+    def desktop_open_file_dialog(self, *, title="Datei öffnen", filetypes=None, initialdir=None, multiple=False):
+        """Path of the chosen file (None if cancelled); with multiple=True a list of paths."""
         root, filedialog = self._tk_dialogs()
         if root is None:
             return None
         try:
+            if multiple:
+                paths = filedialog.askopenfilenames(title=title, filetypes=filetypes, initialdir=initialdir)
+                return [str(p) for p in (paths or ()) if p]
             path = filedialog.askopenfilename(title=title, filetypes=filetypes, initialdir=initialdir)
             return path or None
         finally:
@@ -370,6 +374,19 @@ class UIFactoryMixin:
             except Exception:
                 pass
 
+    def desktop_open_folder_dialog(self, *, title="Ordner öffnen", initialdir=None):
+        root, filedialog = self._tk_dialogs()
+        if root is None:
+            return None
+        try:
+            path = filedialog.askdirectory(title=title, initialdir=initialdir, mustexist=True)
+            return path or None
+        finally:
+            try:
+                root.destroy()
+            except Exception:
+                pass
+
     def desktop_save_file_dialog(self, *, title="Speichern unter", filetypes=None, initialdir=None, initialfile=None):
         root, filedialog = self._tk_dialogs()
         if root is None:
@@ -743,12 +760,12 @@ class UIFactoryMixin:
 
         return bar
 
-    def run_open_file_dialog(self, on_selection, *, filters=None, title="Datei öffnen") -> bool:
+    def run_open_file_dialog(self, on_selection, *, filters=None, title="Datei öffnen", multiple=False) -> bool:
         """
         System-Öffnen-Dialog:
         - Android: plyer.filechooser.open_file (system picker)
         - Desktop: Tk open dialog
-        Ruft on_selection(list_of_paths) auf.
+        Ruft on_selection(list_of_paths) auf (multiple=True: mehrere Dateien wählbar).
         Gibt True zurück, wenn ein Dialog versucht wurde.
         """
         filters = filters or ["*.*"]
@@ -764,7 +781,7 @@ class UIFactoryMixin:
         # Android system picker via plyer
         if kivy_platform == "android" and plyer_filechooser is not None:
             try:
-                plyer_filechooser.open_file(on_selection=_safe_call, filters=filters)
+                plyer_filechooser.open_file(on_selection=_safe_call, filters=filters, multiple=bool(multiple))
                 return True
             except Exception:
                 pass
@@ -782,8 +799,11 @@ class UIFactoryMixin:
 
             ft = [(label, patterns), ("Alle Dateien", "*.*")]
             try:
-                path = self.desktop_open_file_dialog(title=title, filetypes=ft)
-                _safe_call([path] if path else [])
+                if multiple:
+                    _safe_call(self.desktop_open_file_dialog(title=title, filetypes=ft, multiple=True) or [])
+                else:
+                    path = self.desktop_open_file_dialog(title=title, filetypes=ft)
+                    _safe_call([path] if path else [])
                 return True
             except Exception:
                 pass